@@ -0,0 +1,10 @@
+"""
+Throughput benchmarks for the blackjack engine.
+
+Run from the repository root with the package installed:
+    python -m benchmarks                      # run everything, compare with benchmarks/baseline.json
+    python -m benchmarks --kind micro -o results.json
+    python -m benchmarks --update-baseline    # record this machine's numbers as the new baseline
+The run fails, with exit status 1, when any benchmark is slower than its baseline by more than the tolerance.
+Baselines are only meaningful on the machine they were recorded on.
+"""
@@ -0,0 +1,74 @@
+import argparse
+import fnmatch
+import os
+import sys
+from .harness import DEFAULT_REPEATS, DEFAULT_TOLERANCE, REGISTRY, BenchmarkResult, compare, load_results, run_benchmark, save_results
+from . import micro, macro
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Runs the benchmarks, optionally saving the results and comparing them with a baseline.
+
+    :param argv: The command line arguments, sys.argv by default.
+    :type argv: list[str] | None
+    :return: The exit status, 1 when a benchmark regressed beyond the tolerance.
+    :rtype: int
+    """
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmark the blackjack engine.")
+    parser.add_argument("-k", "--filter", default="*", help="Only run benchmarks whose name matches this glob.")
+    parser.add_argument("--kind", choices=("micro", "macro"), help="Only run one kind of benchmark.")
+    parser.add_argument("-r", "--repeats", type=int, default=DEFAULT_REPEATS, help="Timed repeats per benchmark, the best is kept.")
+    parser.add_argument("-o", "--output", help="Write the results to this JSON file.")
+    parser.add_argument("-b", "--baseline", default=DEFAULT_BASELINE, help="The baseline results to compare with.")
+    parser.add_argument("-t", "--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Allowed slowdown before failing, 0.2 is 20%%.")
+    parser.add_argument("--no-compare", action="store_true", help="Do not compare with the baseline.")
+    parser.add_argument("--update-baseline", action="store_true", help="Save the results as the baseline instead of comparing.")
+    parser.add_argument("--list", action="store_true", help="List the benchmarks and exit.")
+    args = parser.parse_args(argv)
+
+    selected = [
+        bench for bench in REGISTRY.values()
+        if fnmatch.fnmatch(bench.name, args.filter) and (args.kind is None or bench.kind == args.kind)]
+    if args.list:
+        for bench in selected:
+            print(f"{bench.name:<32} {bench.kind:<6} {bench.description}")
+        return 0
+    if not selected:
+        print("No benchmarks selected.", file=sys.stderr)
+        return 2
+
+    results: list[BenchmarkResult] = []
+    for bench in selected:
+        result = run_benchmark(bench, args.repeats)
+        results.append(result)
+        print(f"{result.name:<32} {result.ops_per_second:>14,.0f} ops/s  (best {result.best_seconds:.4f}s, median {result.median_seconds:.4f}s)")
+
+    if args.output:
+        save_results(args.output, results)
+    if args.update_baseline:
+        save_results(args.baseline, results)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    if args.no_compare:
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}, nothing to compare with.")
+        return 0
+
+    comparisons = compare(results, load_results(args.baseline), args.tolerance)
+    regressions = [comparison for comparison in comparisons if comparison.regressed]
+    print()
+    for comparison in comparisons:
+        flag = "REGRESSED" if comparison.regressed else "ok"
+        print(f"{comparison.name:<32} {comparison.ratio:>7.2%} of baseline  {flag}")
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) slower than the baseline by more than {args.tolerance:.0%}.", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
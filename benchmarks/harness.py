@@ -0,0 +1,213 @@
+"""
+Registry, timing and baseline comparison for the benchmarks.
+
+A benchmark is a setup function that builds its inputs from fixed seeds and returns the timed body. The body does
+a fixed batch of work and returns how many operations it did, so results are reported as operations per second.
+Setup runs again before every repeat and is not timed, so stateful benchmarks (a growing ledger, a draining deck)
+start each repeat from the same place.
+"""
+
+import json
+import platform
+import statistics
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Callable
+
+RESULTS_VERSION = 1
+DEFAULT_REPEATS = 5
+DEFAULT_TOLERANCE = 0.2
+
+Body = Callable[[], int]
+Setup = Callable[[], Body]
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    """
+    A registered benchmark.
+
+    Attributes:
+        name (str): The unique name, used as the key in results and baselines.
+        kind (str): "micro" for a single operation, "macro" for whole rounds.
+        setup (Setup): Builds the inputs and returns the timed body.
+        description (str): What is measured.
+    """
+    name: str
+    kind: str
+    setup: Setup
+    description: str
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    """
+    The timings of one benchmark.
+
+    Attributes:
+        name (str): The benchmark name.
+        kind (str): "micro" or "macro".
+        operations (int): Operations done per repeat.
+        repeats (int): Times the body was timed.
+        best_seconds (float): The fastest repeat.
+        median_seconds (float): The median repeat.
+        ops_per_second (float): Throughput of the fastest repeat, the figure compared against the baseline.
+    """
+    name: str
+    kind: str
+    operations: int
+    repeats: int
+    best_seconds: float
+    median_seconds: float
+    ops_per_second: float
+
+
+@dataclass(frozen=True)
+class Comparison:
+    """
+    A result next to its baseline.
+
+    Attributes:
+        name (str): The benchmark name.
+        baseline_ops (float): Baseline operations per second.
+        current_ops (float): Current operations per second.
+        ratio (float): current_ops / baseline_ops, below 1 is slower.
+        regressed (bool): Whether the slowdown is beyond the tolerance.
+    """
+    name: str
+    baseline_ops: float
+    current_ops: float
+    ratio: float
+    regressed: bool
+
+
+REGISTRY: dict[str, Benchmark] = {}
+
+
+def benchmark(name: str, kind: str = "micro") -> Callable[[Setup], Setup]:
+    """
+    Registers a setup function as a benchmark. The first line of its docstring is the description.
+
+    :param name: The unique name of the benchmark.
+    :type name: str
+    :param kind: "micro" or "macro".
+    :type kind: str
+    :return: The decorator.
+    :rtype: Callable[[Setup], Setup]
+    """
+    if kind not in ("micro", "macro"):
+        raise ValueError(f"Unknown benchmark kind: {kind}")
+
+    def register(setup: Setup) -> Setup:
+        if name in REGISTRY:
+            raise ValueError(f"Benchmark {name} is already registered.")
+        description = (setup.__doc__ or "").strip().splitlines()
+        REGISTRY[name] = Benchmark(name, kind, setup, description[0] if description else "")
+        return setup
+    return register
+
+
+def run_benchmark(bench: Benchmark, repeats: int = DEFAULT_REPEATS) -> BenchmarkResult:
+    """
+    Times a benchmark, running its setup before each repeat.
+
+    :param bench: The benchmark.
+    :type bench: Benchmark
+    :param repeats: The number of timed repeats.
+    :type repeats: int
+    :return: The timings.
+    :rtype: BenchmarkResult
+    """
+    if repeats < 1:
+        raise ValueError("At least one repeat is needed.")
+    timings: list[float] = []
+    operations = 0
+    for _ in range(repeats):
+        body = bench.setup()
+        start = time.perf_counter()
+        operations = body()
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+    return BenchmarkResult(
+        name=bench.name,
+        kind=bench.kind,
+        operations=operations,
+        repeats=repeats,
+        best_seconds=best,
+        median_seconds=statistics.median(timings),
+        ops_per_second=operations / best if best > 0 else float("inf"))
+
+
+def compare(results: list[BenchmarkResult], baseline: dict[str, dict], tolerance: float = DEFAULT_TOLERANCE) -> list[Comparison]:
+    """
+    Compares results with a baseline. Benchmarks missing from the baseline are skipped.
+
+    :param results: The current results.
+    :type results: list[BenchmarkResult]
+    :param baseline: The "results" mapping of a saved results file.
+    :type baseline: dict[str, dict]
+    :param tolerance: The allowed slowdown, 0.2 fails anything more than 20% slower.
+    :type tolerance: float
+    :return: A comparison for each result with a baseline.
+    :rtype: list[Comparison]
+    """
+    comparisons: list[Comparison] = []
+    for result in results:
+        saved = baseline.get(result.name)
+        if saved is None:
+            continue
+        baseline_ops = float(saved["ops_per_second"])
+        ratio = result.ops_per_second / baseline_ops if baseline_ops > 0 else float("inf")
+        comparisons.append(Comparison(result.name, baseline_ops, result.ops_per_second, ratio, ratio < 1 - tolerance))
+    return comparisons
+
+
+def results_to_json(results: list[BenchmarkResult]) -> dict:
+    """
+    Builds the JSON document for a run, with enough about the machine to judge whether two runs are comparable.
+
+    :param results: The results.
+    :type results: list[BenchmarkResult]
+    :return: The document.
+    :rtype: dict
+    """
+    return {
+        "version": RESULTS_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "results": {result.name: asdict(result) for result in results}}
+
+
+def load_results(path: str) -> dict[str, dict]:
+    """
+    Reads the results of a saved run.
+
+    :param path: The results file.
+    :type path: str
+    :return: The "results" mapping, keyed by benchmark name.
+    :rtype: dict[str, dict]
+    """
+    with open(path, encoding="utf-8") as results_file:
+        document = json.load(results_file)
+    if document.get("version") != RESULTS_VERSION:
+        raise ValueError(f"{path} has results version {document.get('version')}, expected {RESULTS_VERSION}.")
+    return document["results"]
+
+
+def save_results(path: str, results: list[BenchmarkResult]) -> None:
+    """
+    Writes the results of a run.
+
+    :param path: The results file.
+    :type path: str
+    :param results: The results.
+    :type results: list[BenchmarkResult]
+    """
+    with open(path, "w", encoding="utf-8") as results_file:
+        json.dump(results_to_json(results), results_file, indent=2)
+        results_file.write("\n")
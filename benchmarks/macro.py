@@ -0,0 +1,44 @@
+"""
+Macro benchmarks: whole rounds played from a seeded deck with a scripted strategy, so every run plays the same cards.
+"""
+
+import random
+from pyblackjack.deck import Deck
+from pyblackjack.shoe import Shoe
+from pyblackjack.simulator import MimicDealerStrategy, Simulator
+from .harness import Body, benchmark
+
+SEED = 20240601
+
+
+@benchmark("simulator.round", kind="macro")
+def simulator_round() -> Body:
+    """Plays full rounds from a single deck: bet, deal, insurance, player turn, dealer turn and settlement."""
+    simulator = Simulator(MimicDealerStrategy(), deck=Deck(rng=random.Random(SEED)))
+    def body() -> int:
+        return simulator.run(20_000).rounds
+    return body
+
+
+@benchmark("simulator.round_six_deck_shoe", kind="macro")
+def simulator_round_shoe() -> Body:
+    """Plays full rounds from a six deck shoe with a cut card."""
+    simulator = Simulator(MimicDealerStrategy(), deck=Shoe(rng=random.Random(SEED)))
+    def body() -> int:
+        return simulator.run(20_000).rounds
+    return body
+
+
+# NumPy is optional, so the vectorized engine is only benchmarked when it can run.
+try:
+    from pyblackjack.vectorized import VectorizedEngine
+except ImportError:
+    pass
+else:
+    @benchmark("vectorized.round", kind="macro")
+    def vectorized_round() -> Body:
+        """Plays rounds on 4096 lockstep tables with the NumPy engine."""
+        engine = VectorizedEngine(4_096, seed=SEED)
+        def body() -> int:
+            return engine.run(100).rounds
+        return body
@@ -0,0 +1,207 @@
+"""
+Micro benchmarks: single engine operations in tight loops, with inputs built from fixed seeds.
+"""
+
+import random
+from pyblackjack import blackjack, player_turn
+from pyblackjack.bank import Bank
+from pyblackjack.dealer import Dealer
+from pyblackjack.dealer_probabilities import DealerProbabilities
+from pyblackjack.deck import Deck
+from pyblackjack.hand import Hand
+from pyblackjack.player import Player
+from pyblackjack.playing_card import PlayingCard
+from pyblackjack.round_results import RoundResults
+from pyblackjack.strategy_table import StrategyTable, CHART_ROWS
+from pyblackjack.solver import StrategyChart, UPCARDS
+from .harness import Body, benchmark
+
+SEED = 20240601
+
+
+def _cards(count: int, seed: int = SEED) -> list[PlayingCard]:
+    deck = Deck(rng=random.Random(seed), deck_count=6)
+    return [deck.drawCard() for _ in range(count)]
+
+
+def _hands(count: int, cards_per_hand: int, seed: int = SEED) -> list[Hand]:
+    cards = _cards(count * cards_per_hand, seed)
+    return [Hand(cards[index:index + cards_per_hand]) for index in range(0, len(cards), cards_per_hand)]
+
+
+@benchmark("deck.shuffle")
+def deck_shuffle() -> Body:
+    """Shuffles a six deck shoe."""
+    deck = Deck(rng=random.Random(SEED), deck_count=6)
+    def body() -> int:
+        shuffle = deck.shuffle
+        for _ in range(2_000):
+            shuffle()
+        return 2_000
+    return body
+
+
+# NumPy is optional, so its benchmark is only registered when it can run.
+try:
+    from pyblackjack.rng import NumpyRNG
+    NumpyRNG(0)
+except ImportError:
+    pass
+else:
+    @benchmark("deck.shuffle_pcg64")
+    def deck_shuffle_pcg64() -> Body:
+        """Shuffles a six deck shoe with batched NumPy PCG64 permutations."""
+        deck = Deck(rng=NumpyRNG(SEED), deck_count=6)
+        def body() -> int:
+            shuffle = deck.shuffle
+            for _ in range(2_000):
+                shuffle()
+            return 2_000
+        return body
+
+
+@benchmark("deck.drawCard")
+def deck_draw() -> Body:
+    """Draws cards from a six deck shoe, including the reshuffles when it runs out."""
+    deck = Deck(rng=random.Random(SEED), deck_count=6)
+    def body() -> int:
+        draw = deck.drawCard
+        for _ in range(200_000):
+            draw()
+        return 200_000
+    return body
+
+
+@benchmark("hand.add_card")
+def hand_add_card() -> Body:
+    """Builds three card hands one card at a time."""
+    cards = _cards(60_000)
+    def body() -> int:
+        for index in range(0, len(cards), 3):
+            hand = Hand([])
+            hand.add_card(cards[index])
+            hand.add_card(cards[index + 1])
+            hand.add_card(cards[index + 2])
+        return len(cards)
+    return body
+
+
+@benchmark("hand.get_hand_value")
+def hand_value() -> Body:
+    """Reads the value of finished hands."""
+    hands = _hands(10_000, 3)
+    def body() -> int:
+        for _ in range(100):
+            for hand in hands:
+                hand.get_hand_value()
+        return 100 * len(hands)
+    return body
+
+
+@benchmark("blackjack.determine_winner")
+def determine_winner() -> Body:
+    """Decides the result of dealer and player hand pairs."""
+    dealer_hands = _hands(10_000, 3, SEED)
+    player_hands = _hands(10_000, 2, SEED + 1)
+    for hand in dealer_hands + player_hands:
+        hand.check_if_busted()
+    pairs = list(zip(dealer_hands, player_hands))
+    def body() -> int:
+        for _ in range(20):
+            for dealer_hand, player_hand in pairs:
+                blackjack.determine_winner(dealer_hand, player_hand)
+        return 20 * len(pairs)
+    return body
+
+
+@benchmark("blackjack.settle_bets")
+def settle_bets() -> Body:
+    """Settles hands between the dealer and player banks, building the result line."""
+    rng = random.Random(SEED)
+    results = [rng.choice(list(RoundResults)) for _ in range(20_000)]
+    dealer = Dealer()
+    player = Player()
+    def body() -> int:
+        for result in results:
+            blackjack.settle_bets(dealer, player, 10.0, result)
+        return len(results)
+    return body
+
+
+def _simple_chart() -> StrategyChart:
+    """A small chart with every kind of cell: hit below 17, double 10 and 11, split Aces and eights."""
+    chart: StrategyChart = {kind: {} for kind in CHART_ROWS}
+    for kind, totals in CHART_ROWS.items():
+        for total in totals:
+            if kind == "pair" and total in (1, 8):
+                cell = "split"
+            elif kind == "pair":
+                cell = "double/hit" if total == 5 else "hit" if total * 2 < 17 else "stand"
+            elif kind == "hard" and total in (10, 11):
+                cell = "double/hit"
+            else:
+                cell = "hit" if total < 17 else "stand"
+            chart[kind][total] = {upcard: cell for upcard in UPCARDS}
+    return chart
+
+
+@benchmark("strategy_table.decide")
+def strategy_table_decide() -> Body:
+    """Looks up the action for two card hands, with the allowed actions of each hand."""
+    table = StrategyTable(_simple_chart())
+    deck = Deck(rng=random.Random(SEED), deck_count=6)
+    player = Player()
+    decisions = []
+    for hand, upcard in zip(_hands(10_000, 2), _cards(10_000, SEED + 1)):
+        player.split_hands = [hand]
+        player.current_hand_index = 0
+        decisions.append((hand, upcard, player_turn.get_allowed_actions(player, deck)))
+    def body() -> int:
+        decide = table.decide
+        for _ in range(20):
+            for hand, upcard, allowed_actions in decisions:
+                decide(hand, upcard, allowed_actions)
+        return 20 * len(decisions)
+    return body
+
+
+@benchmark("bank.add_transaction")
+def bank_add_transaction() -> Body:
+    """Appends transactions to a bank ledger."""
+    bank = Bank(1_000)
+    def body() -> int:
+        add = bank.add_transaction
+        for index in range(100_000):
+            add("Won Round", 10.0 if index & 1 else -10.0)
+        return 100_000
+    return body
+
+
+@benchmark("bank.refresh")
+def bank_refresh() -> Body:
+    """Recomputes the balance of a bank with a hundred thousand transactions."""
+    bank = Bank(1_000)
+    rng = random.Random(SEED)
+    for _ in range(100_000):
+        bank.add_transaction("Won Round", rng.choice((-10.0, 10.0, 15.0)))
+    def body() -> int:
+        for _ in range(10_000):
+            bank.refresh()
+        return 10_000
+    return body
+
+
+@benchmark("dealer_probabilities.lookup")
+def dealer_lookup() -> Body:
+    """Computes exact dealer outcome distributions from a cold cache along a dealt shoe."""
+    deck = Deck(rng=random.Random(SEED), deck_count=6)
+    states: list[tuple[int, tuple[int, ...]]] = []
+    for _ in range(200):
+        upcard = deck.drawCard()
+        states.append((upcard.value, deck.count.composition()))
+    def body() -> int:
+        probabilities = DealerProbabilities()
+        for upcard, composition in states:
+            probabilities.lookup(upcard, composition)
+        return len(states)
+    return body
@@ -1,12 +1,16 @@
+import sys
 from .dealer import Dealer
 from .player import Player
 from .deck import Deck
 from .playing_card import Rank
 from . import blackjack, player_turn
 from .cli_input_processor import prompt_continue_game
-from .cli_output_processor import show_end_of_round_state, show_game_end_score
+from .cli_output_processor import show_game_end_score
+from .renderer import BufferedRenderer, Renderer, TerminalRenderer
 
 def main():
+    # Output to a pipe or file is written once per round and before each prompt instead of line by line.
+    renderer: Renderer = TerminalRenderer() if sys.stdout.isatty() else BufferedRenderer()
     deck = Deck()
     player = Player()
     starting_player_balance = player.bank.balance
@@ -21,9 +25,10 @@ def main():
         insurance: float = 0.0
         dealer_upcard = dealer.get_visible_card()
         if dealer_upcard.rank == Rank.ACE:
+            renderer.flush()
             insurance = player_turn.player_insurance(player, starting_bet)
-        player_turn.player_turn(player, dealer_upcard, deck)
-        blackjack.process_dealer_turn(dealer, deck)
+        player_turn.player_turn(player, dealer_upcard, deck, renderer)
+        blackjack.process_dealer_turn(dealer, deck, renderer)
         blackjack.settle_insurance(dealer, player, insurance, dealer.hand.has_blackjack)
         end_state_str = f""
         # Debug
@@ -41,7 +46,8 @@ def main():
                 dealer_blackjack=dealer.hand.has_blackjack,
                 player_blackjack=hand.has_blackjack)
             end_state_str += blackjack.settle_bets(dealer, player, hand.bet.balance, result)
-        show_end_of_round_state(dealer, player, end_state_str)
+        renderer.end_of_round(dealer, player, end_state_str)
+        renderer.flush()
         player.bank.refresh()
         dealer.bank.refresh()
         if not prompt_continue_game():
@@ -2,6 +2,7 @@ from .bank import Bank
 from .playing_card import PlayingCard
 from .hand import Hand
 from .round_results import RoundResults
+from .round_statistics import RoundStatistics
 from dataclasses import dataclass
 
 
@@ -11,11 +12,54 @@ class RoundRecord:
     bet: float
 
 class RoundHistory:
-    def __init__(self) -> None:
+    """
+    The settled hands of an Actor, with running statistics over them.
+    
+    Attributes:
+        records (list[RoundRecord]): Every hand added while keep_records was on.
+        keep_records (bool): Whether hands are stored as records. The statistics are kept either way.
+        stats (RoundStatistics): Counts, returns, drawdown and losing streaks over every hand added.
+    """
+    def __init__(self, keep_records: bool = True) -> None:
+        """
+        RoundHistory constructor
+        
+        :param keep_records: Whether to store a record per hand. Turn off for long runs that only need the statistics.
+        :type keep_records: bool
+        """
         self.records: list[RoundRecord] = []
+        self.keep_records = keep_records
+        self.stats = RoundStatistics()
     
-    def add_round(self, outcome: RoundResults, bet: float | int):
-        self.records.append(RoundRecord(outcome, float(bet)))
+    def add_round(self, outcome: RoundResults, bet: float | int, net: float | int | None = None, wagered: float | int = 0.0):
+        """
+        Adds a settled hand.
+        
+        :param outcome: The result of the hand.
+        :type outcome: RoundResults
+        :param bet: The amount that changed hands, 0 on a push.
+        :type bet: float | int
+        :param net: The amount won by this actor, negative when lost. Taken from the player's side by default.
+        :type net: float | int | None
+        :param wagered: The stake on the hand, for the return statistics.
+        :type wagered: float | int
+        """
+        if net is None:
+            net = -bet if outcome is RoundResults.DEALER_WON else bet
+        self.stats.add(outcome, float(net), float(wagered))
+        if self.keep_records:
+            self.records.append(RoundRecord(outcome, float(bet)))
+
+    def extend(self, other: "RoundHistory") -> None:
+        """
+        Appends every round of another history to this one.
+        
+        :param other: The history to append.
+        :type other: RoundHistory
+        """
+        self.stats.merge(other.stats)
+        if self.keep_records:
+            self.records.extend(other.records)
 
 class Actor:
     """
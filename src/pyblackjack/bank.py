@@ -1,10 +1,6 @@
-import copy
-
-class Transaction:
-    def __init__(self, name: str, amount: float | int, invoice_num: int) -> None:
-        self.name = name
-        self.value = float(amount)
-        self.invoice_num = invoice_num
+from typing import Iterable
+from .ledger import Ledger, Transaction, TransactionSource, merge_into
+from .mapped_ledger import MappedLedger
 
 class Bank:
     """
@@ -13,14 +9,19 @@ class Bank:
     Attributes:
         balance (float): The current bank balance.
     """
-    def __init__(self, balance: float | int = 0.0) -> None:
+    def __init__(self, balance: float | int = 0.0, ledger: Ledger | MappedLedger | None = None) -> None:
         """
         Make the bank.
         
-        :param balance: The starting balance of the bank.
+        :param balance: The starting balance of the bank. Ignored when the ledger already has a history.
         :type balance: float | int
+        :param ledger: The store for the transaction history, an unbounded in-memory Ledger by default.
+            Pass a MappedLedger to keep the history on disk, or to reopen one.
+        :type ledger: Ledger | MappedLedger | None
         """
-        self.__transaction_history: list[Transaction] = [Transaction("Initial Balance", float(balance), 0)]
+        self._ledger = ledger if ledger is not None else Ledger()
+        if len(self._ledger) == 0:
+            self._ledger.append("Initial Balance", float(balance))
         self.balance = self._refresh_balance()
         # Debug
         #print(f"DEBUG: Bank(), self.balance: {self.balance}")
@@ -34,20 +35,20 @@ class Bank:
         :param amount: The amount of money in the transaction. Negative numbers decrease balance, positive increase.
         :type amount: float | int
         """
-        invoice_num = len(self.__transaction_history)
         # Debug
         #print(f"DEBUG: Bank, add_transaction(name={name}, amount={amount}")
-        self.__transaction_history.append(Transaction(name=name, amount=amount, invoice_num=invoice_num))
+        self._ledger.append(name, amount)
         self.balance += float(amount)
         # Debug
         #print(f"DEBUG: bank balance: {self.balance}")
 
     def _refresh_balance(self) -> float:
-        return float(sum(t.value for t in self.__transaction_history))
+        return self._ledger.total()
     
     def refresh(self) -> None:
         """
         Forces a refresh of the bank balance based on the entire transaction history.
+        The ledger keeps checkpoint balances, so only the newest transactions are added up.
         """
         self.balance = self._refresh_balance()
     
@@ -63,29 +64,39 @@ class Bank:
         :rtype: list[Transaction]
         """
         if get_all:
-            return self.__transaction_history
-        return self.__transaction_history[-count:]
+            return self._ledger.transactions()
+        return self._ledger.tail(count)
     
-    def build_new_transaction_record(self, all_transactions: list[list[Transaction]]) -> None:
+    @property
+    def ledger(self) -> Ledger | MappedLedger:
+        """
+        The store holding the transaction history.
+        """
+        return self._ledger
+
+    def build_new_transaction_record(
+            self,
+            all_transactions: Iterable[TransactionSource],
+            by_invoice: bool = False,
+            ledger: Ledger | MappedLedger | None = None
+    ) -> None:
         """
         Takes a list of multiple bank transaction records, merges them together, replaces the Bank's transaction record with the merged record, and updates the Bank.
+        The records are streamed straight into the new ledger, and the balance is kept as they go in.
         
-        :param all_transactions: The list of multiple bank transaction records.
-        :type all_transactions: list[list[Transaction]]
+        :param all_transactions: The bank transaction records: lists or iterators of Transactions, or Ledgers and MappedLedgers.
+        :type all_transactions: Iterable[TransactionSource]
+        :param by_invoice: Interleave the records by invoice number instead of appending them one record after another.
+        :type by_invoice: bool
+        :param ledger: An empty ledger to merge into. Defaults to a new in-memory Ledger with this bank's retention,
+            and is required when this bank keeps its history in a MappedLedger, so the merge stays on disk.
+        :type ledger: Ledger | MappedLedger | None
         """
-        new_transaction_history: list[Transaction] = []
-
-        first_initial = True
-        invoice_num = 0
-        for transact_list in all_transactions:
-            for transaction in transact_list:
-                new_transaction: Transaction = copy.deepcopy(transaction)
-                if transaction.name == "Initial Balance" and first_initial:
-                    first_initial = False
-                elif transaction.name == "Initial Balance" and not first_initial:
-                    new_transaction.name = "Merged Balance Initial"
-                new_transaction.invoice_num = invoice_num
-                invoice_num += 1
-                new_transaction_history.append(new_transaction)
-        self.__transaction_history = new_transaction_history
-        self.refresh()
+        if ledger is None:
+            if isinstance(self._ledger, MappedLedger):
+                raise ValueError("Pass a MappedLedger to merge into, this bank keeps its history on disk.")
+            ledger = Ledger(retention=self._ledger.retention)
+        self.balance = merge_into(ledger, all_transactions, by_invoice)
+        replaced, self._ledger = self._ledger, ledger
+        if replaced is not ledger:
+            replaced.close()
@@ -29,13 +29,15 @@ from .dealer import Dealer
 from .player import Player
 from .playing_card import PlayingCard
 from .deck import Deck
-from .cli_output_processor import print_new_card, print_dealer_held_card
+from .renderer import Renderer, TERMINAL_RENDERER
 from .round_results import RoundResults
 from enum import Enum
 
 BLACKJACK_PAYOUT = 3 / 2
 STANDARD_PAYOUT = 1
-INSURANCE_PAYOUT = 2
+INSURANCE_PAYOUT = 2.0
+# The house rule on soft 17. The game stands on all 17s; the solver and dealer_probabilities assume it does.
+DEALER_HITS_SOFT_17 = False
 
 class PossibleActions(Enum):
     """
@@ -77,56 +79,121 @@ def determine_winner(dealer_hand: Hand, player_hand: Hand, dealer_blackjack: boo
         return RoundResults.DEALER_WON
     return RoundResults.PUSH
     
+def hand_payout(bet: float, results: RoundResults) -> float:
+    """
+    Works out how much changes hands when a hand is settled.
+    
+    :param bet: The bet on the hand.
+    :type bet: float
+    :param results: The result of the hand.
+    :type results: RoundResults
+    :return: The amount won or lost, 0 on a push. Lost when the dealer won, won otherwise.
+    :rtype: float
+    """
+    match results:
+        case RoundResults.DEALER_WON:
+            return bet
+        case RoundResults.PLAYER_WON:
+            return bet * STANDARD_PAYOUT
+        case RoundResults.PLAYER_WON_BLACKJACK:
+            return bet * BLACKJACK_PAYOUT
+    return 0
+
+def settle_hand(dealer: Dealer, player: Player, bet: float, results: RoundResults) -> float:
+    """
+    Moves the money for a single settled hand between the dealer and player banks, and records the round.
+    No output is produced, so this is the path used by headless play.
+    
+    :param dealer: The Dealer
+    :type dealer: Dealer
+    :param player: The Player
+    :type player: Player
+    :param bet: The bet
+    :type bet: float
+    :param results: Who won the round and how.
+    :type results: RoundResults
+    :return: The amount won or lost on the hand, 0 on a push.
+    :rtype: float
+    """
+    amount = hand_payout(bet, results)
+    match results:
+        case RoundResults.DEALER_WON:
+            dealer.bank.add_transaction("Won Round", amount)
+        case RoundResults.PLAYER_WON | RoundResults.PLAYER_WON_BLACKJACK:
+            dealer.bank.add_transaction("Lost Round", -amount)
+            player.bank.add_transaction("Won Round", bet + amount)
+        case RoundResults.PUSH:
+            player.bank.add_transaction("Pushed", bet)
+    player_net = -amount if results == RoundResults.DEALER_WON else amount
+    dealer.history.add_round(results, amount, net=-player_net, wagered=bet)
+    player.history.add_round(results, amount, net=player_net, wagered=bet)
+    return amount
+
 def settle_bets(dealer: Dealer, player: Player, bet: float, results: RoundResults) -> str:
     """
     Settles the bet between the bank and the player, adjusting bank balances accordingly.
     
-    :param dealer_bank: The Dealer's bank
-    :type dealer_bank: Bank
-    :param player_bank: The Player's bank
-    :type player_bank: Bank
+    :param dealer: The Dealer
+    :type dealer: Dealer
+    :param player: The Player
+    :type player: Player
     :param bet: The bet
     :type bet: float
     :param results: Who won the round and how.
     :type results: RoundResults
+    :return: A line describing the outcome of the hand.
+    :rtype: str
     """
+    amount = settle_hand(dealer, player, bet, results)
     output_str = f"{player.name}"
-    # Debug
-    #print(f"DEBUG: bet_value: {bet}")
-    # End Debug
-    amount = 0
     match results:
         case RoundResults.DEALER_WON:
-            amount = bet
-            # Debug
-            #print(f"DEBUG: amount: {amount}")
-            # End Debug
             output_str += f" Lost {amount:.2f}"
-            dealer.bank.add_transaction("Won Round", amount)
-        case RoundResults.PLAYER_WON:
-            amount = bet * STANDARD_PAYOUT
-            # Debug
-            #print(f"DEBUG: amount: {amount}")
-            # End Debug
+        case RoundResults.PLAYER_WON | RoundResults.PLAYER_WON_BLACKJACK:
             output_str += f" Won {amount:.2f}"
-            dealer.bank.add_transaction("Lost Round", -amount)
-            player.bank.add_transaction("Won Round", bet + amount)
-        case RoundResults.PLAYER_WON_BLACKJACK:
-            amount = bet * BLACKJACK_PAYOUT
-            # Debug
-            #print(f"DEBUG: amount: {amount}")
-            # End Debug
-            output_str += f" Won {amount:.2f}"
-            dealer.bank.add_transaction("Lost Round", -amount)
-            player.bank.add_transaction("Won Round", bet + amount)
         case RoundResults.PUSH:
             output_str += f" Pushed."
-            player.bank.add_transaction("Pushed", bet)
-    dealer.history.add_round(results, amount)
-    player.history.add_round(results, amount)
     output_str += "\n"
     return output_str
 
+def settle_table(dealer: Dealer, players: list[Player]) -> list[list[RoundResults]]:
+    """
+    Settles every hand of every player at a table in one batch, once the dealer's turn is over.
+    Each player's bank gets one transaction for all their hands, and the dealer's bank one for the whole table.
+    Every hand is still recorded in the round histories.
+    
+    :param dealer: The Dealer
+    :type dealer: Dealer
+    :param players: The players, in seat order.
+    :type players: list[Player]
+    :return: The results of each player's hands, in seat order.
+    :rtype: list[list[RoundResults]]
+    """
+    dealer_hand = dealer.hand
+    dealer_blackjack = dealer_hand.has_blackjack
+    dealer_net = 0.0
+    table_results: list[list[RoundResults]] = []
+    for player in players:
+        returned = 0.0
+        seat_results: list[RoundResults] = []
+        for hand in player.split_hands:
+            bet = hand.bet.balance
+            result = determine_winner(dealer_hand, hand, dealer_blackjack, hand.has_blackjack)
+            amount = hand_payout(bet, result)
+            player_net = -amount if result == RoundResults.DEALER_WON else amount
+            if result != RoundResults.DEALER_WON:
+                returned += bet + amount
+            dealer_net -= player_net
+            dealer.history.add_round(result, amount, net=-player_net, wagered=bet)
+            player.history.add_round(result, amount, net=player_net, wagered=bet)
+            seat_results.append(result)
+        if returned:
+            player.bank.add_transaction("Table Settlement", returned)
+        table_results.append(seat_results)
+    if dealer_net:
+        dealer.bank.add_transaction("Table Settlement", dealer_net)
+    return table_results
+
 def settle_insurance(dealer: Dealer, player: Player, insurance: float, dealer_blackjack: bool) -> None:
     """
     Settles insurance payouts when Insurance is used.
@@ -161,34 +228,43 @@ def start_round(dealer: Dealer, player: Player, deck: Deck, bet_value: float | i
     :param bet_value: The value of the bet.
     :type bet_value: float | int
     """
-    # Debug
-    #print(f"DEBUG: start_round, pre-dealer-resethand. bet_value: {bet_value}")
+    start_table_round(dealer, [player], deck, [bet_value])
+
+def start_table_round(dealer: Dealer, players: list[Player], deck: Deck, bet_values: list[float | int]) -> None:
+    """
+    Starts a round at a table, dealing like a real table does: one card to each player in seat order, then one to
+    the dealer, then a second round of cards the same way.
+    
+    :param dealer: The Dealer
+    :type dealer: Dealer
+    :param players: The players, in seat order.
+    :type players: list[Player]
+    :param deck: The Deck
+    :type deck: Deck
+    :param bet_values: The bet of each player, in seat order.
+    :type bet_values: list[float | int]
+    """
+    if len(bet_values) != len(players):
+        raise ValueError("Every player needs a bet.")
     dealer.reset_hand()
-    # Debug
-    #print(f"DEBUG: start_round, pre-player-post-dealer-resethand. dealer.hand.bet.balance: {dealer.hand.bet.balance}")
-    player.reset_hand()
-    # Debug
-    #print(f"DEBUG: start_round, post-player-resethand. player.hand.bet.balance: {player.hand.bet.balance}")
-    player_hand: list[PlayingCard] = []
+    for player in players:
+        player.reset_hand()
+    player_hands: list[list[PlayingCard]] = [[] for _ in players]
     dealer_hand: list[PlayingCard] = []
     for _ in range(2):
-        player_hand.append(deck.drawCard())
+        for hand in player_hands:
+            hand.append(deck.drawCard())
         dealer_hand.append(deck.drawCard())
-    # Debug
-    #print(f"DEBUG: start_round, pre-dealer-start_hand")
-    dealer.start_hand(dealer_hand, bet_value)
-    # Debug
-    #print(f"DEBUG: start_round, pre-player-post-dealer-start_hand. dealer.hand.bet.balance {dealer.hand.bet.balance}")
-    player.start_hand(player_hand, bet_value)
-    # Debug
-    #print(f"DEBUG: start_round, post-player-start_hand. player.hand.bet.balance {player.hand.bet.balance}")
+    dealer.start_hand(dealer_hand)
+    for player, hand, bet_value in zip(players, player_hands, bet_values):
+        player.start_hand(hand, bet_value)
+        if player.hand.get_hand_value() == 21:
+            player.hand.has_blackjack = True
+            player.hand.has_stood = True
     if dealer.hand.get_hand_value() == 21:
         dealer.hand.has_blackjack = True
-    if player.hand.get_hand_value() == 21:
-        player.hand.has_blackjack = True
-        player.hand.has_stood = True
 
-def process_dealer_turn(dealer: Dealer, deck: Deck) -> int:
+def process_dealer_turn(dealer: Dealer, deck: Deck, renderer: Renderer = TERMINAL_RENDERER) -> int:
     """
     Runs the dealer's turn. 
     
@@ -196,15 +272,18 @@ def process_dealer_turn(dealer: Dealer, deck: Deck) -> int:
     :type dealer: Dealer
     :param deck: The Deck
     :type deck: Deck
+    :param renderer: Shows the dealer's cards as they are revealed and drawn. Pass renderer.NULL_RENDERER for no output.
+    :type renderer: Renderer
     :return: The final hand value.
     :rtype: int
     """
-    print_dealer_held_card(dealer)
+    renderer.dealer_held_card(dealer)
     if dealer.hand.has_blackjack == True:
         return dealer.hand.get_hand_value()
-    while dealer.hand.get_hand_value() < 17:
+    hand = dealer.hand
+    while hand.get_hand_value() < 17 or (DEALER_HITS_SOFT_17 and hand.get_hand_value() == 17 and hand.is_soft):
         new_card = deck.drawCard()
-        print_new_card(dealer, new_card)
-        dealer.hand.add_card(new_card)
+        renderer.new_card(dealer, new_card)
+        hand.add_card(new_card)
     dealer.hand.has_stood = True
     return dealer.hand.get_hand_value()
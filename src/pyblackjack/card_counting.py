@@ -0,0 +1,151 @@
+"""
+Card counting, kept up to date as cards leave the deck.
+
+A Deck owns a CardCounter and records every card as it is drawn, so reading a count never rescans the deck.
+Cards are counted when they are drawn, which includes the dealer's hole card before it is revealed.
+"""
+
+from array import array
+from .playing_card import CARDS, CARD_COUNT, Rank
+
+# Count tags for each card index.
+HI_LO_TAGS = array("b", (
+    1 if 2 <= card.rank.value <= 6 else -1 if card.value == 10 or card.is_ace else 0
+    for card in CARDS))
+KO_TAGS = array("b", (
+    1 if 2 <= card.rank.value <= 7 else -1 if card.value == 10 or card.is_ace else 0
+    for card in CARDS))
+OMEGA_II_TAGS = array("b", (
+    {2: 1, 3: 1, 4: 2, 5: 2, 6: 2, 7: 1, 8: 0, 9: -1, 10: -2}.get(card.value, 0)
+    for card in CARDS))
+# The rank index (Rank.value - 1) of each card index.
+CARD_RANK_INDEX = bytes(card.rank.value - 1 for card in CARDS)
+RANKS_PER_DECK = CARD_COUNT // len(Rank)
+
+
+class CardCounter:
+    """
+    Running and true counts for a deck, updated in O(1) per card drawn.
+    The properties are read-only; only the owning Deck records cards and resets the counter.
+
+    Attributes:
+        deck_count (int): The number of 52 card packs in the deck.
+    """
+    def __init__(self, deck_count: int = 1) -> None:
+        """
+        CardCounter constructor
+
+        :param deck_count: The number of 52 card packs in the deck.
+        :type deck_count: int
+        """
+        self.deck_count = deck_count
+        self._total_cards = CARD_COUNT * deck_count
+        self._reset()
+
+    def _reset(self) -> None:
+        """
+        Restores the counts of a full deck.
+        """
+        self._rank_remaining = [RANKS_PER_DECK * self.deck_count] * len(Rank)
+        self._cards_remaining = self._total_cards
+        self._hi_lo = 0
+        # KO is unbalanced, so it starts below zero and comes back to its pivot at the end of the deck.
+        self._ko = 4 - 4 * self.deck_count
+        self._omega_ii = 0
+
+    def _record(self, card_index: int) -> None:
+        """
+        Counts a card leaving the deck.
+
+        :param card_index: The index of the card drawn.
+        :type card_index: int
+        """
+        self._rank_remaining[CARD_RANK_INDEX[card_index]] -= 1
+        self._cards_remaining -= 1
+        self._hi_lo += HI_LO_TAGS[card_index]
+        self._ko += KO_TAGS[card_index]
+        self._omega_ii += OMEGA_II_TAGS[card_index]
+
+    @property
+    def hi_lo(self) -> int:
+        """
+        The Hi-Lo running count.
+        """
+        return self._hi_lo
+
+    @property
+    def ko(self) -> int:
+        """
+        The Knock-Out running count, starting from 4 - 4 * deck_count.
+        """
+        return self._ko
+
+    @property
+    def omega_ii(self) -> int:
+        """
+        The Omega II running count.
+        """
+        return self._omega_ii
+
+    @property
+    def running_count(self) -> int:
+        """
+        The Hi-Lo running count.
+        """
+        return self._hi_lo
+
+    @property
+    def cards_remaining(self) -> int:
+        return self._cards_remaining
+
+    @property
+    def decks_remaining(self) -> float:
+        return self._cards_remaining / CARD_COUNT
+
+    @property
+    def true_count(self) -> float:
+        """
+        The Hi-Lo running count per deck remaining.
+        """
+        if self._cards_remaining == 0:
+            return 0.0
+        return self._hi_lo * CARD_COUNT / self._cards_remaining
+
+    @property
+    def omega_ii_true_count(self) -> float:
+        """
+        The Omega II running count per deck remaining.
+        """
+        if self._cards_remaining == 0:
+            return 0.0
+        return self._omega_ii * CARD_COUNT / self._cards_remaining
+
+    def remaining(self, rank: Rank) -> int:
+        """
+        Gets how many cards of a rank are left.
+
+        :param rank: The rank.
+        :type rank: Rank
+        :return: The number of cards of the rank left in the deck.
+        :rtype: int
+        """
+        return self._rank_remaining[rank.value - 1]
+
+    def rank_counts(self) -> tuple[int, ...]:
+        """
+        Gets how many cards of each rank are left.
+
+        :return: The counts, in Rank order, Ace first.
+        :rtype: tuple[int, ...]
+        """
+        return tuple(self._rank_remaining)
+
+    def composition(self) -> tuple[int, ...]:
+        """
+        Gets how many cards of each blackjack value are left, with the ten-valued ranks combined.
+
+        :return: The counts for values 1 (Ace) to 10.
+        :rtype: tuple[int, ...]
+        """
+        ranks = self._rank_remaining
+        return tuple(ranks[:9]) + (ranks[9] + ranks[10] + ranks[11] + ranks[12],)
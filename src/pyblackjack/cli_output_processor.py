@@ -8,12 +8,7 @@ from .round_results import RoundResults
 
 
 def get_hand_str(hand: Hand) -> str:
-    result_str = f''
-    delimiter = ", "
-    for card in hand.cards:
-        result_str += repr(card) + delimiter
-    result_str += f"Value: {hand.get_hand_value()}"
-    return result_str
+    return "".join([repr(card) + ", " for card in hand.cards]) + f"Value: {hand.get_hand_value()}"
 
 def print_bank_balance(actor: Actor) -> None:
     bank = actor.bank
@@ -25,10 +20,11 @@ def show_round_start(dealer: Dealer, player: Player, deck: Deck) -> None:
     print_bank_balance(player)
     print_bank_balance(dealer)
 
+def format_end_of_round_state(dealer: Dealer, player: Player, end_state_str: str) -> str:
+    return f"{end_state_str}\nDealer Bank: {dealer.bank.balance}\nPlayer Bank: {player.bank.balance}"
+
 def show_end_of_round_state(dealer: Dealer, player: Player, end_state_str: str) -> None:
-    print(end_state_str)
-    print(f"Dealer Bank: {dealer.bank.balance}")
-    print(f"Player Bank: {player.bank.balance}")
+    print(format_end_of_round_state(dealer, player, end_state_str))
 
 def show_game_end_score(starting_balance: float, ending_balance: float, final_dealer_balance: float) -> None:
     total_change = ending_balance - starting_balance
@@ -46,33 +42,37 @@ def show_game_end_score(starting_balance: float, ending_balance: float, final_de
         print(f"You made money gambling, {total_change:.2f} to be precise. Well done!")
 
 def get_round_state_str(dealer_upcard: PlayingCard, player: Player, deck: Deck) -> str:
-    output_str = f"\nDealer Card is: {dealer_upcard}\n"
-    output_str += get_player_hand_str(player)
-    output_str += f"Deck has {deck.get_deck_percentage():.0%} remaining cards.\n"
-    return output_str
+    return (
+        f"\nDealer Card is: {dealer_upcard}\n"
+        f"{get_player_hand_str(player)}"
+        f"Deck has {deck.get_deck_percentage():.0%} remaining cards.\n")
 
 def get_player_hand_str(player: Player) -> str:
     total_hands = len(player.split_hands)
-    output_str = f""
-    if total_hands > 1:
-        for i in range(total_hands):
-            current_hand = player.split_hands[i]
-            output_str += f"Player Hand #{i + 1}: {get_hand_str(current_hand)}\n"
-            if i == player.current_hand_index:
-                output_str += f"Status: Active"
-            elif current_hand.has_busted:
-                output_str += f"Status: Busted"
-            elif current_hand.has_stood:
-                output_str += f"Status: Stood"
-            else:
-                output_str += f"Status: Waiting"
-            output_str += f"\n\n"
-    else:
-        output_str += f"Player Hand is: {get_hand_str(player.hand)}\n"
-    return output_str
+    if total_hands <= 1:
+        return f"Player Hand is: {get_hand_str(player.hand)}\n"
+    parts: list[str] = []
+    for i in range(total_hands):
+        current_hand = player.split_hands[i]
+        if i == player.current_hand_index:
+            status = "Active"
+        elif current_hand.has_busted:
+            status = "Busted"
+        elif current_hand.has_stood:
+            status = "Stood"
+        else:
+            status = "Waiting"
+        parts.append(f"Player Hand #{i + 1}: {get_hand_str(current_hand)}\nStatus: {status}\n\n")
+    return "".join(parts)
+
+def format_new_card(actor: Actor, card: PlayingCard) -> str:
+    return f"{actor.name} added {card}. Hand value: {actor.hand.get_hand_value()}"
+
+def format_dealer_held_card(dealer: Dealer) -> str:
+    return f"{dealer.name} reveals {dealer.hand.cards[1]} as second card. Dealer hand value: {dealer.hand.get_hand_value()}"
 
 def print_new_card(actor: Actor, card: PlayingCard) -> None:
-    print(f"{actor.name} added {card}. Hand value: {actor.hand.get_hand_value()}")
+    print(format_new_card(actor, card))
 
 def print_dealer_held_card(dealer: Dealer) -> None:
-    print(f"{dealer.name} reveals {dealer.hand.cards[1]} as second card. Dealer hand value: {dealer.hand.get_hand_value()}")
+    print(format_dealer_held_card(dealer))
@@ -0,0 +1,275 @@
+"""
+Exact probabilities of the dealer's final hand.
+
+The dealer's play is fixed by blackjack.process_dealer_turn: draw below 17, stand on 17, and stop on a natural. Soft
+17 is drawn to when the house rule blackjack.DEALER_HITS_SOFT_17 is set, read when a DealerProbabilities is made.
+So the chance of each final outcome depends only on the upcard and the composition of the remaining cards, written
+as a tuple of counts for each card value (index 0 is Ace, index 9 is the ten-valued cards).
+"""
+
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from .deck import Deck
+from . import blackjack
+
+Composition = tuple[int, ...]
+DealerOutcome = tuple[float, ...]
+
+DEALER_STANDS_ON = 17
+# The hard total of a soft 17, an Ace counted as 1 plus six.
+SOFT_17_HARD = 7
+# Outcome indexes: final totals 17 - 21, then bust, then blackjack.
+BUST = 5
+BLACKJACK = 6
+OUTCOME_COUNT = 7
+
+DEFAULT_MAXSIZE = 200_000
+DEFAULT_MAX_DRAW_STATES = 2_000_000
+
+
+def composition_of(deck: Deck) -> Composition:
+    """
+    Gets the card value counts of the cards left in a deck.
+
+    :param deck: The deck.
+    :type deck: Deck
+    :return: The count of each card value, Ace first.
+    :rtype: Composition
+    """
+    return deck.count.composition()
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """
+    Counters for a DealerProbabilities cache.
+
+    Attributes:
+        hits (int): Lookups answered from the cache.
+        misses (int): Lookups that had to be computed.
+        evictions (int): Distributions dropped to stay within maxsize.
+        size (int): Distributions currently cached.
+        draw_states (int): Dealer draw states currently memoized.
+        draw_flushes (int): Times the draw state memo was emptied to stay within max_draw_states.
+    """
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    draw_states: int
+    draw_flushes: int
+
+
+class DealerProbabilities:
+    """
+    Computes dealer outcome distributions exactly, keeping recent results in a least recently used cache.
+
+    Two things are cached. Finished distributions are kept per (upcard, composition) up to maxsize entries, and the
+    dealer's intermediate draw states are memoized so lookups on nearby compositions share work. The draw states are
+    packed, each composition encoded as one integer and the outcome probabilities stored in a flat array, and the
+    whole memo is emptied once it grows past max_draw_states.
+
+    Attributes:
+        maxsize (int | None): The most distributions kept, None for no limit.
+        max_draw_states (int | None): The most draw states kept before the memo is emptied, None for no limit.
+        hits_soft_17 (bool): Whether the dealer draws to a soft 17. Fixed for the life of the cache.
+    """
+    def __init__(
+            self,
+            maxsize: int | None = DEFAULT_MAXSIZE,
+            max_draw_states: int | None = DEFAULT_MAX_DRAW_STATES,
+            hits_soft_17: bool | None = None
+    ) -> None:
+        """
+        DealerProbabilities constructor
+
+        :param maxsize: The most distributions kept, None for no limit.
+        :type maxsize: int | None
+        :param max_draw_states: The most draw states kept before the memo is emptied, None for no limit.
+        :type max_draw_states: int | None
+        :param hits_soft_17: Whether the dealer draws to a soft 17, blackjack.DEALER_HITS_SOFT_17 by default.
+        :type hits_soft_17: bool | None
+        """
+        self.maxsize = maxsize
+        self.max_draw_states = max_draw_states
+        self.hits_soft_17 = blackjack.DEALER_HITS_SOFT_17 if hits_soft_17 is None else hits_soft_17
+        self._cache: OrderedDict[tuple[int, Composition], DealerOutcome] = OrderedDict()
+        self._radix = 0
+        self._weights: tuple[int, ...] = ()
+        self._draw_index: dict[int, int] = {}
+        self._draw_values = array("d")
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._draw_flushes = 0
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    @property
+    def evictions(self) -> int:
+        return self._evictions
+
+    def stats(self) -> CacheStats:
+        """
+        Gets the cache counters.
+
+        :return: The counters.
+        :rtype: CacheStats
+        """
+        return CacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            size=len(self._cache),
+            draw_states=len(self._draw_index),
+            draw_flushes=self._draw_flushes)
+
+    def clear(self) -> None:
+        """
+        Empties both caches. The counters are kept.
+        """
+        self._cache.clear()
+        self._clear_draw_states()
+
+    def lookup(self, upcard: int, composition: Composition) -> DealerOutcome:
+        """
+        Gets the probability of each final dealer outcome.
+
+        :param upcard: The dealer's upcard value, 1 - 10.
+        :type upcard: int
+        :param composition: The cards left for the hole card and draws, the upcard already removed.
+        :type composition: Composition
+        :return: Probabilities of a final 17, 18, 19, 20, 21, bust, and blackjack.
+        :rtype: DealerOutcome
+        """
+        key = (upcard, composition)
+        cache = self._cache
+        cached = cache.get(key)
+        if cached is not None:
+            self._hits += 1
+            cache.move_to_end(key)
+            return cached
+        self._misses += 1
+        result = self._compute(upcard, composition)
+        cache[key] = result
+        if self.maxsize is not None and len(cache) > self.maxsize:
+            cache.popitem(last=False)
+            self._evictions += 1
+        return result
+
+    def lookup_deck(self, upcard: int, deck: Deck) -> DealerOutcome:
+        """
+        Gets the probability of each final dealer outcome for the cards left in a deck.
+
+        :param upcard: The dealer's upcard value, 1 - 10.
+        :type upcard: int
+        :param deck: The deck, the upcard already drawn from it.
+        :type deck: Deck
+        :return: Probabilities of a final 17, 18, 19, 20, 21, bust, and blackjack.
+        :rtype: DealerOutcome
+        """
+        return self.lookup(upcard, composition_of(deck))
+
+    def _clear_draw_states(self) -> None:
+        self._draw_index.clear()
+        self._draw_values = array("d")
+
+    def _compute(self, upcard: int, composition: Composition) -> DealerOutcome:
+        """
+        Works out a distribution by drawing the hole card, then playing out the dealer's draws.
+        """
+        radix = max(composition) + 1
+        if radix > self._radix:
+            # Composition codes depend on the radix, so draw states computed with a smaller one are dropped.
+            self._radix = max(radix, 2 * self._radix)
+            self._weights = tuple(self._radix ** index for index in range(10))
+            self._clear_draw_states()
+        if self.max_draw_states is not None and len(self._draw_index) > self.max_draw_states:
+            self._clear_draw_states()
+            self._draw_flushes += 1
+        weights = self._weights
+        code = sum(count * weight for count, weight in zip(composition, weights))
+        remaining = sum(composition)
+        outcome = [0.0] * OUTCOME_COUNT
+        counts = list(composition)
+        for index in range(10):
+            count = counts[index]
+            if count == 0:
+                continue
+            probability = count / remaining
+            hole = index + 1
+            hard = upcard + hole
+            has_ace = upcard == 1 or hole == 1
+            total = hard + 10 if has_ace and hard <= 11 else hard
+            if total == 21:
+                outcome[BLACKJACK] += probability
+            elif total >= DEALER_STANDS_ON and not (self.hits_soft_17 and has_ace and hard == SOFT_17_HARD):
+                outcome[total - DEALER_STANDS_ON] += probability
+            else:
+                counts[index] = count - 1
+                offset = self._draw(hard, has_ace, counts, remaining - 1, code - weights[index])
+                counts[index] = count
+                values = self._draw_values
+                for result in range(BLACKJACK):
+                    outcome[result] += probability * values[offset + result]
+        return tuple(outcome)
+
+    def _draw(self, hard: int, has_ace: bool, counts: list[int], remaining: int, code: int) -> int:
+        """
+        Plays out the dealer's draws from a hand of two or more cards that is still below 17, or a soft 17 the dealer
+        hits.
+        Draws that end the dealer's turn are added up directly rather than recursed into, and counts is updated in
+        place and restored, so no composition tuples are built.
+
+        :return: The offset in the packed value array of the probabilities of a final 17, 18, 19, 20, 21 and bust.
+        :rtype: int
+        """
+        key = code << 6 | hard << 1 | has_ace
+        offset = self._draw_index.get(key)
+        if offset is not None:
+            return offset
+        values = self._draw_values
+        weights = self._weights
+        hits_soft_17 = self.hits_soft_17
+        final_17 = final_18 = final_19 = final_20 = final_21 = bust = 0.0
+        for index in range(10):
+            count = counts[index]
+            if count == 0:
+                continue
+            probability = count / remaining
+            new_hard = hard + index + 1
+            new_has_ace = has_ace or index == 0
+            total = new_hard + 10 if new_has_ace and new_hard <= 11 else new_hard
+            if total > 21:
+                bust += probability
+            elif total == 17 and not (hits_soft_17 and new_hard == SOFT_17_HARD):
+                final_17 += probability
+            elif total == 18:
+                final_18 += probability
+            elif total == 19:
+                final_19 += probability
+            elif total == 20:
+                final_20 += probability
+            elif total == 21:
+                final_21 += probability
+            else:
+                counts[index] = count - 1
+                sub = self._draw(new_hard, new_has_ace, counts, remaining - 1, code - weights[index])
+                counts[index] = count
+                final_17 += probability * values[sub]
+                final_18 += probability * values[sub + 1]
+                final_19 += probability * values[sub + 2]
+                final_20 += probability * values[sub + 3]
+                final_21 += probability * values[sub + 4]
+                bust += probability * values[sub + 5]
+        offset = len(values)
+        values.extend((final_17, final_18, final_19, final_20, final_21, bust))
+        self._draw_index[key] = offset
+        return offset
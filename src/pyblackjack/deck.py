@@ -1,27 +1,55 @@
 import random
-from .playing_card import PlayingCard, Rank, Suit
+from .playing_card import PlayingCard, CARDS, CARD_COUNT
+from .card_counting import CardCounter
+from .rng import ShuffleSource
 from . import constants
 
 
 class Deck:
     """
-    A 52 card playing deck. Actually maintains all the cards in the deck, so card counting is completely possible.
+    A playing deck of one or more 52 card packs. Actually maintains all the cards in the deck, so card counting is completely possible.
+
+    Attributes:
+        deck_count (int): The number of 52 card packs in the deck.
+        cut_card (int): The deck is reset by confirm_deck_health once this many cards or fewer remain.
+        reshuffle_count (int): The number of times the deck has been reset.
+        count (CardCounter): Read-only running counts of the cards drawn since the last reset.
     """
-    def __init__(self) -> None:
-        self.cards: list[PlayingCard] = []
-        self._card_set: set[PlayingCard] = set()
-        for suit in Suit:
-            for rank in Rank:
-                card = PlayingCard(rank, suit)
-                self.cards.append(card)
-                self._card_set.add(card)
-        self.shuffle()
+    def __init__(self, rng: ShuffleSource | None = None, deck_count: int = 1, cut_card: int | None = None) -> None:
+        """
+        Deck constructor
+
+        :param rng: Shuffles the deck, a random.Random or another ShuffleSource such as rng.NumpyRNG. Seed it for a reproducible deck.
+        :type rng: ShuffleSource | None
+        :param deck_count: The number of 52 card packs in the deck.
+        :type deck_count: int
+        :param cut_card: The number of remaining cards at which the deck is reset. Defaults to constants.DECK_REFRESH_PERCENTAGE of the deck.
+        :type cut_card: int | None
+        """
+        if deck_count < 1:
+            raise ValueError("A deck needs at least one pack of cards.")
+        self._rng = rng if rng is not None else random.Random()
+        self.deck_count = deck_count
+        # Cards are stored as their index, see playing_card.card_from_index. The next card drawn is the last one.
+        self._full_deck = bytes(range(CARD_COUNT)) * deck_count
+        self.cards = bytearray(self._full_deck)
         self._deck_refresh_percent = constants.DECK_REFRESH_PERCENTAGE
+        if cut_card is None:
+            cut_card = int(len(self._full_deck) * self._deck_refresh_percent)
+        if cut_card < 0 or cut_card >= len(self._full_deck):
+            raise ValueError("The cut card must be inside the deck.")
+        self.cut_card = cut_card
+        self.reshuffle_count = 0
+        self._counter = CardCounter(deck_count)
+        self.shuffle()
+    @property
+    def count(self) -> CardCounter:
+        return self._counter
     def shuffle(self) -> None:
         """
         Shuffles the current deck. Does not require the deck to be full.
         """
-        random.shuffle(self.cards)
+        self._rng.shuffle(self.cards)
     def get_deck_percentage(self) -> float:
         """
         Get the percentage of cards remaining in the deck.
@@ -29,27 +57,41 @@ class Deck:
         :return: The percentage.
         :rtype: float
         """
-        return len(self.cards) / len(self._card_set)
+        return len(self.cards) / len(self._full_deck)
+    def needs_reshuffle(self) -> bool:
+        """
+        Checks whether the cut card has been reached.
+
+        :return: True if the deck should be reset before the next round.
+        :rtype: bool
+        """
+        return len(self.cards) <= self.cut_card
     def confirm_deck_health(self) -> None:
         """
         Checks the deck, resets it if needed.
         """
-        if self.get_deck_percentage() <= self._deck_refresh_percent:
+        if self.needs_reshuffle():
             self._resetDeck()
     def get_remaining_cards(self) -> int:
         return len(self.cards)
     def _resetDeck(self) -> None:
         """
-        Resets the Deck, which restores it to max capacity of 52 cards and shuffles the deck.
+        Resets the Deck, which restores it to max capacity and shuffles the deck.
+        The card order is copied back in place, so no cards are reallocated.
         """
-        self.cards = list(self._card_set)
+        self.cards[:] = self._full_deck
         self.shuffle()
+        self.reshuffle_count += 1
+        self._counter._reset()
     def drawCard(self) -> PlayingCard:
         """
-        Draws a card from the Deck.
+        Draws a card from the Deck. An empty deck is reset before drawing.
 
         :return: A playing card, or a list of playing cards.
         :rtype: PlayingCard
         """
-        result = self.cards.pop()
-        return result
\ No newline at end of file
+        if not self.cards:
+            self._resetDeck()
+        card_index = self.cards.pop()
+        self._counter._record(card_index)
+        return CARDS[card_index]
@@ -1,4 +1,4 @@
-from .playing_card import PlayingCard, Rank
+from .playing_card import PlayingCard
 from .bank import Bank
 
 
@@ -8,9 +8,13 @@ class Hand:
     """
     def __init__(self, starting_cards: list[PlayingCard], bet_value: float | int = 0) -> None:
         self.cards: list[PlayingCard] = starting_cards
-        self._ace_active_count: int = 0
-        self._update_ace_count()
-        self.hand_value = self.get_hand_value()
+        # Running totals, kept up to date by add_card. Aces count as 1 in the hard total.
+        self._hard_total: int = 0
+        self._ace_count: int = 0
+        for card in starting_cards:
+            self._hard_total += card.value
+            self._ace_count += card.is_ace
+        self.hand_value = self._evaluate()
         self.has_blackjack = False
         self.has_stood = False
         self.has_busted = False
@@ -26,15 +30,32 @@ class Hand:
         :return: The current hand value
         :rtype: int
         """
-        current_value: int = 0
-        for card in self.cards:
-            current_value += card.value
-        current_value += self._ace_active_count * 10
-        while (current_value > 21 and self._ace_active_count > 0):
-            current_value -= 10
-            self._ace_active_count -= 1
-        self.hand_value = current_value
         return self.hand_value
+
+    @property
+    def total(self) -> int:
+        """
+        The current value of the hand, adjusted for Aces.
+        """
+        return self.hand_value
+
+    @property
+    def is_soft(self) -> bool:
+        """
+        Whether an Ace in the hand is being counted as 11.
+        """
+        return self._ace_count > 0 and self._hard_total <= 11
+
+    def _evaluate(self) -> int:
+        """
+        Works out the hand value from the running totals. At most one Ace can count as 11 without busting.
+        
+        :return: The hand value
+        :rtype: int
+        """
+        if self._ace_count > 0 and self._hard_total <= 11:
+            return self._hard_total + 10
+        return self._hard_total
     
     def add_bet(self, name: str, amount: float | int) -> float:
         """
@@ -61,10 +82,12 @@ class Hand:
         :rtype: int
         """
         self.cards.append(card)
-        self._update_ace_count()
+        self._hard_total += card.value
+        self._ace_count += card.is_ace
+        self.hand_value = self._evaluate()
         self.check_if_busted()
 
-        return self.get_hand_value()
+        return self.hand_value
     
     def double_down(self, card: PlayingCard) -> int:
         """
@@ -87,13 +110,7 @@ class Hand:
         :return: True if busted, false otherwise.
         :rtype: bool
         """
-        if self.get_hand_value() > 21:
+        if self.hand_value > 21:
             self.has_busted = True
             self.has_stood = True
         return self.has_busted
-    
-    def _update_ace_count(self) -> None:
-        self._ace_active_count = 0
-        for card in self.cards:
-            if card.rank == Rank.ACE:
-                self._ace_active_count += 1
\ No newline at end of file
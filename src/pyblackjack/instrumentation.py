@@ -0,0 +1,338 @@
+"""
+Timers and counters for the phases of a round, and profiling helpers.
+
+Give a Simulator an Instruments object and every round records the time spent in each phase, the cards drawn and
+the deck reshuffles. Timings are kept in log-bucketed histograms, so memory stays fixed however many rounds are
+played, and percentiles are read from the buckets to within about 6%. Without Instruments the Simulator only pays
+a None check per phase.
+
+For a closer look, profile_call runs any callable under cProfile, or under a tracer that writes collapsed stacks
+("outer;inner;leaf microseconds" per line) for flame graph tools.
+"""
+
+import cProfile
+import io
+import json
+import pstats
+import sys
+import time
+from typing import Any, Callable
+
+# The phases of a round, in the order they run.
+START_ROUND = "start_round"
+INSURANCE = "insurance"
+PLAYER_TURN = "player_turn"
+DEALER_TURN = "process_dealer_turn"
+SETTLE_INSURANCE = "settle_insurance"
+SETTLE_BETS = "settle_bets"
+PHASES = (START_ROUND, INSURANCE, PLAYER_TURN, DEALER_TURN, SETTLE_INSURANCE, SETTLE_BETS)
+
+# Each power of two is split into 2 ** SUB_BUCKET_BITS buckets.
+SUB_BUCKET_BITS = 4
+REPORTED_PERCENTILES = (50, 90, 99)
+
+
+class Histogram:
+    """
+    Counts of non-negative integer samples in log-spaced buckets. Values below 2 ** SUB_BUCKET_BITS are exact.
+
+    Attributes:
+        count (int): Samples recorded.
+        total (int): The sum of the samples.
+        min (int): The smallest sample, 0 when empty.
+        max (int): The largest sample, 0 when empty.
+    """
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+        self._buckets: dict[int, int] = {}
+
+    @staticmethod
+    def _bucket(value: int) -> int:
+        exponent = value.bit_length() - 1
+        if exponent < SUB_BUCKET_BITS:
+            return value
+        sub_bucket = (value >> (exponent - SUB_BUCKET_BITS)) & ((1 << SUB_BUCKET_BITS) - 1)
+        return (exponent << SUB_BUCKET_BITS) | sub_bucket
+
+    @staticmethod
+    def _bucket_bounds(bucket: int) -> tuple[int, int]:
+        """
+        Gets the lowest and highest value of a bucket.
+        """
+        if bucket < 1 << SUB_BUCKET_BITS:
+            return bucket, bucket
+        exponent = bucket >> SUB_BUCKET_BITS
+        sub_bucket = bucket & ((1 << SUB_BUCKET_BITS) - 1)
+        shift = exponent - SUB_BUCKET_BITS
+        low = ((1 << SUB_BUCKET_BITS) | sub_bucket) << shift
+        return low, low + (1 << shift) - 1
+
+    def record(self, value: int) -> None:
+        """
+        Adds a sample.
+
+        :param value: The sample, negative values are counted as 0.
+        :type value: int
+        """
+        if value < 0:
+            value = 0
+        if self.count == 0 or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.count += 1
+        self.total += value
+        bucket = self._bucket(value)
+        self._buckets[bucket] = self._buckets.get(bucket, 0) + 1
+
+    def merge(self, other: "Histogram") -> None:
+        """
+        Adds every sample of another histogram.
+
+        :param other: The histogram to add.
+        :type other: Histogram
+        """
+        if other.count == 0:
+            return
+        self.min = other.min if self.count == 0 else min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.count += other.count
+        self.total += other.total
+        for bucket, count in other._buckets.items():
+            self._buckets[bucket] = self._buckets.get(bucket, 0) + count
+
+    @property
+    def mean(self) -> float:
+        if self.count == 0:
+            return 0.0
+        return self.total / self.count
+
+    def percentile(self, percent: float) -> float:
+        """
+        Estimates a percentile as the middle of the bucket it falls in.
+
+        :param percent: The percentile, 0 - 100.
+        :type percent: float
+        :return: The estimate, clamped to the recorded min and max. 0 when empty.
+        :rtype: float
+        """
+        if self.count == 0:
+            return 0.0
+        rank = max(1, -(-self.count * percent // 100))
+        seen = 0
+        for bucket in sorted(self._buckets):
+            seen += self._buckets[bucket]
+            if seen >= rank:
+                low, high = self._bucket_bounds(bucket)
+                return min(max((low + high) / 2, self.min), self.max)
+        return float(self.max)
+
+    def to_dict(self, scale: float = 1.0) -> dict[str, float]:
+        """
+        Summarises the histogram.
+
+        :param scale: Multiplies every value, for example 1e-3 to report nanoseconds as microseconds.
+        :type scale: float
+        :return: count, mean, min, max and the REPORTED_PERCENTILES as "p50" and so on.
+        :rtype: dict[str, float]
+        """
+        summary: dict[str, float] = {
+            "count": self.count,
+            "mean": self.mean * scale,
+            "min": self.min * scale,
+            "max": self.max * scale}
+        for percent in REPORTED_PERCENTILES:
+            summary[f"p{percent}"] = self.percentile(percent) * scale
+        return summary
+
+
+class Instruments:
+    """
+    Per phase timings and per round deck counters, filled in by a Simulator.
+
+    Attributes:
+        rounds (int): Rounds recorded.
+        phases (dict[str, Histogram]): Nanoseconds spent in each phase, one sample per round.
+        round_time (Histogram): Nanoseconds per round, every phase included.
+        cards_drawn (Histogram): Cards drawn per round.
+        reshuffles (int): Deck reshuffles over every round recorded.
+    """
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Forgets everything recorded.
+        """
+        self.rounds = 0
+        self.phases: dict[str, Histogram] = {phase: Histogram() for phase in PHASES}
+        self.round_time = Histogram()
+        self.cards_drawn = Histogram()
+        self.reshuffles = 0
+
+    def record_phase(self, phase: str, nanoseconds: int) -> None:
+        """
+        Records the time taken by one phase of a round.
+
+        :param phase: The phase, one of PHASES.
+        :type phase: str
+        :param nanoseconds: The time taken.
+        :type nanoseconds: int
+        """
+        self.phases[phase].record(nanoseconds)
+
+    def record_round(self, nanoseconds: int, cards_drawn: int, reshuffles: int) -> None:
+        """
+        Records the totals of a finished round.
+
+        :param nanoseconds: The time taken by the whole round.
+        :type nanoseconds: int
+        :param cards_drawn: Cards drawn during the round.
+        :type cards_drawn: int
+        :param reshuffles: Deck reshuffles during the round.
+        :type reshuffles: int
+        """
+        self.rounds += 1
+        self.round_time.record(nanoseconds)
+        self.cards_drawn.record(cards_drawn)
+        self.reshuffles += reshuffles
+
+    def merge(self, other: "Instruments") -> None:
+        """
+        Adds everything recorded by another Instruments, such as one from a worker process.
+
+        :param other: The Instruments to add.
+        :type other: Instruments
+        """
+        self.rounds += other.rounds
+        for phase, histogram in other.phases.items():
+            self.phases.setdefault(phase, Histogram()).merge(histogram)
+        self.round_time.merge(other.round_time)
+        self.cards_drawn.merge(other.cards_drawn)
+        self.reshuffles += other.reshuffles
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Summarises the recordings, with times in microseconds.
+
+        :return: The summary.
+        :rtype: dict[str, Any]
+        """
+        return {
+            "rounds": self.rounds,
+            "unit": "microseconds",
+            "phases": {phase: histogram.to_dict(1e-3) for phase, histogram in self.phases.items()},
+            "round": self.round_time.to_dict(1e-3),
+            "cards_drawn_per_round": self.cards_drawn.to_dict(),
+            "reshuffles": self.reshuffles}
+
+    def to_json(self, path: str | None = None) -> str:
+        """
+        Exports the summary as JSON.
+
+        :param path: A file to write the JSON to as well.
+        :type path: str | None
+        :return: The JSON text.
+        :rtype: str
+        """
+        text = json.dumps(self.to_dict(), indent=2)
+        if path is not None:
+            with open(path, "w", encoding="utf-8") as json_file:
+                json_file.write(text + "\n")
+        return text
+
+
+class StackCollector:
+    """
+    A tracing profiler that adds up the time spent in each distinct call stack, including C functions.
+    Tracing every call slows the program down several times, so use it on short runs.
+
+    Attributes:
+        stacks (dict[tuple[str, ...], int]): Nanoseconds spent with each stack on top, outermost frame first.
+    """
+    def __init__(self) -> None:
+        self.stacks: dict[tuple[str, ...], int] = {}
+        self._stack: list[str] = []
+        self._last = 0
+
+    @staticmethod
+    def _frame_name(frame, event: str, arg) -> str:
+        if event.startswith("c_"):
+            module = getattr(arg, "__module__", None) or "builtins"
+            return f"{module}.{getattr(arg, '__qualname__', repr(arg))}"
+        code = frame.f_code
+        module = frame.f_globals.get("__name__", "?")
+        return f"{module}.{code.co_name}:{code.co_firstlineno}"
+
+    def _trace(self, frame, event: str, arg) -> None:
+        now = time.perf_counter_ns()
+        if self._stack:
+            key = tuple(self._stack)
+            self.stacks[key] = self.stacks.get(key, 0) + now - self._last
+        if event == "call" or event == "c_call":
+            self._stack.append(self._frame_name(frame, event, arg))
+        elif self._stack:
+            self._stack.pop()
+        self._last = time.perf_counter_ns()
+
+    def start(self) -> None:
+        self._stack = []
+        self._last = time.perf_counter_ns()
+        sys.setprofile(self._trace)
+
+    def stop(self) -> None:
+        sys.setprofile(None)
+
+    def collapsed(self) -> str:
+        """
+        Formats the stacks as collapsed stack lines, with times in microseconds.
+
+        :return: One "frame;frame;frame microseconds" line per stack, heaviest first.
+        :rtype: str
+        """
+        lines = [
+            f"{';'.join(stack)} {nanoseconds // 1000}"
+            for stack, nanoseconds in sorted(self.stacks.items(), key=lambda item: -item[1])
+            if nanoseconds >= 1000]
+        return "\n".join(lines) + "\n"
+
+
+def profile_call(func: Callable[[], Any], mode: str = "cprofile", output: str | None = None) -> str:
+    """
+    Runs a callable under a profiler.
+
+    :param func: The code to profile, for example lambda: simulator.run(10_000).
+    :type func: Callable[[], Any]
+    :param mode: "cprofile" for cProfile statistics, or "collapsed" for collapsed stacks.
+    :type mode: str
+    :param output: A file to save to: pstats data for cprofile, the collapsed stack text for collapsed.
+    :type output: str | None
+    :return: A readable report: the top cProfile entries by cumulative time, or the collapsed stacks.
+    :rtype: str
+    """
+    match mode:
+        case "cprofile":
+            profiler = cProfile.Profile()
+            profiler.runcall(func)
+            if output is not None:
+                profiler.dump_stats(output)
+            report = io.StringIO()
+            pstats.Stats(profiler, stream=report).sort_stats("cumulative").print_stats(30)
+            return report.getvalue()
+        case "collapsed":
+            collector = StackCollector()
+            collector.start()
+            try:
+                func()
+            finally:
+                collector.stop()
+            text = collector.collapsed()
+            if output is not None:
+                with open(output, "w", encoding="utf-8") as output_file:
+                    output_file.write(text)
+            return text
+        case _:
+            raise ValueError(f"Unknown profile mode: {mode}")
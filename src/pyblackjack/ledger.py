@@ -0,0 +1,256 @@
+"""
+Columnar storage for bank transactions.
+
+Amounts, invoice numbers and transaction names are kept in typed arrays, with names interned as small integer codes.
+Every CHECKPOINT_INTERVAL entries the running balance is stored, so the total only has to add up the entries since
+the last checkpoint. An optional retention window keeps the ledger bounded by rolling the oldest entries into one
+summary record.
+"""
+
+import heapq
+import itertools
+from array import array
+from typing import Iterable, Iterator, Protocol, runtime_checkable
+
+CHECKPOINT_INTERVAL = 1024
+ROLLED_BALANCE_NAME = "Rolled Balance"
+INITIAL_BALANCE_NAME = "Initial Balance"
+MERGED_INITIAL_BALANCE_NAME = "Merged Balance Initial"
+
+
+class Transaction:
+    def __init__(self, name: str, amount: float | int, invoice_num: int) -> None:
+        self.name = name
+        self.value = float(amount)
+        self.invoice_num = invoice_num
+
+
+class Ledger:
+    """
+    An append-only transaction store.
+
+    Attributes:
+        retention (int | None): The most entries kept before the oldest are rolled up, None to keep everything.
+        next_invoice (int): The invoice number the next entry will get.
+    """
+    def __init__(self, retention: int | None = None) -> None:
+        """
+        Ledger constructor
+
+        :param retention: The most entries kept before the oldest are rolled into a summary record. None keeps everything.
+        :type retention: int | None
+        """
+        if retention is not None and retention < 1:
+            raise ValueError("Retention must keep at least one entry.")
+        self.retention = retention
+        self.next_invoice = 0
+        self._amounts = array("d")
+        self._invoices = array("q")
+        self._names = array("I")
+        self._name_table: list[str] = []
+        self._name_codes: dict[str, int] = {}
+        # _checkpoints[k] is the sum of the first (k + 1) * CHECKPOINT_INTERVAL amounts.
+        self._checkpoints = array("d")
+
+    def __len__(self) -> int:
+        return len(self._amounts)
+
+    def _name_code(self, name: str) -> int:
+        code = self._name_codes.get(name)
+        if code is None:
+            code = len(self._name_table)
+            self._name_table.append(name)
+            self._name_codes[name] = code
+        return code
+
+    def append(self, name: str, amount: float | int, invoice_num: int | None = None) -> None:
+        """
+        Adds an entry.
+
+        :param name: The transaction name.
+        :type name: str
+        :param amount: The amount of the transaction.
+        :type amount: float | int
+        :param invoice_num: The invoice number, next_invoice by default.
+        :type invoice_num: int | None
+        """
+        if invoice_num is None:
+            invoice_num = self.next_invoice
+        amounts = self._amounts
+        amounts.append(float(amount))
+        self._invoices.append(invoice_num)
+        self._names.append(self._name_code(name))
+        self.next_invoice = invoice_num + 1
+        if len(amounts) % CHECKPOINT_INTERVAL == 0:
+            self._add_checkpoint()
+        if self.retention is not None and len(amounts) >= 2 * self.retention:
+            self._roll(len(amounts) - self.retention + 1)
+
+    def _add_checkpoint(self) -> None:
+        checkpoints = self._checkpoints
+        start = len(checkpoints) * CHECKPOINT_INTERVAL
+        previous = checkpoints[-1] if checkpoints else 0.0
+        checkpoints.append(sum(self._amounts[start:start + CHECKPOINT_INTERVAL], previous))
+
+    def _roll(self, count: int) -> None:
+        """
+        Replaces the oldest entries with a single summary record holding their total.
+        Rolling happens once the ledger reaches twice the retention, so its cost is spread over the appends since.
+
+        :param count: The number of entries to roll up.
+        :type count: int
+        """
+        amounts = self._amounts
+        rolled_total = sum(amounts[:count], 0.0)
+        rolled_invoice = self._invoices[count - 1]
+        del amounts[:count - 1]
+        del self._invoices[:count - 1]
+        del self._names[:count - 1]
+        amounts[0] = rolled_total
+        self._invoices[0] = rolled_invoice
+        self._names[0] = self._name_code(ROLLED_BALANCE_NAME)
+        self._checkpoints = array("d")
+        for _ in range(len(amounts) // CHECKPOINT_INTERVAL):
+            self._add_checkpoint()
+
+    def total(self) -> float:
+        """
+        Adds up every entry. Only the entries after the last checkpoint are summed.
+
+        :return: The total of the ledger.
+        :rtype: float
+        """
+        checkpoints = self._checkpoints
+        if not checkpoints:
+            return float(sum(self._amounts, 0.0))
+        return float(sum(self._amounts[len(checkpoints) * CHECKPOINT_INTERVAL:], checkpoints[-1]))
+
+    def _transaction(self, index: int) -> Transaction:
+        return Transaction(self._name_table[self._names[index]], self._amounts[index], self._invoices[index])
+
+    def transactions(self, start: int = 0, stop: int | None = None) -> list[Transaction]:
+        """
+        Builds Transaction objects for a range of entries.
+
+        :param start: The first entry.
+        :type start: int
+        :param stop: One past the last entry, the end by default.
+        :type stop: int | None
+        :return: The transactions, oldest first.
+        :rtype: list[Transaction]
+        """
+        return [self._transaction(index) for index in range(*slice(start, stop).indices(len(self._amounts)))]
+
+    def tail(self, count: int) -> list[Transaction]:
+        """
+        Builds Transaction objects for the newest entries, the same ones a list slice [-count:] would give.
+        So a count of 0 gives every entry, and a negative count gives all but the first -count entries.
+
+        :param count: The number of entries.
+        :type count: int
+        :return: The transactions, oldest first.
+        :rtype: list[Transaction]
+        """
+        return self.transactions(-count)
+
+    def records(self) -> Iterator[tuple[str, float, int]]:
+        """
+        Iterates over every entry without building Transaction objects.
+
+        :return: (name, amount, invoice number) for each entry, oldest first.
+        :rtype: Iterator[tuple[str, float, int]]
+        """
+        name_table = self._name_table
+        for name_code, amount, invoice_num in zip(self._names, self._amounts, self._invoices):
+            yield name_table[name_code], amount, invoice_num
+
+    def clear(self) -> None:
+        """
+        Removes every entry and restarts invoice numbering.
+        """
+        self.next_invoice = 0
+        self._amounts = array("d")
+        self._invoices = array("q")
+        self._names = array("I")
+        self._checkpoints = array("d")
+
+    def close(self) -> None:
+        """
+        Does nothing, an in-memory ledger holds no file. Here so a Bank can close either kind of ledger.
+        """
+
+
+@runtime_checkable
+class RecordSource(Protocol):
+    def records(self) -> Iterator[tuple[str, float, int]]: ...
+
+
+class RecordSink(Protocol):
+    def append(self, name: str, amount: float | int, invoice_num: int | None = None) -> None: ...
+
+
+TransactionSource = Iterable[Transaction] | RecordSource
+
+
+def iter_records(source: TransactionSource) -> Iterator[tuple[str, float, int]]:
+    """
+    Reads a transaction source as (name, amount, invoice number) tuples.
+    Ledgers are read column by column, without building Transaction objects.
+
+    :param source: A Ledger or MappedLedger, or any iterable of Transactions.
+    :type source: TransactionSource
+    :return: The records, in the source's order.
+    :rtype: Iterator[tuple[str, float, int]]
+    """
+    if isinstance(source, RecordSource):
+        return source.records()
+    return ((transaction.name, transaction.value, transaction.invoice_num) for transaction in source)
+
+
+def merge_records(sources: Iterable[TransactionSource], by_invoice: bool = False) -> Iterator[tuple[str, float]]:
+    """
+    Streams several transaction sources as one.
+    Only the first "Initial Balance" keeps its name, every later one becomes "Merged Balance Initial".
+
+    :param sources: The sources to merge. Read lazily, so this can be a generator too.
+    :type sources: Iterable[TransactionSource]
+    :param by_invoice: Interleave the sources by invoice number with a k-way merge, instead of one after another.
+        Each source must already be in invoice order. Equal invoice numbers keep source order.
+    :type by_invoice: bool
+    :return: (name, amount) for each merged record.
+    :rtype: Iterator[tuple[str, float]]
+    """
+    merged: Iterator[tuple[str, float, int]]
+    if by_invoice:
+        merged = heapq.merge(*(iter_records(source) for source in sources), key=lambda record: record[2])
+    else:
+        merged = itertools.chain.from_iterable(iter_records(source) for source in sources)
+    first_initial = True
+    for name, amount, _ in merged:
+        if name == INITIAL_BALANCE_NAME:
+            if first_initial:
+                first_initial = False
+            else:
+                name = MERGED_INITIAL_BALANCE_NAME
+        yield name, amount
+
+
+def merge_into(target: RecordSink, sources: Iterable[TransactionSource], by_invoice: bool = False) -> float:
+    """
+    Merges transaction sources into a ledger, numbering the invoices from the target's next invoice.
+
+    :param target: The ledger to append to, usually a new one.
+    :type target: RecordSink
+    :param sources: The sources to merge.
+    :type sources: Iterable[TransactionSource]
+    :param by_invoice: Interleave the sources by invoice number instead of one after another.
+    :type by_invoice: bool
+    :return: The sum of the merged amounts, added up in merge order.
+    :rtype: float
+    """
+    balance = 0.0
+    append = target.append
+    for name, amount in merge_records(sources, by_invoice):
+        append(name, amount)
+        balance += amount
+    return balance
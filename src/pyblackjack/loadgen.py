@@ -0,0 +1,230 @@
+"""
+A client and load generator for the game server.
+
+Opens many tables at once. Active tables play a number of rounds with the dealer's strategy (minimum bet, no
+insurance, hit below 17). Idle tables connect and then sit on their first bet request until the active tables are
+done, to measure how many open tables a server holds. The report gives rounds per second and the response time
+of the server, from an answer being sent to the next line arriving.
+
+Run with:
+    python -m pyblackjack.loadgen --port 8765 --tables 200 --rounds 50 --idle 2000
+    python -m pyblackjack.loadgen --local --tables 200 --idle 2000      # starts a server in this process
+Thousands of connections may need a higher open file limit (ulimit -n).
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from dataclasses import dataclass, field
+from .instrumentation import Histogram
+from .server import DEFAULT_PORT, GameServer, ServerConfig
+
+
+@dataclass
+class LoadReport:
+    """
+    The outcome of a load run.
+
+    Attributes:
+        tables (int): Active tables that played rounds.
+        idle_tables (int): Tables that connected and waited.
+        connected (int): Tables that got as far as their first bet request.
+        failed (int): Tables that could not connect or were closed early by the server.
+        rounds (int): Rounds finished over every active table.
+        errors (int): ERROR replies from the server.
+        elapsed_seconds (float): Wall clock time of the run.
+        response_time (Histogram): Microseconds from an answer being sent to the server's next line.
+    """
+    tables: int = 0
+    idle_tables: int = 0
+    connected: int = 0
+    failed: int = 0
+    rounds: int = 0
+    errors: int = 0
+    elapsed_seconds: float = 0.0
+    response_time: Histogram = field(default_factory=Histogram)
+
+    @property
+    def rounds_per_second(self) -> float:
+        if self.elapsed_seconds == 0:
+            return 0.0
+        return self.rounds / self.elapsed_seconds
+
+    def to_dict(self) -> dict:
+        return {
+            "tables": self.tables,
+            "idle_tables": self.idle_tables,
+            "connected": self.connected,
+            "failed": self.failed,
+            "rounds": self.rounds,
+            "errors": self.errors,
+            "elapsed_seconds": self.elapsed_seconds,
+            "rounds_per_second": self.rounds_per_second,
+            "response_time_us": self.response_time.to_dict(1e-3)}
+
+
+async def _open(host: str, port: int, unix_path: str | None) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    if unix_path is not None:
+        return await asyncio.open_unix_connection(unix_path)
+    return await asyncio.open_connection(host, port)
+
+
+async def play_table(
+        host: str,
+        port: int,
+        unix_path: str | None,
+        rounds: int,
+        report: LoadReport,
+        release: asyncio.Event | None = None
+) -> None:
+    """
+    Plays one table. With release given, the table stops at its first bet request and waits for the event instead.
+
+    :param host: The server host.
+    :type host: str
+    :param port: The server port.
+    :type port: int
+    :param unix_path: The server's Unix socket, used instead of host and port when given.
+    :type unix_path: str | None
+    :param rounds: Rounds to play.
+    :type rounds: int
+    :param report: Where the counts and timings are added.
+    :type report: LoadReport
+    :param release: Makes the table idle until it is set.
+    :type release: asyncio.Event | None
+    """
+    try:
+        reader, writer = await _open(host, port, unix_path)
+    except OSError:
+        report.failed += 1
+        return
+    clock = time.perf_counter_ns
+    sent_at = 0
+    played = 0
+    connected = False
+    try:
+        while True:
+            line = await reader.readline()
+            if sent_at:
+                report.response_time.record(clock() - sent_at)
+                sent_at = 0
+            if not line:
+                report.failed += not connected
+                return
+            fields = line.decode().split()
+            match fields[0]:
+                case "BET":
+                    if not connected:
+                        connected = True
+                        report.connected += 1
+                        if release is not None:
+                            await release.wait()
+                            return
+                    answer = fields[2]
+                case "INSURANCE":
+                    answer = "0"
+                case "ACTION":
+                    answer = "hit" if int(fields[3]) < 17 and "hit" in fields[4].split(",") else "stand"
+                case "CONTINUE":
+                    played += 1
+                    report.rounds += 1
+                    answer = "y" if played < rounds else "n"
+                case "ERROR":
+                    report.errors += 1
+                    continue
+                case "BYE":
+                    if fields[1] == "server_full":
+                        report.failed += 1
+                    return
+                case _:
+                    continue
+            writer.write(answer.encode() + b"\n")
+            await writer.drain()
+            sent_at = clock()
+    except (ConnectionError, asyncio.IncompleteReadError):
+        report.failed += 1
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+async def run_load(
+        tables: int,
+        rounds: int,
+        idle_tables: int = 0,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_PORT,
+        unix_path: str | None = None,
+        connect_batch: int = 200
+) -> LoadReport:
+    """
+    Opens the idle tables, then plays the active tables all at once.
+
+    :param tables: Active tables.
+    :type tables: int
+    :param rounds: Rounds per active table.
+    :type rounds: int
+    :param idle_tables: Tables that connect and wait while the active tables play.
+    :type idle_tables: int
+    :param host: The server host.
+    :type host: str
+    :param port: The server port.
+    :type port: int
+    :param unix_path: The server's Unix socket, used instead of host and port when given.
+    :type unix_path: str | None
+    :param connect_batch: Idle tables opened at a time, to stay within the server's listen backlog.
+    :type connect_batch: int
+    :return: The report.
+    :rtype: LoadReport
+    """
+    report = LoadReport(tables=tables, idle_tables=idle_tables)
+    release = asyncio.Event()
+    idle: list[asyncio.Task] = []
+    for start in range(0, idle_tables, connect_batch):
+        batch = [
+            asyncio.create_task(play_table(host, port, unix_path, 0, report, release))
+            for _ in range(min(connect_batch, idle_tables - start))]
+        idle.extend(batch)
+        # Wait until this batch is connected and parked before opening more.
+        while report.connected + report.failed < start + len(batch):
+            await asyncio.sleep(0.01)
+    start_time = time.perf_counter()
+    await asyncio.gather(*(play_table(host, port, unix_path, rounds, report) for _ in range(tables)))
+    report.elapsed_seconds = time.perf_counter() - start_time
+    release.set()
+    await asyncio.gather(*idle)
+    return report
+
+
+async def _run_local(args: argparse.Namespace) -> LoadReport:
+    server = GameServer(ServerConfig(max_sessions=args.tables + args.idle + 1))
+    await server.start("127.0.0.1", 0, args.unix)
+    try:
+        return await run_load(args.tables, args.rounds, args.idle, "127.0.0.1", server.port or 0, args.unix)
+    finally:
+        await server.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Play many tables against a pyblackjack server at once.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", help="Connect to this Unix socket instead of TCP.")
+    parser.add_argument("--tables", type=int, default=100, help="Tables playing rounds.")
+    parser.add_argument("--rounds", type=int, default=20, help="Rounds per playing table.")
+    parser.add_argument("--idle", type=int, default=0, help="Tables that connect and wait.")
+    parser.add_argument("--local", action="store_true", help="Start a server in this process instead of connecting to one.")
+    args = parser.parse_args()
+    if args.local:
+        report = asyncio.run(_run_local(args))
+    else:
+        report = asyncio.run(run_load(args.tables, args.rounds, args.idle, args.host, args.port, args.unix))
+    print(json.dumps(report.to_dict(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+"""
+An append-only bank ledger kept in a memory-mapped file, so a transaction history survives the process.
+
+The file is a 64 byte header followed by fixed-width records:
+    header: magic (8s), version (u32), record size (u32), record count (u64), balance (f64), padding
+    record: amount (f64), invoice number (i64), name code (u32), padding (4 bytes)
+Transaction names are interned, and the name of each code is kept one per line in a sidecar file (path + ".names").
+
+New records are buffered and written in batches. The header's record count and balance are only updated once a
+batch is in the file, so after a crash the file reopens at the last complete batch.
+Reopening checks the stored balance by summing the amount column in one pass, using NumPy when it is installed,
+instead of building a Transaction per record.
+"""
+
+import math
+import mmap
+import os
+import struct
+from typing import Iterator
+try:
+    import numpy as np
+    HAVE_NUMPY = True
+except ImportError:
+    HAVE_NUMPY = False
+from .ledger import Transaction
+
+MAGIC = b"PBJLEDG1"
+VERSION = 1
+HEADER = struct.Struct("<8sIIQd")
+HEADER_SIZE = 64
+RECORD = struct.Struct("<dqI4x")
+DEFAULT_BATCH_SIZE = 4096
+BALANCE_TOLERANCE = 1e-6
+
+
+class MappedLedger:
+    """
+    A ledger stored in a memory-mapped file. Has the same interface as ledger.Ledger, so a Bank can use either.
+
+    Attributes:
+        path (str): The ledger file.
+        batch_size (int): The number of new entries buffered before they are written to the file.
+        retention (None): Always None, entries in the file are never rolled up.
+        next_invoice (int): The invoice number the next entry will get.
+    """
+    def __init__(self, path: str, batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+        """
+        Opens a ledger file, creating it if it does not exist. An existing file is checked against its stored balance.
+
+        :param path: The ledger file.
+        :type path: str
+        :param batch_size: The number of new entries buffered before they are written to the file.
+        :type batch_size: int
+        """
+        if batch_size < 1:
+            raise ValueError("Batch size must be at least 1.")
+        self.path = path
+        self.batch_size = batch_size
+        self.retention = None
+        self._names_path = path + ".names"
+        self._pending: list[tuple[float, int, int]] = []
+        self._name_table: list[str] = []
+        self._name_codes: dict[str, int] = {}
+        self._stored_count = 0
+        self._stored_balance = 0.0
+        self._balance = 0.0
+        self.next_invoice = 0
+
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        self._file = open(path, "r+b" if exists else "w+b")
+        if not exists:
+            self._file.truncate(HEADER_SIZE + RECORD.size * batch_size)
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        if exists:
+            try:
+                self._load()
+            except ValueError:
+                self._map.close()
+                self._file.close()
+                raise
+        else:
+            self._write_header()
+            open(self._names_path, "w").close()
+
+    def _load(self) -> None:
+        """
+        Reads the header and name table, and checks the records add up to the stored balance.
+        """
+        if len(self._map) < HEADER_SIZE:
+            raise ValueError(f"{self.path} is too short to be a ledger file.")
+        magic, version, record_size, count, balance = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+            raise ValueError(f"{self.path} is not a ledger file this version can read.")
+        if HEADER_SIZE + count * RECORD.size > len(self._map):
+            raise ValueError(f"{self.path} is shorter than its record count.")
+        if os.path.exists(self._names_path):
+            with open(self._names_path, encoding="utf-8") as names_file:
+                for line in names_file:
+                    self._register_name(line.rstrip("\n"))
+        self._stored_count = count
+        self._stored_balance = balance
+        replayed = self._sum_amounts(count)
+        if not math.isclose(replayed, balance, rel_tol=1e-12, abs_tol=BALANCE_TOLERANCE):
+            raise ValueError(f"{self.path} records add up to {replayed}, but the stored balance is {balance}.")
+        self._balance = balance
+        if count:
+            self.next_invoice = RECORD.unpack_from(self._map, HEADER_SIZE + (count - 1) * RECORD.size)[1] + 1
+
+    def _sum_amounts(self, count: int) -> float:
+        """
+        Adds up the amount column of the stored records.
+        """
+        if count == 0:
+            return 0.0
+        if HAVE_NUMPY:
+            records = np.frombuffer(self._map, dtype=np.float64, count=count * RECORD.size // 8, offset=HEADER_SIZE)
+            total = float(records[::RECORD.size // 8].sum())
+            del records
+            return total
+        with memoryview(self._map) as view:
+            with view[HEADER_SIZE:HEADER_SIZE + count * RECORD.size].cast("d") as doubles:
+                return float(sum(doubles[::RECORD.size // 8], 0.0))
+
+    def _write_header(self) -> None:
+        HEADER.pack_into(self._map, 0, MAGIC, VERSION, RECORD.size, self._stored_count, self._stored_balance)
+
+    def _register_name(self, name: str) -> int:
+        code = len(self._name_table)
+        self._name_table.append(name)
+        self._name_codes[name] = code
+        return code
+
+    def _name_code(self, name: str) -> int:
+        code = self._name_codes.get(name)
+        if code is None:
+            if "\n" in name:
+                raise ValueError("Transaction names cannot contain line breaks.")
+            code = self._register_name(name)
+            with open(self._names_path, "a", encoding="utf-8") as names_file:
+                names_file.write(name + "\n")
+        return code
+
+    def __len__(self) -> int:
+        return self._stored_count + len(self._pending)
+
+    def append(self, name: str, amount: float | int, invoice_num: int | None = None) -> None:
+        """
+        Adds an entry. It reaches the file once the current batch is full, or on flush.
+
+        :param name: The transaction name.
+        :type name: str
+        :param amount: The amount of the transaction.
+        :type amount: float | int
+        :param invoice_num: The invoice number, next_invoice by default.
+        :type invoice_num: int | None
+        """
+        if invoice_num is None:
+            invoice_num = self.next_invoice
+        amount = float(amount)
+        self._pending.append((amount, invoice_num, self._name_code(name)))
+        self._balance += amount
+        self.next_invoice = invoice_num + 1
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Writes the buffered entries to the file, then updates the header.
+        """
+        if not self._pending:
+            return
+        start = HEADER_SIZE + self._stored_count * RECORD.size
+        data = b"".join(RECORD.pack(*record) for record in self._pending)
+        self._ensure_capacity(start + len(data))
+        self._map[start:start + len(data)] = data
+        self._map.flush()
+        self._stored_count += len(self._pending)
+        self._stored_balance = self._balance
+        self._pending.clear()
+        self._write_header()
+        self._map.flush()
+
+    def _ensure_capacity(self, size: int) -> None:
+        """
+        Grows the file, doubling it, when it is too small to hold size bytes.
+        """
+        if size <= len(self._map):
+            return
+        new_size = max(size, 2 * len(self._map))
+        self._map.close()
+        self._file.truncate(new_size)
+        self._map = mmap.mmap(self._file.fileno(), 0)
+
+    def total(self) -> float:
+        """
+        Gets the running total, including buffered entries.
+
+        :return: The total of the ledger.
+        :rtype: float
+        """
+        return self._balance
+
+    def _stored_transaction(self, index: int) -> Transaction:
+        amount, invoice_num, name_code = RECORD.unpack_from(self._map, HEADER_SIZE + index * RECORD.size)
+        return Transaction(self._name_table[name_code], amount, invoice_num)
+
+    def transactions(self, start: int = 0, stop: int | None = None) -> list[Transaction]:
+        """
+        Builds Transaction objects for a range of entries. Only the records in the range are read from the file.
+
+        :param start: The first entry.
+        :type start: int
+        :param stop: One past the last entry, the end by default.
+        :type stop: int | None
+        :return: The transactions, oldest first.
+        :rtype: list[Transaction]
+        """
+        result: list[Transaction] = []
+        for index in range(*slice(start, stop).indices(len(self))):
+            if index < self._stored_count:
+                result.append(self._stored_transaction(index))
+            else:
+                amount, invoice_num, name_code = self._pending[index - self._stored_count]
+                result.append(Transaction(self._name_table[name_code], amount, invoice_num))
+        return result
+
+    def tail(self, count: int) -> list[Transaction]:
+        """
+        Builds Transaction objects for the newest entries, the same ones a list slice [-count:] would give.
+        So a count of 0 gives every entry, and a negative count gives all but the first -count entries.
+
+        :param count: The number of entries.
+        :type count: int
+        :return: The transactions, oldest first.
+        :rtype: list[Transaction]
+        """
+        return self.transactions(-count)
+
+    def records(self) -> Iterator[tuple[str, float, int]]:
+        """
+        Iterates over every entry without building Transaction objects.
+
+        :return: (name, amount, invoice number) for each entry, oldest first.
+        :rtype: Iterator[tuple[str, float, int]]
+        """
+        name_table = self._name_table
+        for index in range(self._stored_count):
+            amount, invoice_num, name_code = RECORD.unpack_from(self._map, HEADER_SIZE + index * RECORD.size)
+            yield name_table[name_code], amount, invoice_num
+        for amount, invoice_num, name_code in list(self._pending):
+            yield name_table[name_code], amount, invoice_num
+
+    def clear(self) -> None:
+        """
+        Removes every entry and restarts invoice numbering. The file keeps its size.
+        """
+        self._pending.clear()
+        self._stored_count = 0
+        self._stored_balance = 0.0
+        self._balance = 0.0
+        self.next_invoice = 0
+        self._write_header()
+        self._map.flush()
+
+    def close(self) -> None:
+        """
+        Flushes buffered entries and closes the file.
+        """
+        if self._map.closed:
+            return
+        self.flush()
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "MappedLedger":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
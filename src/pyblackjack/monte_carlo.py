@@ -0,0 +1,282 @@
+"""
+Monte Carlo runs spread over several processes.
+
+The rounds are cut into fixed size shards, and every shard gets its own seed derived from the master seed.
+Shards are played by a ProcessPoolExecutor and merged back in shard order, so for a given master seed the
+result is the same whatever the number of workers.
+
+With shoe_producers set, the workers take their shoes from a shared memory ShoeRing filled by that many producer
+processes instead of shuffling for themselves. Shoes then go to whichever worker asks first, so the result is no
+longer the same from run to run.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable
+from .actor import RoundHistory
+from .bank import Bank
+from .ledger import Ledger
+from .mapped_ledger import MappedLedger
+from .dealer import Dealer
+from .player import Player
+from .deck import Deck
+from .round_results import RoundResults
+from .simulator import Simulator, Strategy
+from .shoe_ring import ShoeFeed, ShoeRing
+from .rng import derive_seed, make_rng
+
+DEFAULT_SHARD_ROUNDS = 10_000
+# Ring slots per worker when shoes come from producers.
+SHOE_RING_SLOTS_PER_WORKER = 4
+
+# The ring a worker process takes its shoes from, set by _attach_shoe_ring.
+_shoe_ring: ShoeRing | None = None
+
+
+@dataclass
+class ShardResult:
+    """
+    Everything a worker sends back for one shard.
+
+    Attributes:
+        index (int): The shard number.
+        rounds (int): Rounds played.
+        hands (int): Hands settled.
+        player_net (float): The change in the Player's bank balance.
+        results (dict[RoundResults, int]): Number of hands settled with each result.
+        player_ledger (Ledger | MappedLedger | None): The Player's bank history, None if ledgers were not kept.
+        dealer_ledger (Ledger | MappedLedger | None): The Dealer's bank history, None if ledgers were not kept.
+        player_history (RoundHistory): The Player's round history.
+        dealer_history (RoundHistory): The Dealer's round history.
+    """
+    index: int
+    rounds: int
+    hands: int
+    player_net: float
+    results: dict[RoundResults, int]
+    player_ledger: Ledger | MappedLedger | None
+    dealer_ledger: Ledger | MappedLedger | None
+    player_history: RoundHistory
+    dealer_history: RoundHistory
+
+
+@dataclass
+class MonteCarloResult:
+    """
+    The merged result of a Monte Carlo run.
+
+    Attributes:
+        master_seed (int): The seed every shard seed was derived from.
+        shards (int): The number of shards played.
+        workers (int): The number of worker processes used.
+        rounds (int): Rounds played.
+        hands (int): Hands settled.
+        elapsed_seconds (float): Wall clock time of the run.
+        player_net (float): The total change in the Player's bank balance over all shards.
+        results (dict[RoundResults, int]): Number of hands settled with each result.
+        player_bank (Bank): The merged Player ledger.
+        dealer_bank (Bank): The merged Dealer ledger.
+        player_history (RoundHistory): The merged Player round history.
+        dealer_history (RoundHistory): The merged Dealer round history.
+    """
+    master_seed: int
+    shards: int
+    workers: int
+    rounds: int = 0
+    hands: int = 0
+    elapsed_seconds: float = 0.0
+    player_net: float = 0.0
+    results: dict[RoundResults, int] = field(default_factory=lambda: {result: 0 for result in RoundResults})
+    player_bank: Bank = field(default_factory=Bank)
+    dealer_bank: Bank = field(default_factory=Bank)
+    player_history: RoundHistory = field(default_factory=RoundHistory)
+    dealer_history: RoundHistory = field(default_factory=RoundHistory)
+
+    @property
+    def rounds_per_second(self) -> float:
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.rounds / self.elapsed_seconds
+
+
+def shard_seed(master_seed: int, shard_index: int) -> int:
+    """
+    Derives the seed a shard shuffles with on the stdlib backend, see rng.derive_seed.
+
+    :param master_seed: The seed of the whole run.
+    :type master_seed: int
+    :param shard_index: The shard number.
+    :type shard_index: int
+    :return: The shard's seed.
+    :rtype: int
+    """
+    return derive_seed(master_seed, shard_index)
+
+
+def run_shard(
+        strategy_factory: Callable[[], Strategy],
+        shard_index: int,
+        rounds: int,
+        master_seed: int,
+        keep_ledgers: bool = True,
+        keep_records: bool = True,
+        use_shoe_ring: bool = False,
+        rng_backend: str = "stdlib"
+) -> ShardResult:
+    """
+    Plays one shard with a fresh Player, Dealer and seeded Deck.
+
+    :param strategy_factory: Builds the strategy for the shard. Must be picklable, a class or module level function.
+    :type strategy_factory: Callable[[], Strategy]
+    :param shard_index: The shard number.
+    :type shard_index: int
+    :param rounds: The number of rounds in the shard.
+    :type rounds: int
+    :param master_seed: The seed of the whole run.
+    :type master_seed: int
+    :param keep_ledgers: Whether to send back the bank transaction histories.
+    :type keep_ledgers: bool
+    :param keep_records: Whether the round histories store a record per hand, rather than only their statistics.
+    :type keep_records: bool
+    :param use_shoe_ring: Whether to take shoes from the process's shoe ring instead of a seeded shuffle.
+    :type use_shoe_ring: bool
+    :param rng_backend: The generator backend for the shuffles, see rng.make_rng. The shard plays stream shard_index of the master seed.
+    :type rng_backend: str
+    :return: The shard's result.
+    :rtype: ShardResult
+    """
+    if use_shoe_ring:
+        if _shoe_ring is None:
+            raise RuntimeError("No shoe ring is attached to this process.")
+        deck = Deck(rng=ShoeFeed(_shoe_ring))
+    else:
+        deck = Deck(rng=make_rng(rng_backend, master_seed, shard_index))
+    simulator = Simulator(strategy_factory(), player=Player(), dealer=Dealer(), deck=deck)
+    simulator.player.history.keep_records = keep_records
+    simulator.dealer.history.keep_records = keep_records
+    report = simulator.run(rounds)
+    return ShardResult(
+        index=shard_index,
+        rounds=report.rounds,
+        hands=report.hands,
+        player_net=report.player_net,
+        results=report.results,
+        player_ledger=simulator.player.bank.ledger if keep_ledgers else None,
+        dealer_ledger=simulator.dealer.bank.ledger if keep_ledgers else None,
+        player_history=simulator.player.history,
+        dealer_history=simulator.dealer.history)
+
+
+def _run_shard_args(args: tuple) -> ShardResult:
+    return run_shard(*args)
+
+
+def _attach_shoe_ring(ring: ShoeRing | None) -> None:
+    global _shoe_ring
+    _shoe_ring = ring
+
+
+def run_monte_carlo(
+        strategy_factory: Callable[[], Strategy],
+        rounds: int,
+        master_seed: int,
+        workers: int | None = None,
+        shard_rounds: int = DEFAULT_SHARD_ROUNDS,
+        keep_ledgers: bool = True,
+        keep_records: bool = True,
+        shoe_producers: int = 0,
+        rng_backend: str = "stdlib"
+) -> MonteCarloResult:
+    """
+    Plays a number of rounds spread over a pool of worker processes, and merges the results.
+
+    :param strategy_factory: Builds a strategy for each shard. Must be picklable, a class or module level function.
+    :type strategy_factory: Callable[[], Strategy]
+    :param rounds: The total number of rounds to play.
+    :type rounds: int
+    :param master_seed: The seed of the whole run.
+    :type master_seed: int
+    :param workers: The number of worker processes, the CPU count by default. 1 runs in this process.
+    :type workers: int | None
+    :param shard_rounds: The number of rounds in each shard. Changing it changes the result for a seed.
+    :type shard_rounds: int
+    :param keep_ledgers: Whether to merge the bank transaction histories of the shards.
+    :type keep_ledgers: bool
+    :param keep_records: Whether the round histories store a record per hand. Their statistics are merged either way.
+    :type keep_records: bool
+    :param shoe_producers: Producer processes shuffling shoes for the workers, 0 for workers to shuffle their own.
+    :type shoe_producers: int
+    :param rng_backend: The generator backend the shards shuffle with: "stdlib", "pcg64" or "philox".
+    :type rng_backend: str
+    :return: The merged result.
+    :rtype: MonteCarloResult
+    """
+    if shard_rounds <= 0:
+        raise ValueError("shard_rounds must be positive.")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    shard_sizes = [shard_rounds] * (rounds // shard_rounds)
+    if rounds % shard_rounds:
+        shard_sizes.append(rounds % shard_rounds)
+    use_shoe_ring = shoe_producers > 0
+    jobs = [
+        (strategy_factory, index, size, master_seed, keep_ledgers, keep_records, use_shoe_ring, rng_backend)
+        for index, size in enumerate(shard_sizes)]
+
+    ring = None
+    if use_shoe_ring:
+        ring = ShoeRing(slots=SHOE_RING_SLOTS_PER_WORKER * max(workers, 1), seed=master_seed)
+        ring.start_producers(shoe_producers)
+    start = time.perf_counter()
+    try:
+        if workers <= 1:
+            _attach_shoe_ring(ring)
+            try:
+                shard_results = [_run_shard_args(job) for job in jobs]
+            finally:
+                _attach_shoe_ring(None)
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_attach_shoe_ring, initargs=(ring,)) as executor:
+                shard_results = list(executor.map(_run_shard_args, jobs))
+    finally:
+        if ring is not None:
+            ring.close()
+    elapsed = time.perf_counter() - start
+
+    result = merge_shards(shard_results, master_seed, keep_ledgers)
+    result.workers = max(workers, 1)
+    result.elapsed_seconds = elapsed
+    return result
+
+
+def merge_shards(shard_results: list[ShardResult], master_seed: int, keep_ledgers: bool = True) -> MonteCarloResult:
+    """
+    Merges shard results in shard order.
+
+    :param shard_results: The shard results.
+    :type shard_results: list[ShardResult]
+    :param master_seed: The seed of the run.
+    :type master_seed: int
+    :param keep_ledgers: Whether to merge the bank transaction histories.
+    :type keep_ledgers: bool
+    :return: The merged result, with workers and elapsed_seconds left for the caller to fill in.
+    :rtype: MonteCarloResult
+    """
+    shard_results = sorted(shard_results, key=lambda shard: shard.index)
+    result = MonteCarloResult(master_seed=master_seed, shards=len(shard_results), workers=1)
+    for shard in shard_results:
+        result.rounds += shard.rounds
+        result.hands += shard.hands
+        result.player_net += shard.player_net
+        for outcome, count in shard.results.items():
+            result.results[outcome] += count
+        result.player_history.extend(shard.player_history)
+        result.dealer_history.extend(shard.dealer_history)
+    if keep_ledgers:
+        result.player_bank.build_new_transaction_record(
+            shard.player_ledger for shard in shard_results if shard.player_ledger is not None)
+        result.dealer_bank.build_new_transaction_record(
+            shard.dealer_ledger for shard in shard_results if shard.dealer_ledger is not None)
+    return result
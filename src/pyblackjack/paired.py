@@ -0,0 +1,316 @@
+"""
+Paired comparison of strategies on identical shoes, also known as common random numbers.
+
+Each shoe order is shuffled once, kept in a ShoeCache, and laid out for every candidate in the same sequence, so the
+candidates play the same cards and most of the luck of the shoe cancels out of their difference. Shoes are the
+unit of pairing: strategies that take different numbers of cards drift apart inside a shoe, but every candidate
+starts shoe k with the same order. Each candidate plays the same number of whole shoes, and the report gives the
+difference in net per shoe with a confidence interval from the per-shoe differences. The interval two independent
+runs would have given is reported next to it, to show how much the pairing saved.
+
+With a seed, the shoes are the ones Deck(rng=random.Random(seed)) would shuffle, so a single candidate plays exactly
+like an unpaired Simulator on that seed.
+
+Run as a module to compare named strategies, see sweep.build_strategy:
+    python -m pyblackjack.paired --candidate mimic --candidate chart:chart.json --shoes 5000 --rule deck_count=6
+"""
+
+import argparse
+import functools
+import math
+import random
+import statistics
+import time
+from dataclasses import dataclass, field
+from typing import Callable, MutableSequence
+from .playing_card import CARD_COUNT
+from .round_statistics import DEFAULT_Z_SCORE
+from .rules import Rules
+from .simulator import Simulator, Strategy
+from .sweep import build_strategy, parse_axes
+
+
+class ShoeCache:
+    """
+    Shuffled shoe orders, made once from a seed and kept for every candidate to reuse.
+
+    Attributes:
+        deck_count (int): The number of 52 card packs in a shoe.
+        orders (list[bytes]): The card indexes of each shoe made so far, the next card drawn last.
+    """
+    def __init__(self, seed: int | None = None, deck_count: int = 1) -> None:
+        """
+        ShoeCache constructor
+
+        :param seed: Seeds the shuffles, random by default.
+        :type seed: int | None
+        :param deck_count: The number of 52 card packs in a shoe.
+        :type deck_count: int
+        """
+        self.deck_count = deck_count
+        self.orders: list[bytes] = []
+        self._rng = random.Random(seed)
+        self._full_shoe = bytes(range(CARD_COUNT)) * deck_count
+
+    def order(self, index: int) -> bytes:
+        """
+        Gets a shoe order, shuffling new shoes the first time they are asked for.
+
+        :param index: The shoe number, from 0.
+        :type index: int
+        :return: The card indexes of the shoe.
+        :rtype: bytes
+        """
+        orders = self.orders
+        while len(orders) <= index:
+            cards = bytearray(self._full_shoe)
+            self._rng.shuffle(cards)
+            orders.append(bytes(cards))
+        return orders[index]
+
+    def reader(self) -> "ShoeReader":
+        return ShoeReader(self)
+
+
+class ShoeReader:
+    """
+    Stands in for a Deck's random generator, laying out the cached shoes in turn instead of shuffling.
+
+    Attributes:
+        shoes (int): Shoes laid out so far.
+    """
+    def __init__(self, cache: ShoeCache) -> None:
+        self._cache = cache
+        self.shoes = 0
+
+    def shuffle(self, cards: MutableSequence) -> None:
+        cards[:] = self._cache.order(self.shoes)
+        self.shoes += 1
+
+
+@dataclass
+class CandidateResult:
+    """
+    How one candidate did over the shared shoes.
+
+    Attributes:
+        name (str): The candidate's name.
+        shoes (int): Shoes played.
+        rounds (int): Rounds played.
+        hands (int): Hands settled.
+        elapsed_seconds (float): Wall clock time spent playing.
+        shoe_nets (list[float]): The change in the Player's bank balance over the rounds started in each shoe.
+    """
+    name: str
+    shoes: int = 0
+    rounds: int = 0
+    hands: int = 0
+    elapsed_seconds: float = 0.0
+    shoe_nets: list[float] = field(default_factory=list)
+
+    @property
+    def net(self) -> float:
+        return math.fsum(self.shoe_nets)
+
+    @property
+    def ev_per_round(self) -> float:
+        return self.net / self.rounds if self.rounds else 0.0
+
+    @property
+    def ev_per_shoe(self) -> float:
+        return self.net / self.shoes if self.shoes else 0.0
+
+    @property
+    def standard_error(self) -> float:
+        """
+        The standard error of the net per shoe.
+        """
+        if self.shoes < 2:
+            return 0.0
+        return statistics.stdev(self.shoe_nets) / math.sqrt(self.shoes)
+
+
+@dataclass
+class PairedDifference:
+    """
+    The difference between a candidate and the baseline over the same shoes, candidate minus baseline.
+
+    Attributes:
+        baseline (str): The baseline's name.
+        candidate (str): The candidate's name.
+        shoes (int): Shoes paired.
+        mean_difference (float): The mean difference in net per shoe.
+        standard_error (float): The standard error of mean_difference, from the per-shoe differences.
+        independent_standard_error (float): The standard error two independent runs of the same length would have had.
+        per_round_difference (float): The difference in net per round, candidate EV minus baseline EV.
+    """
+    baseline: str
+    candidate: str
+    shoes: int
+    mean_difference: float
+    standard_error: float
+    independent_standard_error: float
+    per_round_difference: float
+
+    def confidence_interval(self, z_score: float = DEFAULT_Z_SCORE) -> tuple[float, float]:
+        """
+        Gets the confidence interval of the mean difference per shoe.
+
+        :param z_score: The z score of the confidence level, 95% by default.
+        :type z_score: float
+        :return: The low and high ends of the interval.
+        :rtype: tuple[float, float]
+        """
+        margin = z_score * self.standard_error
+        return self.mean_difference - margin, self.mean_difference + margin
+
+    @property
+    def variance_reduction(self) -> float:
+        """
+        How many times longer independent runs would need to be for the same precision.
+        """
+        if self.standard_error == 0:
+            return math.inf
+        return (self.independent_standard_error / self.standard_error) ** 2
+
+
+@dataclass
+class PairedComparison:
+    """
+    The result of a paired comparison.
+
+    Attributes:
+        seed (int | None): The seed of the shoes.
+        shoes (int): Shoes every candidate played.
+        candidates (list[CandidateResult]): Each candidate's result, the baseline first.
+        differences (list[PairedDifference]): Each other candidate against the baseline.
+    """
+    seed: int | None
+    shoes: int
+    candidates: list[CandidateResult]
+    differences: list[PairedDifference]
+
+
+def play_shoes(name: str, strategy: Strategy, cache: ShoeCache, shoes: int, rules: Rules = Rules()) -> CandidateResult:
+    """
+    Plays whole shoes from a cache with one strategy. Every round is counted in the shoe it started in.
+
+    :param name: The candidate's name.
+    :type name: str
+    :param strategy: The strategy.
+    :type strategy: Strategy
+    :param cache: The shoe orders, which must have rules.deck_count packs.
+    :type cache: ShoeCache
+    :param shoes: Shoes to play.
+    :type shoes: int
+    :param rules: The house rules, applied while playing.
+    :type rules: Rules
+    :return: The candidate's result.
+    :rtype: CandidateResult
+    """
+    if cache.deck_count != rules.deck_count:
+        raise ValueError("The shoe cache and the rules have different deck counts.")
+    result = CandidateResult(name, shoes=shoes, shoe_nets=[0.0] * shoes)
+    shoe_nets = result.shoe_nets
+    start = time.perf_counter()
+    with rules.applied():
+        deck = rules.new_deck(cache.reader())
+        simulator = Simulator(strategy, deck=deck)
+        simulator.player.history.keep_records = False
+        simulator.dealer.history.keep_records = False
+        bank = simulator.player.bank
+        balance = bank.balance
+        while deck.reshuffle_count < shoes:
+            shoe = deck.reshuffle_count
+            result.hands += len(simulator.play_round())
+            result.rounds += 1
+            shoe_nets[shoe] += bank.balance - balance
+            balance = bank.balance
+    result.elapsed_seconds = time.perf_counter() - start
+    return result
+
+
+def paired_difference(baseline: CandidateResult, candidate: CandidateResult) -> PairedDifference:
+    """
+    Works out the paired difference between two candidates that played the same shoes.
+
+    :param baseline: The baseline's result.
+    :type baseline: CandidateResult
+    :param candidate: The other candidate's result.
+    :type candidate: CandidateResult
+    :return: The difference, candidate minus baseline.
+    :rtype: PairedDifference
+    """
+    if baseline.shoes != candidate.shoes:
+        raise ValueError("Paired candidates must play the same number of shoes.")
+    shoes = baseline.shoes
+    differences = [theirs - ours for ours, theirs in zip(baseline.shoe_nets, candidate.shoe_nets)]
+    standard_error = statistics.stdev(differences) / math.sqrt(shoes) if shoes > 1 else 0.0
+    return PairedDifference(
+        baseline=baseline.name,
+        candidate=candidate.name,
+        shoes=shoes,
+        mean_difference=math.fsum(differences) / shoes if shoes else 0.0,
+        standard_error=standard_error,
+        independent_standard_error=math.hypot(baseline.standard_error, candidate.standard_error),
+        per_round_difference=candidate.ev_per_round - baseline.ev_per_round)
+
+
+def compare_strategies(
+        candidates: dict[str, Callable[[], Strategy]],
+        shoes: int,
+        seed: int | None = None,
+        rules: Rules = Rules()
+) -> PairedComparison:
+    """
+    Plays every candidate over the same shoes and compares each one with the first.
+
+    :param candidates: Builds each candidate's strategy, by name. The first is the baseline.
+    :type candidates: dict[str, Callable[[], Strategy]]
+    :param shoes: Shoes each candidate plays.
+    :type shoes: int
+    :param seed: Seeds the shoes, random by default.
+    :type seed: int | None
+    :param rules: The house rules.
+    :type rules: Rules
+    :return: The comparison.
+    :rtype: PairedComparison
+    """
+    if not candidates:
+        raise ValueError("Nothing to compare.")
+    cache = ShoeCache(seed, rules.deck_count)
+    results = [play_shoes(name, factory(), cache, shoes, rules) for name, factory in candidates.items()]
+    baseline = results[0]
+    return PairedComparison(
+        seed=seed,
+        shoes=shoes,
+        candidates=results,
+        differences=[paired_difference(baseline, result) for result in results[1:]])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare strategies on identical shoes.")
+    parser.add_argument("--candidate", action="append", required=True, help="Strategy: mimic or chart:<path>. The first is the baseline.")
+    parser.add_argument("--shoes", type=int, default=2_000, help="Shoes each candidate plays.")
+    parser.add_argument("--seed", type=int, help="Seeds the shoes.")
+    parser.add_argument("--rule", action="append", default=[], metavar="RULE=VALUE", help="A house rule. Repeat for more rules.")
+    args = parser.parse_args()
+
+    rules = Rules.from_dict({name: values[0] for name, values in parse_axes(args.rule).items()})
+    comparison = compare_strategies(
+        {name: functools.partial(build_strategy, name, rules) for name in args.candidate}, args.shoes, args.seed, rules)
+    for result in comparison.candidates:
+        print(
+            f"{result.name}: {result.rounds:,} rounds, EV {result.ev_per_round:+.4f} per round, "
+            f"{result.ev_per_shoe:+.3f} ± {result.standard_error:.3f} per shoe ({result.elapsed_seconds:.1f}s)")
+    for difference in comparison.differences:
+        low, high = difference.confidence_interval()
+        print(
+            f"{difference.candidate} - {difference.baseline}: {difference.mean_difference:+.3f} per shoe, "
+            f"95% CI [{low:+.3f}, {high:+.3f}], {difference.per_round_difference:+.4f} per round. "
+            f"Paired SE {difference.standard_error:.3f} vs independent {difference.independent_standard_error:.3f}, "
+            f"worth {difference.variance_reduction:.1f}x the rounds.")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,7 @@ from .deck import Deck
 from .playing_card import PlayingCard
 from .blackjack import PossibleActions
 from .cli_input_processor import prompt_bet, prompt_insurance, prompt_action
-from . import constants
+from .renderer import Renderer, TERMINAL_RENDERER
 from . import cli_output_processor
 
 def player_ante(player: Player) -> float:
@@ -19,7 +19,7 @@ def player_ante(player: Player) -> float:
 
 def player_insurance(player: Player, bet_value: float) -> float:
     """
-    Docstring for player_insurance
+    Prompts the player for insurance and buys it.
     
     :param player: The Player
     :type player: Player
@@ -29,10 +29,78 @@ def player_insurance(player: Player, bet_value: float) -> float:
     :rtype: float
     """
     result = prompt_insurance(player.bank.balance, bet_value)
-    player.bank.add_transaction("Insurance Buy", result)
-    return result
+    return buy_insurance(player, result)
 
-def player_turn(player: Player, dealer_upcard: PlayingCard, deck: Deck) -> None:
+def buy_insurance(player: Player, insurance: float) -> float:
+    """
+    Takes the insurance bet out of the player's bank.
+    
+    :param player: The Player
+    :type player: Player
+    :param insurance: The insurance bet, 0 if none was taken.
+    :type insurance: float
+    :return: The insurance bet
+    :rtype: float
+    """
+    if insurance > 0:
+        player.bank.add_transaction("Insurance Buy", -insurance)
+    return insurance
+
+def get_allowed_actions(player: Player, deck: Deck) -> set[PossibleActions]:
+    """
+    Works out which actions the player may take on their current hand.
+    
+    :param player: The Player
+    :type player: Player
+    :param deck: The deck.
+    :type deck: Deck
+    :return: The set of allowed actions.
+    :rtype: set[PossibleActions]
+    """
+    current_hand = player.hand
+    player_action_set: set[PossibleActions] = { PossibleActions.HIT, PossibleActions.STAND }
+    if len(current_hand.cards) == 2:
+        player_action_set.add(PossibleActions.DOUBLE)
+        if (current_hand.cards[0].rank == current_hand.cards[1].rank and 
+            not deck.needs_reshuffle() and
+            player.bank.balance > current_hand.bet.balance):
+            player_action_set.add(PossibleActions.SPLIT)
+    return player_action_set
+
+def apply_action(player: Player, deck: Deck, choice: PossibleActions, renderer: Renderer = TERMINAL_RENDERER) -> None:
+    """
+    Carries out one action on the player's current hand.
+    
+    :param player: The Player
+    :type player: Player
+    :param deck: The deck.
+    :type deck: Deck
+    :param choice: The action to take.
+    :type choice: PossibleActions
+    :param renderer: Shows the cards drawn by the action. Pass renderer.NULL_RENDERER for no output.
+    :type renderer: Renderer
+    """
+    current_hand = player.hand
+    match choice:
+        case PossibleActions.HIT:
+            new_card = deck.drawCard()
+            renderer.new_card(player, new_card)
+            current_hand.add_card(new_card)
+        case PossibleActions.DOUBLE:
+            new_card = deck.drawCard()
+            renderer.new_card(player, new_card)
+            player.double_down(new_card)
+        case PossibleActions.SPLIT:
+            drawn_cards: list[PlayingCard] = []
+            for _ in range(2):
+                new_card = deck.drawCard()
+                renderer.new_card(player, new_card)
+                drawn_cards.append(new_card)
+            player.split(drawn_cards)
+        case PossibleActions.STAND:
+            current_hand.has_stood = True
+
+def player_turn(player: Player, dealer_upcard: PlayingCard, deck: Deck, renderer: Renderer = TERMINAL_RENDERER) -> None:
     """
     Runs the player turn.
     
@@ -42,37 +110,16 @@ def player_turn(player: Player, dealer_upcard: PlayingCard, deck: Deck) -> None:
     :type dealer_upcard: PlayingCard
     :param deck: The deck.
     :type deck: Deck
+    :param renderer: Shows the cards drawn. Flushed before every prompt.
+    :type renderer: Renderer
     """
     
     while player.current_hand_index < len(player.split_hands):
         while not player.hand.has_stood:
             round_state_str = cli_output_processor.get_round_state_str(dealer_upcard, player, deck)
-            current_hand = player.hand
-            player_action_set: set[PossibleActions] = { PossibleActions.HIT, PossibleActions.STAND }
-            if len(current_hand.cards) == 2:
-                player_action_set.add(PossibleActions.DOUBLE)
-                if (current_hand.cards[0].rank == current_hand.cards[1].rank and 
-                    deck.get_deck_percentage() > constants.DECK_REFRESH_PERCENTAGE and
-                    player.bank.balance > current_hand.bet.balance):
-                    player_action_set.add(PossibleActions.SPLIT)
+            player_action_set = get_allowed_actions(player, deck)
+            renderer.flush()
             choice = prompt_action(round_state_str, player_action_set)
-            match choice:
-                case PossibleActions.HIT:
-                    new_card = deck.drawCard()
-                    cli_output_processor.print_new_card(player, new_card)
-                    current_hand.add_card(new_card)
-                case PossibleActions.DOUBLE:
-                    new_card = deck.drawCard()
-                    cli_output_processor.print_new_card(player, new_card)
-                    current_hand.double_down(new_card)
-                case PossibleActions.SPLIT:
-                    drawn_cards: list[PlayingCard] = []
-                    for _ in range(2):
-                        new_card = deck.drawCard()
-                        cli_output_processor.print_new_card(player, new_card)
-                        drawn_cards.append(new_card)
-                    player.split(drawn_cards)
-                case PossibleActions.STAND:
-                    current_hand.has_stood = True
+            apply_action(player, deck, choice, renderer)
         if not player.next_hand():
-            break
\ No newline at end of file
+            break
@@ -36,16 +36,71 @@ class Suit(Enum):
 class PlayingCard:
     """
     A single playing card from a 52 card deck.
+    There is only ever one PlayingCard object for each rank and suit, so cards can be stored as their index (0 - 51)
+    and turned back into the card with card_from_index.
     
     Attributes:
         rank (Rank): The rank of the card.
         suit (Suit): The suit of the card.
         value (Literal [1 - 10]): The value of the card, Ace is 1, Face card is 10.
+        index (int): The index of the card, 0 - 51, in suit then rank order.
+        is_ace (bool): Whether the card is an Ace.
     """
-    def __init__(self, rank: Rank, suit: Suit) -> None:
-        self.suit = suit
-        self.rank = rank
-        self.value = 10 if rank.value > 10 else rank.value
+    __slots__ = ("rank", "suit", "value", "index", "is_ace")
+    rank: Rank
+    suit: Suit
+    value: int
+    index: int
+    is_ace: bool
+
+    def __new__(cls, rank: Rank, suit: Suit) -> "PlayingCard":
+        return CARDS[card_index(rank, suit)]
+
+    def __reduce__(self) -> tuple:
+        return (card_from_index, (self.index,))
 
     def __repr__(self) -> str:
-        return f"{repr(self.rank)} of {repr(self.suit)}"
\ No newline at end of file
+        return f"{repr(self.rank)} of {repr(self.suit)}"
+
+def card_index(rank: Rank, suit: Suit) -> int:
+    """
+    Gets the index of a card.
+    
+    :param rank: The rank of the card.
+    :type rank: Rank
+    :param suit: The suit of the card.
+    :type suit: Suit
+    :return: The card index, 0 - 51.
+    :rtype: int
+    """
+    return (suit.value - 1) * len(Rank) + (rank.value - 1)
+
+def card_from_index(index: int) -> PlayingCard:
+    """
+    Gets the card for an index.
+    
+    :param index: The card index, 0 - 51.
+    :type index: int
+    :return: The playing card.
+    :rtype: PlayingCard
+    """
+    return CARDS[index]
+
+def _build_cards() -> tuple[PlayingCard, ...]:
+    cards: list[PlayingCard] = []
+    for suit in Suit:
+        for rank in Rank:
+            card = object.__new__(PlayingCard)
+            card.rank = rank
+            card.suit = suit
+            card.value = 10 if rank.value > 10 else rank.value
+            card.index = len(cards)
+            card.is_ace = rank == Rank.ACE
+            cards.append(card)
+    return tuple(cards)
+
+CARD_COUNT = len(Rank) * len(Suit)
+# Every card, in index order, and lookup tables of the blackjack value (Ace is 1) and ace-ness of each card index.
+CARDS: tuple[PlayingCard, ...] = _build_cards()
+CARD_VALUES = bytes(card.value for card in CARDS)
+CARD_IS_ACE = bytes(card.is_ace for card in CARDS)
@@ -0,0 +1,139 @@
+"""
+Where game events are shown.
+
+The engine reports events (a card drawn, the dealer's hole card, the end of a round) to a Renderer instead of
+printing them. Any object with the Renderer methods will do. The text is built by cli_output_processor, and each
+renderer here decides what happens to it:
+    TerminalRenderer writes every event as it happens, like print.
+    BufferedRenderer collects the lines and writes them in one go on flush, once per round or before a prompt.
+    NullRenderer drops the events before any text is built, for simulations and other unattended play.
+"""
+
+import sys
+from typing import Protocol, TextIO
+from .actor import Actor
+from .dealer import Dealer
+from .player import Player
+from .playing_card import PlayingCard
+from . import cli_output_processor
+
+
+class Renderer(Protocol):
+    """
+    Where the engine reports game events.
+    """
+    def new_card(self, actor: Actor, card: PlayingCard) -> None:
+        """
+        Shows a card drawn by the Player or Dealer.
+
+        :param actor: Who drew the card.
+        :type actor: Actor
+        :param card: The card.
+        :type card: PlayingCard
+        """
+        ...
+
+    def dealer_held_card(self, dealer: Dealer) -> None:
+        """
+        Shows the Dealer's hole card as it is revealed.
+
+        :param dealer: The Dealer
+        :type dealer: Dealer
+        """
+        ...
+
+    def end_of_round(self, dealer: Dealer, player: Player, end_state_str: str) -> None:
+        """
+        Shows both hands and the outcome at the end of a round.
+
+        :param dealer: The Dealer
+        :type dealer: Dealer
+        :param player: The Player
+        :type player: Player
+        :param end_state_str: The outcome of the round.
+        :type end_state_str: str
+        """
+        ...
+
+    def flush(self) -> None:
+        """
+        Writes out anything held back. Call before prompting the player.
+        """
+        ...
+
+
+class TerminalRenderer:
+    """
+    Writes every event as it happens.
+
+    Attributes:
+        stream (TextIO | None): Where to write, the current sys.stdout when None.
+    """
+    def __init__(self, stream: TextIO | None = None) -> None:
+        self.stream = stream
+
+    def emit(self, text: str) -> None:
+        """
+        Shows one line of text.
+
+        :param text: The line, without a line break.
+        :type text: str
+        """
+        print(text, file=self.stream if self.stream is not None else sys.stdout)
+
+    def flush(self) -> None:
+        pass
+
+    def new_card(self, actor: Actor, card: PlayingCard) -> None:
+        self.emit(cli_output_processor.format_new_card(actor, card))
+
+    def dealer_held_card(self, dealer: Dealer) -> None:
+        self.emit(cli_output_processor.format_dealer_held_card(dealer))
+
+    def end_of_round(self, dealer: Dealer, player: Player, end_state_str: str) -> None:
+        self.emit(cli_output_processor.format_end_of_round_state(dealer, player, end_state_str))
+
+
+class BufferedRenderer(TerminalRenderer):
+    """
+    Holds lines until flush, then writes them with a single call.
+
+    Attributes:
+        stream (TextIO | None): Where to write, the current sys.stdout when None.
+        lines (list[str]): The lines held since the last flush.
+    """
+    def __init__(self, stream: TextIO | None = None) -> None:
+        super().__init__(stream)
+        self.lines: list[str] = []
+
+    def emit(self, text: str) -> None:
+        self.lines.append(text)
+
+    def flush(self) -> None:
+        if not self.lines:
+            return
+        stream = self.stream if self.stream is not None else sys.stdout
+        stream.write("\n".join(self.lines) + "\n")
+        stream.flush()
+        self.lines.clear()
+
+
+class NullRenderer:
+    """
+    Drops every event without formatting it.
+    """
+    def new_card(self, actor: Actor, card: PlayingCard) -> None:
+        pass
+
+    def dealer_held_card(self, dealer: Dealer) -> None:
+        pass
+
+    def end_of_round(self, dealer: Dealer, player: Player, end_state_str: str) -> None:
+        pass
+
+    def flush(self) -> None:
+        pass
+
+
+TERMINAL_RENDERER = TerminalRenderer()
+NULL_RENDERER = NullRenderer()
@@ -0,0 +1,303 @@
+"""
+Random number sources for shuffling.
+
+A Deck only ever asks its generator for one thing, to shuffle its cards in place, so anything with a shuffle method
+can be injected: random.Random, the backends here, or the shoe layouts of trace replay, paired comparison and the
+shoe ring. The backends add what long runs need on top of that:
+    StdlibRNG wraps random.Random.
+    NumpyRNG uses a NumPy PCG64 or Philox bit generator and makes whole permutations in batches, so a shuffle is
+    one row of a batch applied with a single indexing operation.
+Both can be seeded, split into independent streams for parallel workers, and checkpointed: get_state gives a JSON
+safe dict that set_state restores, after which the shuffles carry on exactly where they left off.
+
+Streams are numbered. Stream n of a seed is the same whichever process makes it, so shard n of a parallel run gets
+stream n without any coordination. NumPy backends also support jumped, which advances the bit generator as if a
+huge number of values had been drawn.
+
+NumpyRNG requires numpy, install it with the numpy extra.
+"""
+
+import hashlib
+import random
+from typing import Any, Mapping, MutableSequence, Protocol
+try:
+    import numpy as np
+    HAVE_NUMPY = True
+except ImportError:
+    HAVE_NUMPY = False
+
+BACKENDS = ("stdlib", "pcg64", "philox")
+DEFAULT_BATCH_SIZE = 256
+
+
+class ShuffleSource(Protocol):
+    """
+    What a Deck needs from its generator.
+    """
+    def shuffle(self, cards: MutableSequence) -> None:
+        """
+        Shuffles cards in place.
+
+        :param cards: The cards, a Deck's bytearray of card indexes.
+        :type cards: MutableSequence
+        """
+        ...
+
+
+def derive_seed(seed: int, stream: int) -> int:
+    """
+    Derives the seed of a numbered stream from a master seed.
+    Hashing keeps the streams of neighbouring numbers unrelated, and does not depend on the process it runs in.
+
+    :param seed: The master seed.
+    :type seed: int
+    :param stream: The stream number.
+    :type stream: int
+    :return: The stream's seed.
+    :rtype: int
+    """
+    digest = hashlib.blake2b(f"{seed}:{stream}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+class StdlibRNG:
+    """
+    Shuffles with random.Random.
+
+    Attributes:
+        seed (int | None): The seed of the stream, None when seeded from the operating system.
+    """
+    def __init__(self, seed: int | None = None, stream: int | None = None) -> None:
+        """
+        StdlibRNG constructor
+
+        :param seed: The seed, random by default.
+        :type seed: int | None
+        :param stream: The stream number of the seed to use, see derive_seed. The seed itself when None.
+        :type stream: int | None
+        """
+        if seed is not None and stream is not None:
+            seed = derive_seed(seed, stream)
+        self.seed = seed
+        self._random = random.Random(seed)
+
+    def shuffle(self, cards: MutableSequence) -> None:
+        self._random.shuffle(cards)
+
+    def spawn(self, count: int) -> list["StdlibRNG"]:
+        """
+        Makes independent generators for parallel workers, seeded from this one.
+
+        :param count: The number of generators.
+        :type count: int
+        :return: The generators.
+        :rtype: list[StdlibRNG]
+        """
+        return [StdlibRNG(self._random.getrandbits(64)) for _ in range(count)]
+
+    def get_state(self) -> dict:
+        version, internal, gauss_next = self._random.getstate()
+        return {"backend": "stdlib", "seed": self.seed, "state": [version, list(internal), gauss_next]}
+
+    def set_state(self, state: dict) -> None:
+        if state.get("backend") != "stdlib":
+            raise ValueError(f"Not a stdlib generator state: {state.get('backend')!r}")
+        version, internal, gauss_next = state["state"]
+        self.seed = state["seed"]
+        self._random.setstate((version, tuple(internal), gauss_next))
+
+
+class NumpyRNG:
+    """
+    Shuffles with a NumPy bit generator, making permutations of a shoe's size a batch at a time.
+
+    Attributes:
+        bit_generator (str): "pcg64" or "philox".
+        seed (int | None): The master seed, None when seeded from the operating system.
+        stream (int | None): The stream number of the seed, None for the master stream.
+        batch_size (int): Permutations made at a time.
+    """
+    def __init__(
+            self,
+            seed: int | None = None,
+            bit_generator: str = "pcg64",
+            stream: int | None = None,
+            batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> None:
+        """
+        NumpyRNG constructor
+
+        :param seed: The seed, random by default.
+        :type seed: int | None
+        :param bit_generator: "pcg64" or "philox".
+        :type bit_generator: str
+        :param stream: The stream number of the seed to use. Stream n is the nth child of the seed's SeedSequence.
+        :type stream: int | None
+        :param batch_size: Permutations made at a time.
+        :type batch_size: int
+        """
+        if not HAVE_NUMPY:
+            raise ImportError("The NumPy generators require numpy. Install it with: pip install pyblackjack[numpy]")
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1.")
+        spawn_key = () if stream is None else (stream,)
+        self._seed_sequence = np.random.SeedSequence(seed, spawn_key=spawn_key)
+        self._bit_generator = _make_bit_generator(bit_generator, self._seed_sequence)
+        self._generator = np.random.Generator(self._bit_generator)
+        self.bit_generator = bit_generator
+        self.seed = seed
+        self.stream = stream
+        self.batch_size = batch_size
+        # Permutations of the current batch, one per row. _batch_state is None until the first batch is made.
+        self._batch: np.ndarray = np.empty((0, 0), dtype=np.intp)
+        self._batch_state: Mapping[str, Any] | None = None
+        self._length = 0
+        self._position = 0
+
+    def _next_batch(self, length: int) -> None:
+        # The bit generator state before the batch is what a checkpoint saves, see get_state.
+        self._batch_state = self._generator.bit_generator.state
+        positions = np.tile(np.arange(length, dtype=np.intp), (self.batch_size, 1))
+        self._batch = self._generator.permuted(positions, axis=1)
+        self._length = length
+        self._position = 0
+
+    def shuffle(self, cards: MutableSequence) -> None:
+        length = len(cards)
+        if length != self._length or self._position >= self.batch_size or self._batch_state is None:
+            self._next_batch(length)
+        permutation = self._batch[self._position]
+        self._position += 1
+        if isinstance(cards, bytearray):
+            cards[:] = np.frombuffer(cards, dtype=np.uint8)[permutation].tobytes()
+        else:
+            cards[:] = [cards[index] for index in permutation.tolist()]
+
+    def spawn(self, count: int) -> list["NumpyRNG"]:
+        """
+        Makes independent generators for parallel workers, spawned from this one's seed sequence.
+
+        :param count: The number of generators.
+        :type count: int
+        :return: The generators.
+        :rtype: list[NumpyRNG]
+        """
+        return [
+            self._with_generator(_make_bit_generator(self.bit_generator, seed_sequence), seed_sequence)
+            for seed_sequence in self._seed_sequence.spawn(count)]
+
+    def jumped(self, jumps: int = 1) -> "NumpyRNG":
+        """
+        Makes a generator whose stream starts far ahead of this one's, as if around 2^128 values had been drawn per
+        jump. Batched permutations that were not used yet are not carried over.
+
+        :param jumps: The number of jumps.
+        :type jumps: int
+        :return: The new generator.
+        :rtype: NumpyRNG
+        """
+        return self._with_generator(self._bit_generator.jumped(jumps), self._seed_sequence)
+
+    def _with_generator(self, bit_generator: "np.random.PCG64 | np.random.Philox", seed_sequence) -> "NumpyRNG":
+        """
+        Makes a generator with this one's settings around another bit generator.
+        """
+        child = object.__new__(NumpyRNG)
+        child.__dict__.update(self.__dict__)
+        child._seed_sequence = seed_sequence
+        child._bit_generator = bit_generator
+        child._generator = np.random.Generator(bit_generator)
+        child._batch = np.empty((0, 0), dtype=np.intp)
+        child._batch_state = None
+        child._length = 0
+        child._position = 0
+        return child
+
+    def get_state(self) -> dict:
+        """
+        Gets a JSON safe checkpoint of the generator, including how far into the current batch it is.
+
+        :return: The state.
+        :rtype: dict
+        """
+        has_batch = self._batch_state is not None
+        batch_state = self._batch_state if has_batch else self._generator.bit_generator.state
+        return {
+            "backend": self.bit_generator,
+            "seed": self.seed,
+            "stream": self.stream,
+            "batch_size": self.batch_size,
+            "state": _to_json(batch_state),
+            "length": self._length if has_batch else 0,
+            "position": self._position if has_batch else 0}
+
+    def set_state(self, state: dict) -> None:
+        """
+        Restores a checkpoint from get_state. The current batch is made again from its saved starting state.
+
+        :param state: The state.
+        :type state: dict
+        """
+        if state.get("backend") != self.bit_generator:
+            raise ValueError(f"Not a {self.bit_generator} generator state: {state.get('backend')!r}")
+        self.seed = state["seed"]
+        self.stream = state["stream"]
+        self.batch_size = state["batch_size"]
+        self._generator.bit_generator.state = _from_json(state["state"])
+        self._batch = np.empty((0, 0), dtype=np.intp)
+        self._batch_state = None
+        self._length = 0
+        self._position = 0
+        if state["length"]:
+            self._next_batch(state["length"])
+            self._position = state["position"]
+
+
+def _make_bit_generator(name: str, seed_sequence) -> "np.random.PCG64 | np.random.Philox":
+    match name:
+        case "pcg64":
+            return np.random.PCG64(seed_sequence)
+        case "philox":
+            return np.random.Philox(seed_sequence)
+    raise ValueError(f"Unknown bit generator {name!r}, expected pcg64 or philox.")
+
+
+def _to_json(value):
+    """
+    Converts a bit generator state to plain lists and ints. Philox keeps its counter, key and buffer in arrays.
+    """
+    if isinstance(value, dict):
+        return {key: _to_json(item) for key, item in value.items()}
+    if HAVE_NUMPY and isinstance(value, np.ndarray):
+        return {"uint64_array": [int(item) for item in value.tolist()]}
+    if HAVE_NUMPY and isinstance(value, np.integer):
+        return int(value)
+    return value
+
+
+def _from_json(value):
+    if isinstance(value, dict):
+        if set(value) == {"uint64_array"}:
+            return np.array(value["uint64_array"], dtype=np.uint64)
+        return {key: _from_json(item) for key, item in value.items()}
+    return value
+
+
+def make_rng(backend: str = "stdlib", seed: int | None = None, stream: int | None = None) -> StdlibRNG | NumpyRNG:
+    """
+    Builds a generator by backend name.
+
+    :param backend: "stdlib", "pcg64" or "philox".
+    :type backend: str
+    :param seed: The seed, random by default.
+    :type seed: int | None
+    :param stream: The stream number of the seed to use, for one of many parallel workers.
+    :type stream: int | None
+    :return: The generator.
+    :rtype: StdlibRNG | NumpyRNG
+    """
+    if backend == "stdlib":
+        return StdlibRNG(seed, stream)
+    if backend in BACKENDS:
+        return NumpyRNG(seed, backend, stream)
+    raise ValueError(f"Unknown generator backend {backend!r}, expected one of {', '.join(BACKENDS)}.")
@@ -0,0 +1,192 @@
+"""
+Streaming statistics over settled hands.
+
+Every figure is updated as each hand is added and kept in O(1) memory, so they can be read at any point of a
+simulation of any length. Returns are measured per unit wagered, and their variance uses Welford's method.
+Two sets of statistics can be combined, the second taken as played after the first, which is how the histories of
+parallel workers are merged.
+"""
+
+import math
+from .round_results import RoundResults
+
+# Two sided 95% confidence.
+DEFAULT_Z_SCORE = 1.959963984540054
+
+
+class RoundStatistics:
+    """
+    Running aggregates of settled hands, from one actor's point of view.
+
+    Attributes:
+        rounds (int): Hands added.
+        counts (dict[RoundResults, int]): Hands added for each result.
+        total_net (float): The sum of the net amounts won (negative when lost).
+        total_wagered (float): The sum of the amounts wagered.
+        max_drawdown (float): The largest fall of the cumulative net from a previous peak.
+        longest_losing_streak (int): The most hands lost in a row.
+    """
+    def __init__(self) -> None:
+        self.rounds = 0
+        self.counts: dict[RoundResults, int] = {result: 0 for result in RoundResults}
+        self.total_net = 0.0
+        self.total_wagered = 0.0
+        self.max_drawdown = 0.0
+        self.longest_losing_streak = 0
+        # Welford accumulators over the return per unit wagered, for hands with a stake.
+        self._samples = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        # Highest and lowest cumulative net, both counting the starting point of 0.
+        self._peak = 0.0
+        self._trough = 0.0
+        # Hands lost in a row at the end, and at the start.
+        self._current_streak = 0
+        self._leading_streak = 0
+
+    def add(self, outcome: RoundResults, net: float, wagered: float) -> None:
+        """
+        Adds a settled hand.
+
+        :param outcome: The result of the hand.
+        :type outcome: RoundResults
+        :param net: The amount won, negative when lost.
+        :type net: float
+        :param wagered: The amount staked on the hand. Hands with no stake are left out of the return statistics.
+        :type wagered: float
+        """
+        self.rounds += 1
+        self.counts[outcome] += 1
+        self.total_net += net
+        self.total_wagered += wagered
+
+        if wagered > 0:
+            value = net / wagered
+            self._samples += 1
+            delta = value - self._mean
+            self._mean += delta / self._samples
+            self._m2 += delta * (value - self._mean)
+
+        cumulative = self.total_net
+        if cumulative > self._peak:
+            self._peak = cumulative
+        elif self._peak - cumulative > self.max_drawdown:
+            self.max_drawdown = self._peak - cumulative
+        if cumulative < self._trough:
+            self._trough = cumulative
+
+        if net < 0:
+            self._current_streak += 1
+            if self._current_streak > self.longest_losing_streak:
+                self.longest_losing_streak = self._current_streak
+            if self._leading_streak == self.rounds - 1:
+                self._leading_streak = self.rounds
+        else:
+            self._current_streak = 0
+
+    def merge(self, other: "RoundStatistics") -> None:
+        """
+        Adds another set of statistics, taking its hands as played after the hands already added.
+
+        :param other: The statistics to add.
+        :type other: RoundStatistics
+        """
+        if other.rounds == 0:
+            return
+        offset = self.total_net
+        # A drawdown can start at a peak before the join and bottom out after it.
+        self.max_drawdown = max(self.max_drawdown, other.max_drawdown, self._peak - (offset + other._trough))
+        self._peak = max(self._peak, offset + other._peak)
+        self._trough = min(self._trough, offset + other._trough)
+
+        self.longest_losing_streak = max(
+            self.longest_losing_streak, other.longest_losing_streak, self._current_streak + other._leading_streak)
+        if self._leading_streak == self.rounds:
+            self._leading_streak += other._leading_streak
+        if other._current_streak == other.rounds:
+            self._current_streak += other.rounds
+        else:
+            self._current_streak = other._current_streak
+
+        if other._samples:
+            samples = self._samples + other._samples
+            delta = other._mean - self._mean
+            self._mean += delta * other._samples / samples
+            self._m2 += other._m2 + delta * delta * self._samples * other._samples / samples
+            self._samples = samples
+
+        self.rounds += other.rounds
+        for result, count in other.counts.items():
+            self.counts[result] += count
+        self.total_net += other.total_net
+        self.total_wagered += other.total_wagered
+
+    @property
+    def current_losing_streak(self) -> int:
+        """
+        The hands lost in a row up to the latest one.
+        """
+        return self._current_streak
+
+    @property
+    def mean_return(self) -> float:
+        """
+        The average return per unit wagered.
+        """
+        return self._mean
+
+    @property
+    def variance(self) -> float:
+        """
+        The sample variance of the return per unit wagered.
+        """
+        if self._samples < 2:
+            return 0.0
+        return self._m2 / (self._samples - 1)
+
+    @property
+    def standard_deviation(self) -> float:
+        return math.sqrt(self.variance)
+
+    @property
+    def standard_error(self) -> float:
+        """
+        The standard error of mean_return.
+        """
+        if self._samples < 2:
+            return math.inf
+        return math.sqrt(self.variance / self._samples)
+
+    @property
+    def return_on_wagered(self) -> float:
+        """
+        The total net over the total wagered, so larger bets count for more than in mean_return.
+        """
+        if self.total_wagered == 0:
+            return 0.0
+        return self.total_net / self.total_wagered
+
+    def confidence_interval(self, z_score: float = DEFAULT_Z_SCORE) -> tuple[float, float]:
+        """
+        Gets a normal approximation confidence interval for the mean return per unit wagered.
+
+        :param z_score: The number of standard errors either side of the mean, 95% confidence by default.
+        :type z_score: float
+        :return: The low and high ends of the interval.
+        :rtype: tuple[float, float]
+        """
+        margin = z_score * self.standard_error
+        return self._mean - margin, self._mean + margin
+
+    def frequency(self, outcome: RoundResults) -> float:
+        """
+        Gets the share of hands with a result.
+
+        :param outcome: The result.
+        :type outcome: RoundResults
+        :return: The share of hands, 0 to 1.
+        :rtype: float
+        """
+        if self.rounds == 0:
+            return 0.0
+        return self.counts[outcome] / self.rounds
@@ -0,0 +1,100 @@
+"""
+The house rules as one value, so a rule set can be named, hashed, compared and applied for a run.
+
+The engine reads its rules from module constants: the payouts and the soft 17 rule from blackjack, the minimum bet
+and deck penetration from constants. Rules.applied sets those constants for the length of a with block and puts the
+previous values back afterwards. The constants are process wide, so only one rule set can be applied at a time in
+a process; runs with different rules go in different processes, like the sweep workers.
+"""
+
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, fields
+from typing import Iterator
+from .deck import Deck
+from .rng import ShuffleSource
+from .playing_card import CARD_COUNT
+from . import blackjack, constants
+
+
+@dataclass(frozen=True)
+class Rules:
+    """
+    A set of house rules.
+
+    Attributes:
+        deck_count (int): The number of 52 card packs in the shoe.
+        refresh_percentage (float): The share of the shoe left when it is reshuffled.
+        minimum_bet (float): The smallest bet allowed.
+        blackjack_payout (float): The payout of a player blackjack, per unit bet.
+        insurance_payout (float): The payout of a winning insurance bet, per unit insured.
+        dealer_hits_soft_17 (bool): Whether the dealer hits a soft 17 rather than standing.
+    """
+    deck_count: int = 1
+    refresh_percentage: float = constants.DECK_REFRESH_PERCENTAGE
+    minimum_bet: float = constants.MINIMUM_BET
+    blackjack_payout: float = blackjack.BLACKJACK_PAYOUT
+    insurance_payout: float = blackjack.INSURANCE_PAYOUT
+    dealer_hits_soft_17: bool = blackjack.DEALER_HITS_SOFT_17
+
+    def __post_init__(self) -> None:
+        if self.deck_count < 1:
+            raise ValueError("A shoe needs at least one pack of cards.")
+        if not 0 <= self.refresh_percentage < 1:
+            raise ValueError("refresh_percentage must be at least 0 and below 1.")
+        if self.minimum_bet <= 0:
+            raise ValueError("minimum_bet must be positive.")
+
+    @property
+    def cut_card(self) -> int:
+        """
+        The number of remaining cards at which the shoe is reshuffled.
+        """
+        return int(self.deck_count * CARD_COUNT * self.refresh_percentage)
+
+    def new_deck(self, rng: ShuffleSource | None = None) -> Deck:
+        """
+        Builds a shoe for these rules.
+
+        :param rng: The random number generator used for shuffling.
+        :type rng: ShuffleSource | None
+        :return: The Deck
+        :rtype: Deck
+        """
+        return Deck(rng=rng, deck_count=self.deck_count, cut_card=self.cut_card)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Rules":
+        """
+        Builds rules from a dict, as made by to_dict. Missing rules keep their defaults.
+
+        :param data: The rule values by name.
+        :type data: dict
+        :return: The Rules
+        :rtype: Rules
+        """
+        unknown = set(data) - {rule.name for rule in fields(cls)}
+        if unknown:
+            raise ValueError(f"Unknown rules: {', '.join(sorted(unknown))}")
+        return cls(**data)
+
+    @contextmanager
+    def applied(self) -> Iterator["Rules"]:
+        """
+        Sets the engine's rule constants to these rules for the length of a with block.
+        """
+        saved = (
+            constants.DECK_REFRESH_PERCENTAGE, constants.MINIMUM_BET,
+            blackjack.BLACKJACK_PAYOUT, blackjack.INSURANCE_PAYOUT, blackjack.DEALER_HITS_SOFT_17)
+        constants.DECK_REFRESH_PERCENTAGE = self.refresh_percentage
+        constants.MINIMUM_BET = self.minimum_bet
+        blackjack.BLACKJACK_PAYOUT = self.blackjack_payout
+        blackjack.INSURANCE_PAYOUT = self.insurance_payout
+        blackjack.DEALER_HITS_SOFT_17 = self.dealer_hits_soft_17
+        try:
+            yield self
+        finally:
+            (constants.DECK_REFRESH_PERCENTAGE, constants.MINIMUM_BET,
+             blackjack.BLACKJACK_PAYOUT, blackjack.INSURANCE_PAYOUT, blackjack.DEALER_HITS_SOFT_17) = saved
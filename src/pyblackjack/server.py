@@ -0,0 +1,395 @@
+"""
+An asyncio game server. Every connection is its own table, with its own Player, Dealer and Deck, and the console
+prompts are replaced by request/response lines over TCP or a Unix socket.
+
+Run with:
+    python -m pyblackjack.server --port 8765
+    python -m pyblackjack.server --unix /tmp/pyblackjack.sock
+
+The protocol is UTF-8 text, one message per line, fields separated by spaces. The server sends:
+    HELLO pyblackjack <protocol version>
+    BET <balance> <minimum bet>                 the client answers with a bet
+    INSURANCE <maximum> <minimum>               the client answers with an amount, 0 for none
+    DEAL <dealer upcard> <player cards> <value>
+    ACTION <hand number>/<hands> <cards> <value> <allowed actions>
+                                                the client answers hit, stand, double or split
+    CARD <actor> <card> <value>                 a card drawn by an action or the dealer
+    DEALER <cards> <value>                      the dealer's final hand
+    RESULT <hand number> <DEALER_WON | PLAYER_WON | PLAYER_WON_BLACKJACK | PUSH> <amount>
+    BALANCE <player balance> <dealer balance>
+    CONTINUE                                    the client answers y or n
+    ERROR <message>                             the last answer was refused, the request is sent again
+    BYE <reason> <player balance>               the server closes the connection
+Cards are written as rank then suit, such as AS, TH or QD, and lists of cards are comma separated.
+
+An idle session only costs its coroutine and game objects, so one process can hold thousands of tables. Each write
+waits for the transport to drain, so a client that stops reading stalls only its own table. A session that does not
+answer within the timeout is closed, and connections past max_sessions are turned away.
+"""
+
+import argparse
+import asyncio
+import math
+import os
+from dataclasses import dataclass
+from .blackjack import PossibleActions
+from .dealer import Dealer
+from .deck import Deck
+from .hand import Hand
+from .player import Player
+from .playing_card import PlayingCard, Rank
+from .renderer import NULL_RENDERER
+from . import blackjack, constants, player_turn
+
+PROTOCOL_VERSION = 1
+DEFAULT_PORT = 8765
+DEFAULT_TIMEOUT = 300.0
+DEFAULT_MAX_SESSIONS = 10_000
+MAX_LINE_LENGTH = 256
+# A session's pending output past this many bytes makes it wait for the client to read.
+WRITE_HIGH_WATER = 16 * 1024
+
+RANK_CODES = "A23456789TJQK"
+SUIT_CODES = "SHCD"
+ACTION_NAMES = {
+    "h": PossibleActions.HIT, "hit": PossibleActions.HIT,
+    "s": PossibleActions.STAND, "stand": PossibleActions.STAND,
+    "d": PossibleActions.DOUBLE, "dd": PossibleActions.DOUBLE, "double": PossibleActions.DOUBLE,
+    "sp": PossibleActions.SPLIT, "split": PossibleActions.SPLIT}
+ACTION_ORDER = (PossibleActions.HIT, PossibleActions.STAND, PossibleActions.DOUBLE, PossibleActions.SPLIT)
+
+
+def card_code(card: PlayingCard) -> str:
+    """
+    Writes a card as rank then suit, such as AS or TD.
+
+    :param card: The card.
+    :type card: PlayingCard
+    :return: The two character code.
+    :rtype: str
+    """
+    return RANK_CODES[card.rank.value - 1] + SUIT_CODES[card.suit.value - 1]
+
+
+def hand_code(hand: Hand) -> str:
+    return ",".join(card_code(card) for card in hand.cards)
+
+
+class SessionClosed(Exception):
+    """
+    The client went away, timed out or broke the protocol.
+
+    Attributes:
+        reason (str): Why the session ended.
+    """
+    def __init__(self, reason: str) -> None:
+        super().__init__(reason)
+        self.reason = reason
+
+
+@dataclass
+class ServerConfig:
+    """
+    Server settings.
+
+    Attributes:
+        timeout (float): Seconds a session may take to answer a request before it is closed.
+        max_sessions (int): The most tables open at once, later connections are turned away.
+        deck_count (int): The number of 52 card packs in each table's deck.
+        player_balance (float): Each new Player's starting balance.
+        dealer_balance (float): Each new Dealer's starting balance.
+    """
+    timeout: float = DEFAULT_TIMEOUT
+    max_sessions: int = DEFAULT_MAX_SESSIONS
+    deck_count: int = 1
+    player_balance: float = constants.PLAYER_BANK
+    dealer_balance: float = constants.DEALER_BANK
+
+
+class Session:
+    """
+    One connected table. Plays rounds like the console game, asking the client wherever the game would prompt.
+
+    Attributes:
+        player (Player): The Player
+        dealer (Dealer): The Dealer
+        deck (Deck): The Deck
+        rounds (int): Rounds finished.
+    """
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, config: ServerConfig) -> None:
+        self._reader = reader
+        self._writer = writer
+        self._config = config
+        self.player = Player(starting_balance=config.player_balance)
+        self.dealer = Dealer(starting_balance=config.dealer_balance)
+        self.deck = Deck(deck_count=config.deck_count)
+        self.rounds = 0
+
+    async def send(self, *fields: object) -> None:
+        """
+        Sends one message, waiting if the client is behind on reading.
+        """
+        writer = self._writer
+        if writer.is_closing():
+            raise SessionClosed("disconnected")
+        writer.write((" ".join(str(value) for value in fields) + "\n").encode())
+        try:
+            await writer.drain()
+        except ConnectionError as error:
+            raise SessionClosed("disconnected") from error
+
+    async def ask(self, *fields: object) -> str:
+        """
+        Sends a request and waits for the answer line.
+
+        :return: The answer, stripped and lower case.
+        :rtype: str
+        """
+        await self.send(*fields)
+        try:
+            line = await asyncio.wait_for(self._reader.readline(), self._config.timeout)
+        except asyncio.TimeoutError as error:
+            raise SessionClosed("timeout") from error
+        except (asyncio.LimitOverrunError, ValueError) as error:
+            raise SessionClosed("line_too_long") from error
+        except ConnectionError as error:
+            raise SessionClosed("disconnected") from error
+        if not line:
+            raise SessionClosed("disconnected")
+        return line.decode(errors="replace").strip().lower()
+
+    async def ask_amount(self, request: tuple, minimum: float, maximum: float, allow_zero: bool = False) -> float:
+        while True:
+            raw = await self.ask(*request)
+            try:
+                amount = float(raw)
+            except ValueError:
+                await self.send("ERROR", "not_a_number")
+                continue
+            if not math.isfinite(amount):
+                await self.send("ERROR", "not_a_number")
+            elif allow_zero and amount == 0:
+                return 0.0
+            elif amount < minimum:
+                await self.send("ERROR", "below_minimum")
+            elif amount > maximum:
+                await self.send("ERROR", "above_maximum")
+            else:
+                return amount
+
+    async def ask_bet(self) -> float:
+        balance = self.player.bank.balance
+        return await self.ask_amount(("BET", f"{balance:.2f}", constants.MINIMUM_BET), constants.MINIMUM_BET, balance)
+
+    async def ask_insurance(self, bet_value: float) -> float:
+        balance = self.player.bank.balance
+        minimum = bet_value * 0.1
+        if minimum > balance:
+            return 0.0
+        maximum = min(bet_value, balance)
+        return await self.ask_amount(("INSURANCE", maximum, minimum), minimum, maximum, allow_zero=True)
+
+    async def ask_action(self, allowed_actions: set[PossibleActions]) -> PossibleActions:
+        player = self.player
+        allowed = ",".join(action.value for action in ACTION_ORDER if action in allowed_actions)
+        while True:
+            raw = await self.ask(
+                "ACTION", f"{player.current_hand_index + 1}/{len(player.split_hands)}",
+                hand_code(player.hand), player.hand.get_hand_value(), allowed)
+            action = ACTION_NAMES.get(raw)
+            if action in allowed_actions:
+                return action
+            await self.send("ERROR", "action_not_allowed")
+
+    async def ask_continue(self) -> bool:
+        while True:
+            raw = await self.ask("CONTINUE")
+            if raw in ("y", "yes"):
+                return True
+            if raw in ("n", "no"):
+                return False
+            await self.send("ERROR", "answer_y_or_n")
+
+    async def play_round(self) -> None:
+        """
+        Plays one round, following the console game in __main__.
+        """
+        player = self.player
+        dealer = self.dealer
+        deck = self.deck
+        bet_value = await self.ask_bet()
+        blackjack.start_round(dealer, player, deck, bet_value)
+        dealer_upcard = dealer.get_visible_card()
+        await self.send("DEAL", card_code(dealer_upcard), hand_code(player.hand), player.hand.get_hand_value())
+        insurance = 0.0
+        if dealer_upcard.rank == Rank.ACE:
+            insurance = player_turn.buy_insurance(player, await self.ask_insurance(bet_value))
+
+        while player.current_hand_index < len(player.split_hands):
+            while not player.hand.has_stood:
+                choice = await self.ask_action(player_turn.get_allowed_actions(player, deck))
+                cards_before = len(player.hand.cards)
+                hand_index = player.current_hand_index
+                player_turn.apply_action(player, deck, choice, renderer=NULL_RENDERER)
+                if choice == PossibleActions.SPLIT:
+                    for hand in player.split_hands[hand_index:hand_index + 2]:
+                        await self.send("CARD", player.name, card_code(hand.cards[-1]), hand.get_hand_value())
+                elif len(player.hand.cards) > cards_before:
+                    await self.send("CARD", player.name, card_code(player.hand.cards[-1]), player.hand.get_hand_value())
+            if not player.next_hand():
+                break
+
+        blackjack.process_dealer_turn(dealer, deck, renderer=NULL_RENDERER)
+        await self.send("DEALER", hand_code(dealer.hand), dealer.hand.get_hand_value())
+        dealer_blackjack = dealer.hand.has_blackjack
+        blackjack.settle_insurance(dealer, player, insurance, dealer_blackjack)
+        for index, hand in enumerate(player.split_hands):
+            result = blackjack.determine_winner(
+                dealer_hand=dealer.hand,
+                player_hand=hand,
+                dealer_blackjack=dealer_blackjack,
+                player_blackjack=hand.has_blackjack)
+            amount = blackjack.settle_hand(dealer, player, hand.bet.balance, result)
+            await self.send("RESULT", index + 1, result.name, f"{amount:.2f}")
+        await self.send("BALANCE", f"{player.bank.balance:.2f}", f"{dealer.bank.balance:.2f}")
+        deck.confirm_deck_health()
+        self.rounds += 1
+
+    async def run(self) -> str:
+        """
+        Plays rounds until either bank is empty, the client stops, or the session is closed.
+
+        :return: Why the session ended.
+        :rtype: str
+        """
+        try:
+            await self.send("HELLO", "pyblackjack", PROTOCOL_VERSION)
+            while self.player.bank.balance > 0 and self.dealer.bank.balance > 0:
+                if self.player.bank.balance < constants.MINIMUM_BET:
+                    reason = "below_minimum_bet"
+                    break
+                await self.play_round()
+                if not await self.ask_continue():
+                    reason = "player_left"
+                    break
+            else:
+                reason = "bank_empty"
+            await self.send("BYE", reason, f"{self.player.bank.balance:.2f}")
+            return reason
+        except SessionClosed as closed:
+            if closed.reason != "disconnected" and not self._writer.is_closing():
+                self._writer.write(f"BYE {closed.reason} {self.player.bank.balance:.2f}\n".encode())
+            return closed.reason
+
+
+class GameServer:
+    """
+    Accepts connections and runs a Session for each.
+
+    Attributes:
+        config (ServerConfig): The server settings.
+        active_sessions (int): Tables open now.
+        total_sessions (int): Tables opened since the server started.
+        rejected (int): Connections turned away because max_sessions were open.
+        total_rounds (int): Rounds finished by closed sessions.
+    """
+    def __init__(self, config: ServerConfig | None = None) -> None:
+        self.config = config if config is not None else ServerConfig()
+        self.active_sessions = 0
+        self.total_sessions = 0
+        self.rejected = 0
+        self.total_rounds = 0
+        self._server: asyncio.Server | None = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        writer.transport.set_write_buffer_limits(high=WRITE_HIGH_WATER)
+        if self.active_sessions >= self.config.max_sessions:
+            self.rejected += 1
+            writer.write(b"BYE server_full 0\n")
+            await self._close(writer)
+            return
+        self.active_sessions += 1
+        self.total_sessions += 1
+        session = Session(reader, writer, self.config)
+        try:
+            await session.run()
+        finally:
+            self.active_sessions -= 1
+            self.total_rounds += session.rounds
+            await self._close(writer)
+
+    @staticmethod
+    async def _close(writer: asyncio.StreamWriter) -> None:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+    async def start(self, host: str | None = "127.0.0.1", port: int = DEFAULT_PORT, unix_path: str | None = None) -> None:
+        """
+        Starts listening, on a Unix socket if unix_path is given, otherwise on TCP.
+
+        :param host: The TCP host.
+        :type host: str | None
+        :param port: The TCP port, 0 picks a free one.
+        :type port: int
+        :param unix_path: The Unix socket path.
+        :type unix_path: str | None
+        """
+        if unix_path is not None:
+            if os.path.exists(unix_path):
+                os.unlink(unix_path)
+            self._server = await asyncio.start_unix_server(self._handle, path=unix_path, limit=MAX_LINE_LENGTH, backlog=1024)
+        else:
+            self._server = await asyncio.start_server(self._handle, host, port, limit=MAX_LINE_LENGTH, backlog=1024)
+
+    @property
+    def port(self) -> int | None:
+        """
+        The TCP port being listened on, None for a Unix socket or before start.
+        """
+        if self._server is None or not self._server.sockets:
+            return None
+        address = self._server.sockets[0].getsockname()
+        return address[1] if isinstance(address, tuple) else None
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            raise RuntimeError("The server has not been started.")
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+
+async def serve(host: str = "127.0.0.1", port: int = DEFAULT_PORT, unix_path: str | None = None, config: ServerConfig | None = None) -> None:
+    server = GameServer(config)
+    await server.start(host, port, unix_path)
+    print(f"Serving on {unix_path if unix_path is not None else f'{host}:{server.port}'}")
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve blackjack tables over a line protocol.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", help="Listen on this Unix socket instead of TCP.")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="Seconds a table may wait for an answer.")
+    parser.add_argument("--max-sessions", type=int, default=DEFAULT_MAX_SESSIONS)
+    parser.add_argument("--decks", type=int, default=1)
+    args = parser.parse_args()
+    config = ServerConfig(timeout=args.timeout, max_sessions=args.max_sessions, deck_count=args.decks)
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix, config))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+from .deck import Deck
+from .rng import ShuffleSource
+from .playing_card import CARD_COUNT
+
+MIN_DECKS = 1
+MAX_DECKS = 8
+DEFAULT_DECKS = 6
+DEFAULT_PENETRATION = 0.75
+
+
+class Shoe(Deck):
+    """
+    A dealing shoe holding several decks, with a cut card placed at a set penetration.
+
+    Attributes:
+        deck_count (int): The number of decks in the shoe, 1 - 8.
+        cut_card (int): The shoe is reshuffled by confirm_deck_health once this many cards or fewer remain.
+        reshuffle_count (int): The number of times the shoe has been reshuffled.
+    """
+    def __init__(
+            self,
+            deck_count: int = DEFAULT_DECKS,
+            penetration: float = DEFAULT_PENETRATION,
+            cut_card: int | None = None,
+            rng: ShuffleSource | None = None
+    ) -> None:
+        """
+        Shoe constructor
+
+        :param deck_count: The number of decks, 1 - 8.
+        :type deck_count: int
+        :param penetration: The share of the shoe dealt before the cut card comes out.
+        :type penetration: float
+        :param cut_card: The number of cards left behind the cut card. Overrides penetration when given.
+        :type cut_card: int | None
+        :param rng: The random number generator used for shuffling. Pass a seeded one for a reproducible shoe.
+        :type rng: ShuffleSource | None
+        """
+        if deck_count < MIN_DECKS or deck_count > MAX_DECKS:
+            raise ValueError(f"A shoe holds {MIN_DECKS} to {MAX_DECKS} decks.")
+        if cut_card is None:
+            if penetration <= 0 or penetration >= 1:
+                raise ValueError("Penetration must be between 0 and 1.")
+            total_cards = CARD_COUNT * deck_count
+            cut_card = total_cards - int(total_cards * penetration)
+        super().__init__(rng=rng, deck_count=deck_count, cut_card=cut_card)
@@ -0,0 +1,200 @@
+"""
+Pre-shuffled shoes made by producer processes and handed to simulation workers through shared memory.
+
+A ShoeRing is a block of shared memory cut into slots, each holding one shoe order as packed card indexes (one byte
+per card, the same layout as Deck.cards). Slot numbers move between two queues: producers take a free slot, lay out
+a fresh shoe in it, shuffle it in place through a view of the shared block and pass it on as ready; consumers take a
+ready slot, copy the order into their Deck and hand the slot back. Only slot numbers go through the queues, never the
+cards. The consumer's copy is the one copy of a shoe: a Deck deals by popping from its own bytearray, so it cannot
+play from a view of the slot, and copying the 52 bytes per pack out lets the slot go back to the producers at once. When every slot is
+ready the producers block on the free queue, and when none are the consumers block on the ready queue, so memory
+stays at the ring's size however far ahead the producers are.
+
+A ShoeFeed stands in for a Deck's random generator, the same way trace replay and paired comparison lay out their
+shoes, so a worker's Deck takes its orders from the ring instead of shuffling:
+    with ShoeRing(slots=32, deck_count=6, seed=1) as ring:
+        ring.start_producers(2)
+        deck = Deck(rng=ring.feed(), deck_count=6)
+
+Shoes go to whichever worker asks first, so results are not reproducible from the seed when several workers share
+a ring. Every shoe is still an independent fair shuffle, with each producer on its own seed.
+"""
+
+import multiprocessing
+import random
+from multiprocessing.shared_memory import SharedMemory
+from typing import MutableSequence, cast
+from .playing_card import CARD_COUNT
+
+# Sent through a queue in place of a slot number to stop whoever takes it.
+_STOP = -1
+
+
+class ShoeRing:
+    """
+    A ring of shoe slots in shared memory, filled by producer processes.
+
+    Attributes:
+        slots (int): The number of shoes the ring holds.
+        deck_count (int): The number of 52 card packs in a shoe.
+        shoe_size (int): Cards in a shoe, the bytes in a slot.
+        seed (int): Seeds the producers, each one getting its own stream.
+    """
+    def __init__(self, slots: int, deck_count: int = 1, seed: int | None = None) -> None:
+        """
+        ShoeRing constructor. Creates the shared memory, which close releases.
+
+        :param slots: The number of shoes the ring holds, at least one.
+        :type slots: int
+        :param deck_count: The number of 52 card packs in a shoe.
+        :type deck_count: int
+        :param seed: Seeds the producers, random by default.
+        :type seed: int | None
+        """
+        if slots < 1:
+            raise ValueError("A shoe ring needs at least one slot.")
+        self.slots = slots
+        self.deck_count = deck_count
+        self.shoe_size = CARD_COUNT * deck_count
+        self.seed = seed if seed is not None else random.SystemRandom().getrandbits(64)
+        self._full_shoe = bytes(range(CARD_COUNT)) * deck_count
+        self._memory = SharedMemory(create=True, size=slots * self.shoe_size)
+        self._buffer = _buffer(self._memory)
+        self._owner = True
+        context = multiprocessing.get_context()
+        self._free = context.SimpleQueue()
+        self._ready = context.SimpleQueue()
+        self._producers: list[multiprocessing.Process] = []
+        for slot in range(slots):
+            self._free.put(slot)
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state["_memory"] = self._memory.name
+        del state["_buffer"]
+        state["_owner"] = False
+        state["_producers"] = []
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        # Processes started by multiprocessing share the creator's resource tracker, which already knows the block.
+        self._memory = SharedMemory(name=state["_memory"])
+        self._buffer = _buffer(self._memory)
+
+    def __enter__(self) -> "ShoeRing":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def start_producers(self, count: int = 1) -> None:
+        """
+        Starts producer processes that keep the ring full until it is closed.
+
+        :param count: The number of producers.
+        :type count: int
+        """
+        # Producer n always gets the nth seed of the ring's seed.
+        seeds = random.Random(self.seed)
+        for _ in self._producers:
+            seeds.getrandbits(64)
+        for _ in range(count):
+            index = len(self._producers)
+            process = multiprocessing.Process(
+                target=produce_shoes, args=(self, seeds.getrandbits(64)), name=f"shoe-producer-{index}", daemon=True)
+            process.start()
+            self._producers.append(process)
+
+    def feed(self) -> "ShoeFeed":
+        return ShoeFeed(self)
+
+    def take(self, cards: MutableSequence) -> None:
+        """
+        Copies the next ready shoe into cards and frees its slot. Blocks until a shoe is ready.
+        The shoe is copied rather than viewed because a Deck pops its cards off its own bytearray.
+
+        :param cards: Where the shoe order goes, a Deck's cards.
+        :type cards: MutableSequence
+        """
+        slot = self._ready.get()
+        if slot == _STOP:
+            raise RuntimeError("The shoe ring was closed.")
+        start = slot * self.shoe_size
+        cards[:] = self._buffer[start:start + self.shoe_size]
+        self._free.put(slot)
+
+    def fill(self, rng: random.Random) -> bool:
+        """
+        Shuffles one shoe in place in a free slot and marks it ready. Blocks until a slot is free.
+
+        :param rng: The producer's generator.
+        :type rng: random.Random
+        :return: False once the ring is closing and the producer should stop.
+        :rtype: bool
+        """
+        slot = self._free.get()
+        if slot == _STOP:
+            return False
+        start = slot * self.shoe_size
+        with self._buffer[start:start + self.shoe_size] as cards:
+            # Starting from a fresh shoe keeps each shoe down to the producer's seed, not the slot's last shoe.
+            cards[:] = self._full_shoe
+            # A memoryview supports everything shuffle uses, but is not registered as a MutableSequence.
+            rng.shuffle(cast(MutableSequence, cards))
+        self._ready.put(slot)
+        return True
+
+    def close(self) -> None:
+        """
+        Stops the producers and, in the process that created the ring, releases the shared memory.
+        """
+        for _ in self._producers:
+            self._free.put(_STOP)
+        for process in self._producers:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self._producers.clear()
+        self._buffer.release()
+        self._memory.close()
+        if self._owner:
+            self._memory.unlink()
+            self._owner = False
+
+
+def _buffer(memory: SharedMemory) -> memoryview:
+    buffer = memory.buf
+    if buffer is None:
+        raise RuntimeError(f"The shared memory block {memory.name} is closed.")
+    return buffer
+
+
+def produce_shoes(ring: ShoeRing, seed: int) -> None:
+    """
+    The body of a producer process. Fills slots until the ring is closed.
+
+    :param ring: The ring.
+    :type ring: ShoeRing
+    :param seed: The producer's seed.
+    :type seed: int
+    """
+    rng = random.Random(seed)
+    while ring.fill(rng):
+        pass
+
+
+class ShoeFeed:
+    """
+    Stands in for a Deck's random generator, laying out shoes from a ring instead of shuffling.
+
+    Attributes:
+        shoes (int): Shoes taken from the ring so far.
+    """
+    def __init__(self, ring: ShoeRing) -> None:
+        self._ring = ring
+        self.shoes = 0
+
+    def shuffle(self, cards: MutableSequence) -> None:
+        self._ring.take(cards)
+        self.shoes += 1
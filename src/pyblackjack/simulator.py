@@ -0,0 +1,412 @@
+"""
+Headless play. The Simulator runs full rounds of blackjack with every decision handed to a Strategy,
+and nothing is printed or prompted, so rounds can be played unattended as fast as the engine allows.
+
+Simulator.run plays a set number of rounds. Simulator.run_to_precision plays in chunks instead, and stops once the
+house edge is known to a target standard error or relative precision, or a round or time limit is reached.
+"""
+
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Protocol
+from .dealer import Dealer
+from .player import Player
+from .deck import Deck
+from .hand import Hand
+from .playing_card import PlayingCard, Rank, CARD_COUNT
+from .round_results import RoundResults
+from .round_statistics import RoundStatistics, DEFAULT_Z_SCORE
+from .blackjack import PossibleActions
+from .instrumentation import Instruments, START_ROUND, INSURANCE, PLAYER_TURN, DEALER_TURN, SETTLE_INSURANCE, SETTLE_BETS
+from .renderer import NULL_RENDERER
+from . import blackjack, player_turn
+from . import constants
+
+
+class Strategy(Protocol):
+    """
+    The decisions a player makes during a round.
+    """
+    def bet(self, player: Player, deck: Deck) -> float:
+        """
+        Gets the bet for the round.
+
+        :param player: The Player
+        :type player: Player
+        :param deck: The Deck, before any cards of the round are dealt.
+        :type deck: Deck
+        :return: The bet.
+        :rtype: float
+        """
+        ...
+
+    def insurance(self, player: Player, bet_value: float) -> float:
+        """
+        Gets the insurance bet when the Dealer shows an Ace.
+
+        :param player: The Player
+        :type player: Player
+        :param bet_value: The bet on the hand, the maximum insurance.
+        :type bet_value: float
+        :return: The insurance bet, 0 for none.
+        :rtype: float
+        """
+        ...
+
+    def action(self, hand: Hand, dealer_upcard: PlayingCard, allowed_actions: set[PossibleActions], deck: Deck) -> PossibleActions:
+        """
+        Picks the next action for a hand.
+
+        :param hand: The hand being played.
+        :type hand: Hand
+        :param dealer_upcard: The Dealer's visible card
+        :type dealer_upcard: PlayingCard
+        :param allowed_actions: The actions allowed on the hand.
+        :type allowed_actions: set[PossibleActions]
+        :param deck: The Deck
+        :type deck: Deck
+        :return: The chosen action, which must be in allowed_actions.
+        :rtype: PossibleActions
+        """
+        ...
+
+
+class MimicDealerStrategy:
+    """
+    Plays like the dealer does. Flat bets the minimum, never takes insurance, hits below 17 and stands otherwise.
+
+    Attributes:
+        bet_value (float): The flat bet placed every round.
+    """
+    def __init__(self, bet_value: float = constants.MINIMUM_BET) -> None:
+        self.bet_value = bet_value
+
+    def bet(self, player: Player, deck: Deck) -> float:
+        return self.bet_value
+
+    def insurance(self, player: Player, bet_value: float) -> float:
+        return 0.0
+
+    def action(self, hand: Hand, dealer_upcard: PlayingCard, allowed_actions: set[PossibleActions], deck: Deck) -> PossibleActions:
+        if hand.get_hand_value() < 17:
+            return PossibleActions.HIT
+        return PossibleActions.STAND
+
+
+@dataclass
+class SimulationReport:
+    """
+    The summary of a batch of simulated rounds.
+
+    Attributes:
+        rounds (int): Rounds played.
+        hands (int): Hands settled, which is more than rounds when hands are split.
+        elapsed_seconds (float): Wall clock time spent playing.
+        player_net (float): The change in the Player's bank balance.
+        results (dict[RoundResults, int]): Number of hands settled with each result.
+    """
+    rounds: int = 0
+    hands: int = 0
+    elapsed_seconds: float = 0.0
+    player_net: float = 0.0
+    results: dict[RoundResults, int] = field(default_factory=lambda: {result: 0 for result in RoundResults})
+
+    @property
+    def rounds_per_second(self) -> float:
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.rounds / self.elapsed_seconds
+
+
+# Why run_to_precision stopped.
+STOP_TARGET = "target"
+STOP_MAX_ROUNDS = "max_rounds"
+STOP_TIME_LIMIT = "time_limit"
+STOP_BROKE = "broke"
+
+DEFAULT_CHUNK_ROUNDS = 10_000
+
+
+@dataclass
+class PrecisionReport(SimulationReport):
+    """
+    The summary of a precision targeted run. The house edge is the Dealer's mean return per unit wagered over the
+    hands of the run, from the outcomes settle_bets records in the Dealer's RoundHistory.
+
+    Attributes:
+        house_edge (float): The estimated house edge.
+        standard_error (float): The standard error of house_edge.
+        z_score (float): The z score used for the confidence interval and relative precision.
+        chunks (int): Chunks of rounds played.
+        stop_reason (str): Why the run stopped, one of the STOP_ constants.
+    """
+    house_edge: float = 0.0
+    standard_error: float = math.inf
+    z_score: float = DEFAULT_Z_SCORE
+    chunks: int = 0
+    stop_reason: str = ""
+
+    @property
+    def confidence_interval(self) -> tuple[float, float]:
+        margin = self.z_score * self.standard_error
+        return self.house_edge - margin, self.house_edge + margin
+
+    @property
+    def relative_precision(self) -> float:
+        """
+        The half width of the confidence interval as a share of the house edge.
+        """
+        if self.house_edge == 0:
+            return math.inf
+        return self.z_score * self.standard_error / abs(self.house_edge)
+
+    @property
+    def target_met(self) -> bool:
+        return self.stop_reason == STOP_TARGET
+
+
+class Simulator:
+    """
+    Runs rounds of blackjack without any console input or output.
+
+    Attributes:
+        strategy (Strategy): Makes the Player's decisions.
+        player (Player): The Player
+        dealer (Dealer): The Dealer
+        deck (Deck): The Deck
+        instruments (Instruments | None): Records phase timings and deck counters for each round, None to record nothing.
+    """
+    def __init__(
+            self,
+            strategy: Strategy,
+            player: Player | None = None,
+            dealer: Dealer | None = None,
+            deck: Deck | None = None,
+            instruments: Instruments | None = None
+    ) -> None:
+        """
+        Simulator constructor
+
+        :param strategy: The strategy making the Player's decisions.
+        :type strategy: Strategy
+        :param player: The Player, a new one by default.
+        :type player: Player | None
+        :param dealer: The Dealer, a new one by default.
+        :type dealer: Dealer | None
+        :param deck: The Deck, a new one by default.
+        :type deck: Deck | None
+        :param instruments: Records phase timings and deck counters for each round. Off by default.
+        :type instruments: Instruments | None
+        """
+        self.strategy = strategy
+        self.player = player if player is not None else Player()
+        self.dealer = dealer if dealer is not None else Dealer()
+        self.deck = deck if deck is not None else Deck()
+        self.instruments = instruments
+
+    def play_round(self) -> list[RoundResults]:
+        """
+        Plays one full round: bet, deal, insurance, player turn, dealer turn and settlement.
+        Checks the deck's health once the round is over.
+
+        :return: The result of each of the Player's hands.
+        :rtype: list[RoundResults]
+        """
+        player = self.player
+        dealer = self.dealer
+        deck = self.deck
+        strategy = self.strategy
+        instruments = self.instruments
+        if instruments is not None:
+            clock = time.perf_counter_ns
+            round_start = last = clock()
+            cards_before = len(deck.cards)
+            reshuffles_before = deck.reshuffle_count
+
+        bet_value = strategy.bet(player, deck)
+        blackjack.start_round(dealer, player, deck, bet_value)
+        if instruments is not None:
+            now = clock()
+            instruments.record_phase(START_ROUND, now - last)
+            last = now
+        insurance: float = 0.0
+        dealer_upcard = dealer.get_visible_card()
+        if dealer_upcard.rank == Rank.ACE:
+            insurance = player_turn.buy_insurance(player, strategy.insurance(player, bet_value))
+        if instruments is not None:
+            now = clock()
+            instruments.record_phase(INSURANCE, now - last)
+            last = now
+        self._play_hands(dealer_upcard)
+        if instruments is not None:
+            now = clock()
+            instruments.record_phase(PLAYER_TURN, now - last)
+            last = now
+        blackjack.process_dealer_turn(dealer, deck, renderer=NULL_RENDERER)
+        if instruments is not None:
+            now = clock()
+            instruments.record_phase(DEALER_TURN, now - last)
+            last = now
+        dealer_blackjack = dealer.hand.has_blackjack
+        blackjack.settle_insurance(dealer, player, insurance, dealer_blackjack)
+        if instruments is not None:
+            now = clock()
+            instruments.record_phase(SETTLE_INSURANCE, now - last)
+            last = now
+        results: list[RoundResults] = []
+        for hand in player.split_hands:
+            result = blackjack.determine_winner(
+                dealer_hand=dealer.hand,
+                player_hand=hand,
+                dealer_blackjack=dealer_blackjack,
+                player_blackjack=hand.has_blackjack)
+            blackjack.settle_hand(dealer, player, hand.bet.balance, result)
+            results.append(result)
+        if instruments is not None:
+            now = clock()
+            instruments.record_phase(SETTLE_BETS, now - last)
+            # A deck emptied mid round is reset, so add a full deck for each reshuffle.
+            reshuffles = deck.reshuffle_count - reshuffles_before
+            cards_drawn = cards_before - len(deck.cards) + reshuffles * deck.deck_count * CARD_COUNT
+            deck.confirm_deck_health()
+            instruments.record_round(clock() - round_start, cards_drawn, deck.reshuffle_count - reshuffles_before)
+        else:
+            deck.confirm_deck_health()
+        return results
+
+    def run(self, rounds: int, stop_when_broke: bool = False) -> SimulationReport:
+        """
+        Plays a number of rounds back to back.
+
+        :param rounds: The number of rounds to play.
+        :type rounds: int
+        :param stop_when_broke: Stop early, like the game does, once either bank reaches zero.
+        :type stop_when_broke: bool
+        :return: The summary of the rounds played.
+        :rtype: SimulationReport
+        """
+        report = SimulationReport()
+        starting_balance = self.player.bank.balance
+        counts = report.results
+        start = time.perf_counter()
+        for _ in range(rounds):
+            if stop_when_broke and (self.player.bank.balance <= 0 or self.dealer.bank.balance <= 0):
+                break
+            for result in self.play_round():
+                counts[result] += 1
+                report.hands += 1
+            report.rounds += 1
+        report.elapsed_seconds = time.perf_counter() - start
+        report.player_net = self.player.bank.balance - starting_balance
+        return report
+
+    def run_to_precision(
+            self,
+            target_standard_error: float | None = None,
+            target_relative_precision: float | None = None,
+            z_score: float = DEFAULT_Z_SCORE,
+            chunk_rounds: int = DEFAULT_CHUNK_ROUNDS,
+            min_rounds: int = DEFAULT_CHUNK_ROUNDS,
+            max_rounds: int | None = None,
+            max_seconds: float | None = None,
+            stop_when_broke: bool = False
+    ) -> PrecisionReport:
+        """
+        Plays rounds in chunks until the house edge is known precisely enough. After each chunk the streaming
+        statistics of the Dealer's RoundHistory are checked against the targets, and the run stops once every target
+        given is met. The round and time limits are checked between chunks too, so a run can go over the time limit
+        by up to one chunk.
+
+        :param target_standard_error: Stop once the standard error of the house edge is at or below this.
+        :type target_standard_error: float | None
+        :param target_relative_precision: Stop once the confidence interval's half width is at or below this share of the house edge, 0.1 is ±10%.
+        :type target_relative_precision: float | None
+        :param z_score: The z score of the confidence interval, 95% by default.
+        :type z_score: float
+        :param chunk_rounds: Rounds played between checks.
+        :type chunk_rounds: int
+        :param min_rounds: Rounds played before the targets are checked, so an early lucky streak cannot stop the run.
+        :type min_rounds: int
+        :param max_rounds: Stop after this many rounds whether or not the targets are met.
+        :type max_rounds: int | None
+        :param max_seconds: Stop after this much wall clock time whether or not the targets are met.
+        :type max_seconds: float | None
+        :param stop_when_broke: Stop early, like the game does, once either bank reaches zero.
+        :type stop_when_broke: bool
+        :return: The summary, with the rounds used, the precision reached and why the run stopped.
+        :rtype: PrecisionReport
+        """
+        if target_standard_error is None and target_relative_precision is None:
+            raise ValueError("Give a target standard error, a target relative precision, or both.")
+        if chunk_rounds <= 0:
+            raise ValueError("chunk_rounds must be positive.")
+        report = PrecisionReport(z_score=z_score)
+        counts = report.results
+        history = self.dealer.history
+        # Collect this run's hands on their own, and add them to the Dealer's full statistics when done.
+        previous_stats = history.stats
+        stats = history.stats = RoundStatistics()
+        start = time.perf_counter()
+        try:
+            while True:
+                chunk = chunk_rounds if max_rounds is None else min(chunk_rounds, max_rounds - report.rounds)
+                if chunk <= 0:
+                    report.stop_reason = STOP_MAX_ROUNDS
+                    break
+                chunk_report = self.run(chunk, stop_when_broke)
+                report.chunks += 1
+                report.rounds += chunk_report.rounds
+                report.hands += chunk_report.hands
+                report.player_net += chunk_report.player_net
+                for result, count in chunk_report.results.items():
+                    counts[result] += count
+                report.house_edge = stats.mean_return
+                report.standard_error = stats.standard_error
+                if chunk_report.rounds < chunk:
+                    report.stop_reason = STOP_BROKE
+                    break
+                if report.rounds >= min_rounds and (
+                        (target_standard_error is None or report.standard_error <= target_standard_error) and
+                        (target_relative_precision is None or report.relative_precision <= target_relative_precision)):
+                    report.stop_reason = STOP_TARGET
+                    break
+                if max_seconds is not None and time.perf_counter() - start >= max_seconds:
+                    report.stop_reason = STOP_TIME_LIMIT
+                    break
+        finally:
+            previous_stats.merge(stats)
+            history.stats = previous_stats
+            report.elapsed_seconds = time.perf_counter() - start
+        return report
+
+    def _play_hands(self, dealer_upcard: PlayingCard) -> None:
+        """
+        Plays every one of the Player's hands, including any created by splitting.
+
+        :param dealer_upcard: The Dealer's visible card
+        :type dealer_upcard: PlayingCard
+        """
+        play_hands(self.player, self.deck, self.strategy, dealer_upcard)
+
+
+def play_hands(player: Player, deck: Deck, strategy: Strategy, dealer_upcard: PlayingCard) -> None:
+    """
+    Plays every one of a player's hands with a strategy, including any created by splitting.
+
+    :param player: The Player
+    :type player: Player
+    :param deck: The Deck
+    :type deck: Deck
+    :param strategy: Makes the Player's decisions.
+    :type strategy: Strategy
+    :param dealer_upcard: The Dealer's visible card
+    :type dealer_upcard: PlayingCard
+    """
+    while player.current_hand_index < len(player.split_hands):
+        while not player.hand.has_stood:
+            allowed_actions = player_turn.get_allowed_actions(player, deck)
+            choice = strategy.action(player.hand, dealer_upcard, allowed_actions, deck)
+            player_turn.apply_action(player, deck, choice, renderer=NULL_RENDERER)
+        if not player.next_hand():
+            break
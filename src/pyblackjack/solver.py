@@ -0,0 +1,370 @@
+"""
+An exact basic strategy solver.
+
+Expected values are worked out by recursing over the composition of the remaining cards, stored as a tuple of counts
+for each card value (index 0 is Ace, index 9 is the ten-valued cards), and every sub-result is memoized on that
+multiset. Dealer outcomes come from the cache in dealer_probabilities. The rules are the ones the game plays by:
+- The dealer draws below 17 and stands on 17, drawing to a soft 17 when blackjack.DEALER_HITS_SOFT_17 is set, see
+  blackjack.process_dealer_turn and DealerProbabilities.hits_soft_17. There is no peek, so a dealer
+  blackjack takes every bet on the table, doubles and splits included, unless the player also has one.
+- If both the player and the dealer bust, the hand is a push, see blackjack.determine_winner.
+- The player may double on any two cards, after splitting too, and split any pair, see player_turn.get_allowed_actions.
+
+Split hands are valued as two independent hands each starting with one of the pair and a fresh card, and resplits
+are not counted. Doubles and splits are valued with their full stake at risk to a dealer blackjack.
+
+Run as a module to write the strategy chart as JSON:
+    python -m pyblackjack.solver --decks 6 --output chart.json
+"""
+
+import argparse
+import json
+from .blackjack import PossibleActions
+from .playing_card import CARD_VALUES
+from .dealer_probabilities import DealerProbabilities, Composition, DEALER_STANDS_ON, BUST, BLACKJACK
+
+StrategyChart = dict[str, dict[int, dict[int, str]]]
+
+# Enough room for every dealer distribution and draw state of a six deck solve.
+SOLVER_CACHE_SIZE = 500_000
+SOLVER_MAX_DRAW_STATES = 5_000_000
+
+HARD_TOTALS = range(4, 22)
+SOFT_TOTALS = range(12, 22)
+UPCARDS = range(1, 11)
+
+
+def full_composition(deck_count: int = 1) -> Composition:
+    """
+    Gets the card value counts of a full shoe.
+
+    :param deck_count: The number of decks in the shoe.
+    :type deck_count: int
+    :return: The count of each card value, Ace first.
+    :rtype: Composition
+    """
+    counts = [0] * 10
+    for value in CARD_VALUES:
+        counts[value - 1] += deck_count
+    return tuple(counts)
+
+
+def remove_card(composition: Composition, value: int) -> Composition:
+    """
+    Takes one card of a value out of a composition.
+
+    :param composition: The card value counts.
+    :type composition: Composition
+    :param value: The card value, 1 - 10.
+    :type value: int
+    :return: The new composition.
+    :rtype: Composition
+    """
+    index = value - 1
+    if composition[index] <= 0:
+        raise ValueError(f"No cards of value {value} left to remove.")
+    return composition[:index] + (composition[index] - 1,) + composition[index + 1:]
+
+
+def _hand_total(hard: int, has_ace: bool) -> int:
+    if has_ace and hard <= 11:
+        return hard + 10
+    return hard
+
+
+def _format_double(hit_ev: float, stand_ev: float) -> str:
+    fallback = PossibleActions.HIT if hit_ev >= stand_ev else PossibleActions.STAND
+    return f"{PossibleActions.DOUBLE.value}/{fallback.value}"
+
+
+class BasicStrategySolver:
+    """
+    Works out exact expected values for every decision, and the strategy chart that follows from them.
+
+    Attributes:
+        deck_count (int): The number of decks in the shoe.
+        composition (Composition): The card value counts of the full shoe.
+        dealer_probabilities (DealerProbabilities): The dealer outcome cache, which also holds the soft 17 rule.
+    """
+    def __init__(
+            self,
+            deck_count: int = 1,
+            dealer_probabilities: DealerProbabilities | None = None,
+            dealer_hits_soft_17: bool | None = None
+    ) -> None:
+        """
+        BasicStrategySolver constructor
+
+        :param deck_count: The number of decks in the shoe.
+        :type deck_count: int
+        :param dealer_probabilities: The dealer outcome cache to use, a new one sized for a full solve by default.
+        :type dealer_probabilities: DealerProbabilities | None
+        :param dealer_hits_soft_17: Whether the dealer draws to a soft 17, blackjack.DEALER_HITS_SOFT_17 by default.
+            Must match the rule of dealer_probabilities when both are given.
+        :type dealer_hits_soft_17: bool | None
+        """
+        self.deck_count = deck_count
+        self.composition = full_composition(deck_count)
+        if dealer_probabilities is None:
+            dealer_probabilities = DealerProbabilities(
+                maxsize=SOLVER_CACHE_SIZE, max_draw_states=SOLVER_MAX_DRAW_STATES, hits_soft_17=dealer_hits_soft_17)
+        elif dealer_hits_soft_17 is not None and dealer_hits_soft_17 != dealer_probabilities.hits_soft_17:
+            raise ValueError("dealer_hits_soft_17 does not match the rule of dealer_probabilities.")
+        self.dealer_probabilities = dealer_probabilities
+        self._hit_cache: dict[tuple, float] = {}
+        self._split_hand_cache: dict[tuple, float] = {}
+
+    def stand_ev(self, total: int, upcard: int, composition: Composition) -> float:
+        """
+        Gets the expected value of standing, per unit bet.
+
+        :param total: The player's hand total. Over 21 is a bust.
+        :type total: int
+        :param upcard: The dealer's upcard value.
+        :type upcard: int
+        :param composition: The remaining cards.
+        :type composition: Composition
+        :return: The expected value.
+        :rtype: float
+        """
+        dealer = self.dealer_probabilities.lookup(upcard, composition)
+        if total > 21:
+            # A bust only pushes when the dealer busts too.
+            return -(1.0 - dealer[BUST])
+        ev = dealer[BUST] - dealer[BLACKJACK]
+        for result in range(BUST):
+            dealer_total = DEALER_STANDS_ON + result
+            if total > dealer_total:
+                ev += dealer[result]
+            elif total < dealer_total:
+                ev -= dealer[result]
+        return ev
+
+    def hit_ev(self, hard: int, has_ace: bool, upcard: int, composition: Composition) -> float:
+        """
+        Gets the expected value of hitting, then playing on with the best of hit and stand.
+
+        :param hard: The player's hard total, Aces counted as 1.
+        :type hard: int
+        :param has_ace: Whether the player holds an Ace.
+        :type has_ace: bool
+        :param upcard: The dealer's upcard value.
+        :type upcard: int
+        :param composition: The remaining cards.
+        :type composition: Composition
+        :return: The expected value.
+        :rtype: float
+        """
+        key = (hard, has_ace, upcard, composition)
+        cached = self._hit_cache.get(key)
+        if cached is not None:
+            return cached
+        remaining = sum(composition)
+        ev = 0.0
+        for index, count in enumerate(composition):
+            if count == 0:
+                continue
+            value = index + 1
+            new_hard = hard + value
+            new_has_ace = has_ace or value == 1
+            new_composition = remove_card(composition, value)
+            new_total = _hand_total(new_hard, new_has_ace)
+            best = self.stand_ev(new_total, upcard, new_composition)
+            if new_total < 21:
+                best = max(best, self.hit_ev(new_hard, new_has_ace, upcard, new_composition))
+            ev += count / remaining * best
+        self._hit_cache[key] = ev
+        return ev
+
+    def double_ev(self, hard: int, has_ace: bool, upcard: int, composition: Composition) -> float:
+        """
+        Gets the expected value of doubling, per unit of the original bet.
+
+        :param hard: The player's hard total, Aces counted as 1.
+        :type hard: int
+        :param has_ace: Whether the player holds an Ace.
+        :type has_ace: bool
+        :param upcard: The dealer's upcard value.
+        :type upcard: int
+        :param composition: The remaining cards.
+        :type composition: Composition
+        :return: The expected value.
+        :rtype: float
+        """
+        remaining = sum(composition)
+        ev = 0.0
+        for index, count in enumerate(composition):
+            if count == 0:
+                continue
+            value = index + 1
+            new_total = _hand_total(hard + value, has_ace or value == 1)
+            ev += count / remaining * self.stand_ev(new_total, upcard, remove_card(composition, value))
+        return 2 * ev
+
+    def split_ev(self, pair_value: int, upcard: int, composition: Composition) -> float:
+        """
+        Gets the expected value of splitting a pair, per unit of the original bet.
+
+        :param pair_value: The value of each card of the pair.
+        :type pair_value: int
+        :param upcard: The dealer's upcard value.
+        :type upcard: int
+        :param composition: The remaining cards, both cards of the pair already removed.
+        :type composition: Composition
+        :return: The expected value.
+        :rtype: float
+        """
+        key = (pair_value, upcard, composition)
+        cached = self._split_hand_cache.get(key)
+        if cached is not None:
+            return cached
+        remaining = sum(composition)
+        hand_ev = 0.0
+        for index, count in enumerate(composition):
+            if count == 0:
+                continue
+            value = index + 1
+            hard = pair_value + value
+            has_ace = pair_value == 1 or value == 1
+            new_composition = remove_card(composition, value)
+            best = max(
+                self.stand_ev(_hand_total(hard, has_ace), upcard, new_composition),
+                self.hit_ev(hard, has_ace, upcard, new_composition),
+                self.double_ev(hard, has_ace, upcard, new_composition))
+            hand_ev += count / remaining * best
+        result = 2 * hand_ev
+        self._split_hand_cache[key] = result
+        return result
+
+    def starting_hand_evs(self, first: int, second: int, upcard: int) -> dict[PossibleActions, float]:
+        """
+        Gets the expected value of every action on a two card starting hand.
+
+        :param first: The value of the first card.
+        :type first: int
+        :param second: The value of the second card.
+        :type second: int
+        :param upcard: The dealer's upcard value.
+        :type upcard: int
+        :return: The expected value of each allowed action.
+        :rtype: dict[PossibleActions, float]
+        """
+        composition = remove_card(remove_card(remove_card(self.composition, upcard), first), second)
+        hard = first + second
+        has_ace = first == 1 or second == 1
+        evs = {
+            PossibleActions.STAND: self.stand_ev(_hand_total(hard, has_ace), upcard, composition),
+            PossibleActions.HIT: self.hit_ev(hard, has_ace, upcard, composition),
+            PossibleActions.DOUBLE: self.double_ev(hard, has_ace, upcard, composition),
+        }
+        if first == second:
+            evs[PossibleActions.SPLIT] = self.split_ev(first, upcard, composition)
+        return evs
+
+    def _starting_hand_weight(self, first: int, second: int, upcard: int) -> float:
+        composition = remove_card(self.composition, upcard)
+        weight = composition[first - 1] * (composition[second - 1] - (first == second))
+        if first != second:
+            weight *= 2
+        return float(weight)
+
+    def solve(self) -> StrategyChart:
+        """
+        Builds the complete strategy chart.
+
+        Hard and soft rows take the expected values of every two card hand with that total, weighted by how likely
+        each hand is, so multi-card hands of the same total play the same way. Pair rows use the pair's own values.
+        Each cell is an action value from PossibleActions, and doubles carry the action to fall back on when doubling
+        is not allowed, for example "double/hit".
+
+        :return: The strategy chart, keyed by row kind ("hard", "soft", "pair"), then total or pair value, then upcard value.
+        :rtype: StrategyChart
+        """
+        chart: StrategyChart = {"hard": {}, "soft": {}, "pair": {}}
+        for upcard in UPCARDS:
+            sums: dict[tuple[str, int], dict[PossibleActions, float]] = {}
+            for first in range(1, 11):
+                for second in range(first, 11):
+                    weight = self._starting_hand_weight(first, second, upcard)
+                    if weight == 0:
+                        continue
+                    evs = self.starting_hand_evs(first, second, upcard)
+                    has_ace = first == 1 or second == 1
+                    kind = "soft" if has_ace else "hard"
+                    total = _hand_total(first + second, has_ace)
+                    row = sums.setdefault((kind, total), {action: 0.0 for action in (PossibleActions.STAND, PossibleActions.HIT, PossibleActions.DOUBLE)})
+                    for action in row:
+                        row[action] += weight * evs[action]
+                    if first == second:
+                        chart["pair"].setdefault(first, {})[upcard] = self._best_cell(evs)
+            for total in HARD_TOTALS:
+                chart["hard"].setdefault(total, {})[upcard] = self._best_cell(sums.get(("hard", total)))
+            for total in SOFT_TOTALS:
+                chart["soft"].setdefault(total, {})[upcard] = self._best_cell(sums.get(("soft", total)))
+        return chart
+
+    def clear_caches(self) -> None:
+        """
+        Empties the memoized results.
+        """
+        self.dealer_probabilities.clear()
+        self._hit_cache.clear()
+        self._split_hand_cache.clear()
+
+    @staticmethod
+    def _best_cell(evs: dict[PossibleActions, float] | None) -> str:
+        """
+        Picks the chart cell for a set of expected values. Totals with no two card hand, hard 21, always stand.
+        """
+        if evs is None:
+            return PossibleActions.STAND.value
+        best = max(evs, key=lambda action: evs[action])
+        if best == PossibleActions.DOUBLE:
+            return _format_double(evs[PossibleActions.HIT], evs[PossibleActions.STAND])
+        return best.value
+
+
+def solve_basic_strategy(deck_count: int = 1, dealer_hits_soft_17: bool | None = None) -> StrategyChart:
+    """
+    Builds the basic strategy chart for a shoe.
+
+    :param deck_count: The number of decks in the shoe.
+    :type deck_count: int
+    :param dealer_hits_soft_17: Whether the dealer draws to a soft 17, blackjack.DEALER_HITS_SOFT_17 by default.
+    :type dealer_hits_soft_17: bool | None
+    :return: The strategy chart.
+    :rtype: StrategyChart
+    """
+    return BasicStrategySolver(deck_count, dealer_hits_soft_17=dealer_hits_soft_17).solve()
+
+
+def chart_to_json(chart: StrategyChart) -> str:
+    """
+    Converts a strategy chart to JSON. Totals and upcards become string keys.
+
+    :param chart: The strategy chart.
+    :type chart: StrategyChart
+    :return: The JSON text.
+    :rtype: str
+    """
+    return json.dumps({
+        kind: {str(total): {str(upcard): cell for upcard, cell in row.items()} for total, row in rows.items()}
+        for kind, rows in chart.items()}, indent=2)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Solve basic strategy for the game's rules.")
+    parser.add_argument("--decks", type=int, default=1, help="Decks in the shoe.")
+    parser.add_argument("--output", help="File to write the chart to, printed when not given.")
+    parser.add_argument("--hits-soft-17", action="store_true", help="The dealer draws to a soft 17.")
+    args = parser.parse_args()
+    chart_json = chart_to_json(solve_basic_strategy(args.decks, args.hits_soft_17 or None))
+    if args.output:
+        with open(args.output, "w") as chart_file:
+            chart_file.write(chart_json)
+    else:
+        print(chart_json)
+
+
+if __name__ == "__main__":
+    main()
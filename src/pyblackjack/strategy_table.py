@@ -0,0 +1,275 @@
+"""
+Strategy charts compiled into flat lookup tables for automated play.
+
+A chart is the format written by the solver: a cell for every hard total (4 - 21), soft total (12 - 21) and pair
+value (1 - 10, Ace is 1) against every dealer upcard value. Cells are "hit", "stand", "split", "double/hit" or
+"double/stand", where a double names the action to fall back on when doubling is not allowed. Split cells only
+appear in pair rows, and a pair that cannot be split is played by its hard or soft total row instead.
+
+Compiling resolves every fallback ahead of time, so a decision is one index into a bytes object:
+    ((row + total) * UPCARD_COUNT + upcard - 1) * 2 + can_double
+where row is HARD_ROW, SOFT_ROW or PAIR_ROW. The pair rows are only used when splitting is allowed.
+
+Charts load from the solver's JSON or from CSV with a header of "kind,total,1,2,...,10":
+    kind,total,1,2,3,4,5,6,7,8,9,10
+    hard,16,hit,stand,stand,stand,stand,stand,hit,hit,hit,hit
+"""
+
+import csv
+import io
+import json
+from pathlib import Path
+from .blackjack import PossibleActions
+from .deck import Deck
+from .hand import Hand
+from .player import Player
+from .playing_card import PlayingCard
+from .solver import StrategyChart, HARD_TOTALS, SOFT_TOTALS, UPCARDS
+from . import constants
+
+PAIR_VALUES = range(1, 11)
+UPCARD_COUNT = len(UPCARDS)
+
+# Row offsets. A hand's row is its offset plus its total, or its pair value for pairs.
+HARD_ROW = 0
+SOFT_ROW = 22
+PAIR_ROW = 43
+ROW_COUNT = PAIR_ROW + PAIR_VALUES[-1] + 1
+
+# Action codes stored in the compiled table.
+ACTIONS: tuple[PossibleActions, ...] = (PossibleActions.HIT, PossibleActions.STAND, PossibleActions.DOUBLE, PossibleActions.SPLIT)
+_ACTION_CODES = {action: code for code, action in enumerate(ACTIONS)}
+
+# The kinds of row in a chart and the totals or pair values each one must cover.
+CHART_ROWS: dict[str, range] = {"hard": HARD_TOTALS, "soft": SOFT_TOTALS, "pair": PAIR_VALUES}
+_ROW_OFFSETS = {"hard": HARD_ROW, "soft": SOFT_ROW, "pair": PAIR_ROW}
+
+
+def parse_cell(cell: str) -> tuple[PossibleActions, PossibleActions]:
+    """
+    Reads a chart cell.
+
+    :param cell: The cell, for example "stand" or "double/hit".
+    :type cell: str
+    :return: The action to take, and the action to take instead when doubling is not allowed.
+    :rtype: tuple[PossibleActions, PossibleActions]
+    """
+    parts = cell.strip().lower().split("/")
+    try:
+        actions = [PossibleActions(part.strip()) for part in parts]
+    except ValueError:
+        raise ValueError(f"Unknown action in chart cell {cell!r}.") from None
+    match actions:
+        case [PossibleActions.DOUBLE, PossibleActions.HIT | PossibleActions.STAND as fallback]:
+            return PossibleActions.DOUBLE, fallback
+        case [PossibleActions.DOUBLE]:
+            raise ValueError(f"Chart cell {cell!r} needs an action to fall back on, like \"double/hit\".")
+        case [PossibleActions.HIT | PossibleActions.STAND | PossibleActions.SPLIT as action]:
+            return action, action
+    raise ValueError(f"Chart cell {cell!r} is not one of hit, stand, split, double/hit or double/stand.")
+
+
+def validate_chart(chart: StrategyChart) -> None:
+    """
+    Checks that a chart has a valid cell for every hand and upcard, and raises a ValueError listing any that are
+    missing or invalid.
+
+    :param chart: The strategy chart.
+    :type chart: StrategyChart
+    """
+    problems: list[str] = []
+    for kind, totals in CHART_ROWS.items():
+        rows = chart.get(kind, {})
+        for total in totals:
+            row = rows.get(total, {})
+            for upcard in UPCARDS:
+                if upcard not in row:
+                    problems.append(f"{kind} {total} vs {upcard}: missing")
+                    continue
+                try:
+                    action, _ = parse_cell(row[upcard])
+                except ValueError as error:
+                    problems.append(f"{kind} {total} vs {upcard}: {error}")
+                    continue
+                if action == PossibleActions.SPLIT and kind != "pair":
+                    problems.append(f"{kind} {total} vs {upcard}: only pairs can split")
+    if problems:
+        raise ValueError(f"Strategy chart has {len(problems)} bad cells: " + "; ".join(problems))
+
+
+def chart_from_json(text: str) -> StrategyChart:
+    """
+    Reads a chart from JSON, as written by solver.chart_to_json.
+
+    :param text: The JSON text.
+    :type text: str
+    :return: The strategy chart.
+    :rtype: StrategyChart
+    """
+    raw = json.loads(text)
+    return {
+        kind: {int(total): {int(upcard): cell for upcard, cell in row.items()} for total, row in rows.items()}
+        for kind, rows in raw.items()}
+
+
+def chart_from_csv(text: str) -> StrategyChart:
+    """
+    Reads a chart from CSV. The header is "kind,total" followed by the upcard values, and each row holds the cells
+    of one hard total, soft total or pair value.
+
+    :param text: The CSV text.
+    :type text: str
+    :return: The strategy chart.
+    :rtype: StrategyChart
+    """
+    reader = csv.reader(io.StringIO(text))
+    header = next(reader, None)
+    if header is None or [name.strip().lower() for name in header[:2]] != ["kind", "total"]:
+        raise ValueError("Strategy chart CSV must start with a header of kind,total and the upcard values.")
+    upcards = [int(name) for name in header[2:]]
+    chart: StrategyChart = {kind: {} for kind in CHART_ROWS}
+    for line_number, row in enumerate(reader, start=2):
+        if not row or not "".join(row).strip():
+            continue
+        if len(row) != len(header):
+            raise ValueError(f"Strategy chart CSV line {line_number} has {len(row)} fields, expected {len(header)}.")
+        kind = row[0].strip().lower()
+        if kind not in chart:
+            raise ValueError(f"Strategy chart CSV line {line_number} has unknown kind {row[0]!r}.")
+        chart[kind][int(row[1])] = {upcard: cell.strip() for upcard, cell in zip(upcards, row[2:])}
+    return chart
+
+
+def chart_to_csv(chart: StrategyChart) -> str:
+    """
+    Converts a strategy chart to CSV.
+
+    :param chart: The strategy chart.
+    :type chart: StrategyChart
+    :return: The CSV text.
+    :rtype: str
+    """
+    output = io.StringIO()
+    writer = csv.writer(output, lineterminator="\n")
+    writer.writerow(["kind", "total", *UPCARDS])
+    for kind in CHART_ROWS:
+        for total, row in sorted(chart.get(kind, {}).items()):
+            writer.writerow([kind, total, *(row.get(upcard, "") for upcard in UPCARDS)])
+    return output.getvalue()
+
+
+def _table_index(row: int, upcard: int, can_double: bool) -> int:
+    return (row * UPCARD_COUNT + upcard - 1) * 2 + can_double
+
+
+class StrategyTable:
+    """
+    A strategy chart compiled into a flat table of action codes, answering each decision with one index.
+
+    Attributes:
+        chart (StrategyChart): The chart the table was compiled from.
+    """
+    def __init__(self, chart: StrategyChart) -> None:
+        """
+        StrategyTable constructor. Validates the chart and compiles it.
+
+        :param chart: The strategy chart, covering every hard total, soft total and pair.
+        :type chart: StrategyChart
+        """
+        validate_chart(chart)
+        self.chart = chart
+        codes = bytearray(ROW_COUNT * UPCARD_COUNT * 2)
+        for kind, totals in CHART_ROWS.items():
+            for total in totals:
+                for upcard in UPCARDS:
+                    action, fallback = parse_cell(chart[kind][total][upcard])
+                    row = _ROW_OFFSETS[kind] + total
+                    codes[_table_index(row, upcard, True)] = _ACTION_CODES[action]
+                    codes[_table_index(row, upcard, False)] = _ACTION_CODES[fallback]
+        self._codes = bytes(codes)
+
+    @classmethod
+    def from_json(cls, text: str) -> "StrategyTable":
+        return cls(chart_from_json(text))
+
+    @classmethod
+    def from_csv(cls, text: str) -> "StrategyTable":
+        return cls(chart_from_csv(text))
+
+    @classmethod
+    def load(cls, path: str | Path) -> "StrategyTable":
+        """
+        Loads a chart file, read as CSV when the name ends in .csv and as JSON otherwise.
+
+        :param path: The chart file.
+        :type path: str | Path
+        :return: The compiled table.
+        :rtype: StrategyTable
+        """
+        path = Path(path)
+        text = path.read_text()
+        if path.suffix.lower() == ".csv":
+            return cls.from_csv(text)
+        return cls.from_json(text)
+
+    def lookup(self, kind: str, total: int, upcard: int, can_double: bool = True) -> PossibleActions:
+        """
+        Gets the action for a chart row, with the double fallback applied.
+
+        :param kind: The row kind, "hard", "soft" or "pair".
+        :type kind: str
+        :param total: The hand total, or the value of each card for a pair.
+        :type total: int
+        :param upcard: The dealer's upcard value, 1 - 10.
+        :type upcard: int
+        :param can_double: Whether doubling is allowed.
+        :type can_double: bool
+        :return: The action.
+        :rtype: PossibleActions
+        """
+        return ACTIONS[self._codes[_table_index(_ROW_OFFSETS[kind] + total, upcard, can_double)]]
+
+    def decide(self, hand: Hand, dealer_upcard: PlayingCard, allowed_actions: set[PossibleActions]) -> PossibleActions:
+        """
+        Gets the action for a hand. The answer is always in allowed_actions: doubles fall back to the chart's
+        hit or stand, and pairs that cannot be split are played by their total.
+
+        :param hand: The hand being played. Must not be busted.
+        :type hand: Hand
+        :param dealer_upcard: The Dealer's visible card
+        :type dealer_upcard: PlayingCard
+        :param allowed_actions: The actions allowed on the hand, from player_turn.get_allowed_actions.
+        :type allowed_actions: set[PossibleActions]
+        :return: The action.
+        :rtype: PossibleActions
+        """
+        # Split is only allowed on two cards of the same rank, so it doubles as the pair check.
+        if PossibleActions.SPLIT in allowed_actions:
+            row = PAIR_ROW + hand.cards[0].value
+        elif hand.is_soft:
+            row = SOFT_ROW + hand.hand_value
+        else:
+            row = HARD_ROW + hand.hand_value
+        return ACTIONS[self._codes[(row * UPCARD_COUNT + dealer_upcard.value - 1) * 2 + (PossibleActions.DOUBLE in allowed_actions)]]
+
+
+class TableStrategy:
+    """
+    Plays a StrategyTable. Flat bets, never takes insurance, and makes every hand decision from the table.
+
+    Attributes:
+        table (StrategyTable): The compiled strategy.
+        bet_value (float): The flat bet placed every round.
+    """
+    def __init__(self, table: StrategyTable, bet_value: float = constants.MINIMUM_BET) -> None:
+        self.table = table
+        self.bet_value = bet_value
+
+    def bet(self, player: Player, deck: Deck) -> float:
+        return self.bet_value
+
+    def insurance(self, player: Player, bet_value: float) -> float:
+        return 0.0
+
+    def action(self, hand: Hand, dealer_upcard: PlayingCard, allowed_actions: set[PossibleActions], deck: Deck) -> PossibleActions:
+        return self.table.decide(hand, dealer_upcard, allowed_actions)
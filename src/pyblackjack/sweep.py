@@ -0,0 +1,394 @@
+"""
+Rule and parameter sweeps over a process pool, with an on-disk result cache.
+
+A sweep is a list of points, each one a set of Rules, a strategy, a seed and a number of rounds. Every point is
+played in a worker process with its rules applied, and its result is written to the cache as soon as it finishes,
+under a hash of the point. Running a sweep looks every point up in the cache first and only plays the missing ones,
+so adding points to a sweep only computes the new ones, and a sweep that was interrupted carries on where it stopped.
+
+Strategies are named so that they can be hashed and sent to workers:
+    mimic           MimicDealerStrategy, betting the minimum.
+    chart:<path>    TableStrategy on a CSV or JSON chart file, betting the minimum. The file's contents are part of
+                    the hash, so editing the chart invalidates its results.
+
+Run as a module to sweep a grid:
+    python -m pyblackjack.sweep --set deck_count=1,2,6 --set blackjack_payout=1.5,1.2 --rounds 100000 --workers 4
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from typing import Any, Callable, Iterable, Mapping, get_type_hints
+from .round_results import RoundResults
+from .rules import Rules
+from .simulator import MimicDealerStrategy, Simulator, Strategy
+from .strategy_table import StrategyTable, TableStrategy
+
+DEFAULT_CACHE_DIR = ".sweep_cache"
+# Part of every cache key. Bump it when an engine change alters the results of an existing point.
+CACHE_VERSION = 2
+CHART_PREFIX = "chart:"
+
+
+def build_strategy(name: str, rules: Rules) -> Strategy:
+    """
+    Builds a named strategy for a set of rules.
+
+    :param name: "mimic", or "chart:" followed by the path of a chart file.
+    :type name: str
+    :param rules: The rules, for the minimum bet.
+    :type rules: Rules
+    :return: The strategy.
+    :rtype: Strategy
+    """
+    if name == "mimic":
+        return MimicDealerStrategy(rules.minimum_bet)
+    if name.startswith(CHART_PREFIX):
+        return TableStrategy(StrategyTable.load(name[len(CHART_PREFIX):]), rules.minimum_bet)
+    raise ValueError(f"Unknown strategy {name!r}, expected mimic or chart:<path>.")
+
+
+def _strategy_digest(name: str) -> str:
+    if name.startswith(CHART_PREFIX):
+        return hashlib.sha256(Path(name[len(CHART_PREFIX):]).read_bytes()).hexdigest()
+    return ""
+
+
+@dataclass(frozen=True)
+class SweepPoint:
+    """
+    One run of a sweep.
+
+    Attributes:
+        rules (Rules): The house rules.
+        strategy (str): The strategy name, see build_strategy.
+        seed (int): Seeds the shoe.
+        rounds (int): Rounds to play.
+    """
+    rules: Rules
+    strategy: str
+    seed: int
+    rounds: int
+
+    def key(self) -> str:
+        """
+        Gets the cache key of the point, a hash of everything that decides its result.
+
+        :return: The key, as hex.
+        :rtype: str
+        """
+        identity = {
+            "version": CACHE_VERSION,
+            "rules": self.rules.to_dict(),
+            "strategy": self.strategy,
+            "strategy_digest": _strategy_digest(self.strategy),
+            "seed": self.seed,
+            "rounds": self.rounds}
+        return hashlib.sha256(json.dumps(identity, sort_keys=True).encode()).hexdigest()
+
+    def to_dict(self) -> dict:
+        return {"rules": self.rules.to_dict(), "strategy": self.strategy, "seed": self.seed, "rounds": self.rounds}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SweepPoint":
+        return cls(Rules.from_dict(data["rules"]), data["strategy"], data["seed"], data["rounds"])
+
+
+@dataclass
+class PointResult:
+    """
+    The outcome of one sweep point.
+
+    Attributes:
+        point (SweepPoint): The point played.
+        hands (int): Hands settled.
+        player_net (float): The change in the Player's bank balance.
+        total_wagered (float): The amount staked over every hand, doubles and splits included.
+        house_edge (float): The Dealer's mean return per hand, per unit of the hand's bet.
+        standard_error (float): The standard error of house_edge.
+        results (dict[RoundResults, int]): Number of hands settled with each result.
+        elapsed_seconds (float): Wall clock time spent playing.
+        cached (bool): Whether the result was read from the cache instead of played. Not stored.
+    """
+    point: SweepPoint
+    hands: int = 0
+    player_net: float = 0.0
+    total_wagered: float = 0.0
+    house_edge: float = 0.0
+    standard_error: float = 0.0
+    results: dict[RoundResults, int] = field(default_factory=lambda: {result: 0 for result in RoundResults})
+    elapsed_seconds: float = 0.0
+    cached: bool = False
+
+    def to_dict(self) -> dict:
+        return {
+            "point": self.point.to_dict(),
+            "hands": self.hands,
+            "player_net": self.player_net,
+            "total_wagered": self.total_wagered,
+            "house_edge": self.house_edge,
+            "standard_error": self.standard_error,
+            "results": {result.name: count for result, count in self.results.items()},
+            "elapsed_seconds": self.elapsed_seconds}
+
+    @classmethod
+    def from_dict(cls, data: dict, cached: bool = False) -> "PointResult":
+        return cls(
+            point=SweepPoint.from_dict(data["point"]),
+            hands=data["hands"],
+            player_net=data["player_net"],
+            total_wagered=data["total_wagered"],
+            house_edge=data["house_edge"],
+            standard_error=data["standard_error"],
+            results={RoundResults[name]: count for name, count in data["results"].items()},
+            elapsed_seconds=data["elapsed_seconds"],
+            cached=cached)
+
+
+class ResultCache:
+    """
+    Point results stored as one JSON file per cache key.
+    Files are written to a temporary name and then renamed, so an interrupted write never leaves a partial result.
+
+    Attributes:
+        directory (Path): Where the result files are kept.
+    """
+    def __init__(self, directory: str | Path = DEFAULT_CACHE_DIR) -> None:
+        self.directory = Path(directory)
+
+    def path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> PointResult | None:
+        """
+        Reads a result.
+
+        :param key: The point's cache key.
+        :type key: str
+        :return: The result, None if it is not cached or the file cannot be read.
+        :rtype: PointResult | None
+        """
+        try:
+            with open(self.path(key)) as result_file:
+                return PointResult.from_dict(json.load(result_file), cached=True)
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def put(self, key: str, result: PointResult) -> None:
+        """
+        Writes a result.
+
+        :param key: The point's cache key.
+        :type key: str
+        :param result: The result.
+        :type result: PointResult
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        handle, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "w") as result_file:
+                json.dump(result.to_dict(), result_file)
+            os.replace(temp_path, self.path(key))
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+
+def run_point(point: SweepPoint) -> PointResult:
+    """
+    Plays one point in this process, with its rules applied for the length of the run.
+
+    :param point: The point.
+    :type point: SweepPoint
+    :return: The result.
+    :rtype: PointResult
+    """
+    rules = point.rules
+    with rules.applied():
+        simulator = Simulator(build_strategy(point.strategy, rules), deck=rules.new_deck(random.Random(point.seed)))
+        simulator.player.history.keep_records = False
+        simulator.dealer.history.keep_records = False
+        report = simulator.run(point.rounds)
+    stats = simulator.player.history.stats
+    return PointResult(
+        point=point,
+        hands=report.hands,
+        player_net=report.player_net,
+        total_wagered=stats.total_wagered,
+        house_edge=-stats.mean_return,
+        standard_error=stats.standard_error,
+        results=report.results,
+        elapsed_seconds=report.elapsed_seconds)
+
+
+def grid_points(
+        axes: Mapping[str, Iterable[Any]],
+        rounds: int,
+        base: Rules = Rules(),
+        strategies: Iterable[str] = ("mimic",),
+        seeds: Iterable[int] = (0,)
+) -> list[SweepPoint]:
+    """
+    Builds a point for every combination of rule values, strategies and seeds.
+
+    :param axes: Values to sweep for each rule, by Rules attribute name.
+    :type axes: Mapping[str, Iterable[Any]]
+    :param rounds: Rounds per point.
+    :type rounds: int
+    :param base: The rules that are not swept.
+    :type base: Rules
+    :param strategies: Strategy names.
+    :type strategies: Iterable[str]
+    :param seeds: Seeds.
+    :type seeds: Iterable[int]
+    :return: The points, the last axis varying fastest.
+    :rtype: list[SweepPoint]
+    """
+    base_rules = base.to_dict()
+    unknown = set(axes) - set(base_rules)
+    if unknown:
+        raise ValueError(f"Unknown rules: {', '.join(sorted(unknown))}")
+    names = list(axes)
+    points: list[SweepPoint] = []
+    for values in itertools.product(*(list(axes[name]) for name in names)):
+        rules = Rules.from_dict({**base_rules, **dict(zip(names, values))})
+        for strategy in strategies:
+            for seed in seeds:
+                points.append(SweepPoint(rules, strategy, seed, rounds))
+    return points
+
+
+def run_sweep(
+        points: list[SweepPoint],
+        cache: ResultCache | None = None,
+        workers: int | None = None,
+        progress: Callable[[PointResult], None] | None = None
+) -> list[PointResult]:
+    """
+    Gets the result of every point, from the cache where it can and by playing the rest over a process pool.
+    Each new result is cached as soon as it is done, so an interrupted sweep keeps everything it finished.
+
+    :param points: The points.
+    :type points: list[SweepPoint]
+    :param cache: The result cache, one in DEFAULT_CACHE_DIR by default.
+    :type cache: ResultCache | None
+    :param workers: The number of worker processes, the CPU count by default. 1 plays in this process.
+    :type workers: int | None
+    :param progress: Called with each result as it becomes available, cached ones first.
+    :type progress: Callable[[PointResult], None] | None
+    :return: The results, in the order of the points.
+    :rtype: list[PointResult]
+    """
+    if cache is None:
+        cache = ResultCache()
+    if workers is None:
+        workers = os.cpu_count() or 1
+    keys = [point.key() for point in points]
+    found: dict[str, PointResult] = {}
+    missing: dict[str, SweepPoint] = {}
+    for key, point in zip(keys, points):
+        if key in found or key in missing:
+            continue
+        result = cache.get(key)
+        if result is None:
+            missing[key] = point
+            continue
+        found[key] = result
+        if progress is not None:
+            progress(result)
+
+    def finish(key: str, result: PointResult) -> None:
+        cache.put(key, result)
+        found[key] = result
+        if progress is not None:
+            progress(result)
+
+    if workers <= 1 or len(missing) <= 1:
+        for key, point in missing.items():
+            finish(key, run_point(point))
+    else:
+        executor = ProcessPoolExecutor(max_workers=min(workers, len(missing)))
+        try:
+            futures = {executor.submit(run_point, point): key for key, point in missing.items()}
+            for future in as_completed(futures):
+                finish(futures[future], future.result())
+        except BaseException:
+            # Drop the queued points; the finished ones are already cached.
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        executor.shutdown()
+    return [found[key] for key in keys]
+
+
+def _parse_value(text: str, kind: type) -> object:
+    if kind is bool:
+        lowered = text.strip().lower()
+        if lowered in ("1", "true", "yes", "y"):
+            return True
+        if lowered in ("0", "false", "no", "n"):
+            return False
+        raise ValueError(f"Not a true or false value: {text!r}")
+    return kind(text)
+
+
+def parse_axes(settings: list[str]) -> dict[str, list]:
+    """
+    Reads rule axes from NAME=VALUE,VALUE,... settings.
+
+    :param settings: The settings.
+    :type settings: list[str]
+    :return: The values of each rule.
+    :rtype: dict[str, list]
+    """
+    # get_type_hints gives the classes themselves, where Field.type can be a string annotation.
+    hints = get_type_hints(Rules)
+    kinds: dict[str, type] = {rule.name: hints[rule.name] for rule in fields(Rules)}
+    axes: dict[str, list] = {}
+    for setting in settings:
+        name, _, values = setting.partition("=")
+        name = name.strip()
+        if name not in kinds or not values:
+            raise ValueError(f"Expected RULE=VALUE,VALUE with a rule from: {', '.join(kinds)}")
+        axes[name] = [_parse_value(value, kinds[name]) for value in values.split(",")]
+    return axes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Sweep house rules and strategies, caching every result.")
+    parser.add_argument("--set", action="append", default=[], metavar="RULE=V1,V2", help="Values to sweep for a rule. Repeat for more rules.")
+    parser.add_argument("--strategy", action="append", help="Strategy: mimic or chart:<path>. Repeat for more. Default mimic.")
+    parser.add_argument("--seed", action="append", type=int, help="Shoe seed. Repeat for more. Default 0.")
+    parser.add_argument("--rounds", type=int, default=100_000, help="Rounds per point.")
+    parser.add_argument("--workers", type=int, help="Worker processes, the CPU count by default.")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Where results are cached.")
+    parser.add_argument("--output", help="Also write every result to this JSON file.")
+    args = parser.parse_args()
+
+    axes = parse_axes(args.set)
+    points = grid_points(axes, args.rounds, strategies=args.strategy or ["mimic"], seeds=args.seed or [0])
+    start = time.perf_counter()
+    results = run_sweep(points, ResultCache(args.cache_dir), args.workers)
+    elapsed = time.perf_counter() - start
+    for result in results:
+        swept = " ".join(f"{name}={getattr(result.point.rules, name)}" for name in axes)
+        source = "cached" if result.cached else f"{result.elapsed_seconds:.1f}s"
+        print(
+            f"{swept} strategy={result.point.strategy} seed={result.point.seed}: "
+            f"house edge {result.house_edge:+.4%} ± {result.standard_error:.4%} ({source})")
+    computed = sum(not result.cached for result in results)
+    print(f"{len(results)} points, {computed} computed, {len(results) - computed} from the cache, {elapsed:.1f}s.")
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump([result.to_dict() for result in results], output_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
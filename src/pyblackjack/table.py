@@ -0,0 +1,171 @@
+"""
+A table of one to seven players against one Dealer and a shared Deck.
+
+Rounds go the way they do at a casino table: every seat bets, cards are dealt around the table in seat order, each
+seat plays its hands in turn, the dealer plays once for everyone, and then every hand is settled in one batch.
+Because all seats draw from the same deck, more players means fewer rounds per shoe, and each player's decisions
+change the cards the next seat sees.
+"""
+
+import time
+from dataclasses import dataclass, field
+from .dealer import Dealer
+from .deck import Deck
+from .player import Player
+from .shoe import Shoe
+from .playing_card import Rank
+from .round_results import RoundResults
+from .simulator import Strategy, play_hands
+from .renderer import NULL_RENDERER
+from . import blackjack, player_turn
+
+MIN_SEATS = 1
+MAX_SEATS = 7
+
+
+@dataclass
+class Seat:
+    """
+    A player and the strategy making their decisions.
+
+    Attributes:
+        player (Player): The Player
+        strategy (Strategy): Makes the Player's decisions.
+    """
+    player: Player
+    strategy: Strategy
+
+
+@dataclass
+class TableReport:
+    """
+    The summary of a batch of rounds at a table.
+
+    Attributes:
+        rounds (int): Rounds played.
+        hands (int): Hands settled over every seat.
+        elapsed_seconds (float): Wall clock time spent playing.
+        reshuffles (int): Deck resets during the rounds.
+        seat_nets (list[float]): The change in each seat's bank balance, in seat order.
+        results (dict[RoundResults, int]): Number of hands settled with each result over every seat.
+    """
+    rounds: int = 0
+    hands: int = 0
+    elapsed_seconds: float = 0.0
+    reshuffles: int = 0
+    seat_nets: list[float] = field(default_factory=list)
+    results: dict[RoundResults, int] = field(default_factory=lambda: {result: 0 for result in RoundResults})
+
+    @property
+    def rounds_per_shoe(self) -> float:
+        """
+        Average rounds dealt from each shuffle.
+        """
+        if self.reshuffles == 0:
+            return float(self.rounds)
+        return self.rounds / self.reshuffles
+
+
+class Table:
+    """
+    Runs rounds for several seats sharing a Dealer and a Deck, without any console input or output.
+
+    Attributes:
+        seats (list[Seat]): The seats, in the order cards are dealt and hands are played.
+        dealer (Dealer): The Dealer
+        deck (Deck): The Deck
+    """
+    def __init__(
+            self,
+            strategies: list[Strategy],
+            players: list[Player] | None = None,
+            dealer: Dealer | None = None,
+            deck: Deck | None = None
+    ) -> None:
+        """
+        Table constructor
+
+        :param strategies: The strategy of each seat, in seat order. Sets the number of seats, 1 - 7.
+        :type strategies: list[Strategy]
+        :param players: The Player in each seat, new ones named "Seat 1" and so on by default.
+        :type players: list[Player] | None
+        :param dealer: The Dealer, a new one by default.
+        :type dealer: Dealer | None
+        :param deck: The Deck. By default a Shoe with one pack per seat, so the cards left at the cut card cover a
+            full round at the table; a single pack can run out mid-round with seven seats.
+        :type deck: Deck | None
+        """
+        if not MIN_SEATS <= len(strategies) <= MAX_SEATS:
+            raise ValueError(f"A table seats {MIN_SEATS} - {MAX_SEATS} players.")
+        if players is None:
+            players = [Player(name=f"Seat {index + 1}") for index in range(len(strategies))]
+        elif len(players) != len(strategies):
+            raise ValueError("Every seat needs a player and a strategy.")
+        self.seats = [Seat(player, strategy) for player, strategy in zip(players, strategies)]
+        self.dealer = dealer if dealer is not None else Dealer()
+        self.deck = deck if deck is not None else Shoe(deck_count=len(strategies))
+
+    def play_round(self, seats: list[Seat] | None = None) -> list[list[RoundResults]]:
+        """
+        Plays one full round for every seat: bets, the deal, insurance, each seat's turn, one dealer turn and a
+        batched settlement. Checks the deck's health once the round is over.
+
+        :param seats: The seats playing this round, every seat by default.
+        :type seats: list[Seat] | None
+        :return: The results of each seat's hands, in seat order.
+        :rtype: list[list[RoundResults]]
+        """
+        if seats is None:
+            seats = self.seats
+        dealer = self.dealer
+        deck = self.deck
+        players = [seat.player for seat in seats]
+
+        bet_values = [seat.strategy.bet(seat.player, deck) for seat in seats]
+        blackjack.start_table_round(dealer, players, deck, bet_values)
+        dealer_upcard = dealer.get_visible_card()
+        insurances = [0.0] * len(seats)
+        if dealer_upcard.rank == Rank.ACE:
+            for index, (seat, bet_value) in enumerate(zip(seats, bet_values)):
+                insurances[index] = player_turn.buy_insurance(seat.player, seat.strategy.insurance(seat.player, bet_value))
+        for seat in seats:
+            play_hands(seat.player, deck, seat.strategy, dealer_upcard)
+        blackjack.process_dealer_turn(dealer, deck, renderer=NULL_RENDERER)
+        dealer_blackjack = dealer.hand.has_blackjack
+        for player, insurance in zip(players, insurances):
+            blackjack.settle_insurance(dealer, player, insurance, dealer_blackjack)
+        results = blackjack.settle_table(dealer, players)
+        deck.confirm_deck_health()
+        return results
+
+    def run(self, rounds: int, stop_when_broke: bool = False) -> TableReport:
+        """
+        Plays a number of rounds back to back.
+
+        :param rounds: The number of rounds to play.
+        :type rounds: int
+        :param stop_when_broke: Seats with an empty bank sit out, and play stops once every seat or the dealer is broke.
+        :type stop_when_broke: bool
+        :return: The summary of the rounds played.
+        :rtype: TableReport
+        """
+        report = TableReport()
+        starting_balances = [seat.player.bank.balance for seat in self.seats]
+        starting_reshuffles = self.deck.reshuffle_count
+        counts = report.results
+        start = time.perf_counter()
+        for _ in range(rounds):
+            seats = self.seats
+            if stop_when_broke:
+                seats = [seat for seat in seats if seat.player.bank.balance > 0]
+                if not seats or self.dealer.bank.balance <= 0:
+                    break
+            for seat_results in self.play_round(seats):
+                for result in seat_results:
+                    counts[result] += 1
+                report.hands += len(seat_results)
+            report.rounds += 1
+        report.elapsed_seconds = time.perf_counter() - start
+        report.reshuffles = self.deck.reshuffle_count - starting_reshuffles
+        report.seat_nets = [seat.player.bank.balance - balance for seat, balance in zip(self.seats, starting_balances)]
+        return report
@@ -0,0 +1,483 @@
+"""
+A compact binary trace of simulated rounds, and a replayer that plays traces back through the engine.
+
+A trace holds everything needed to play a session again: the deck setup and either the stdlib seed or every shuffled
+card order, each bet, insurance bet and action, and each round's results with the player's balance after it.
+Replaying feeds the recorded decisions to a Simulator and checks every round comes out the same.
+
+Layout, every integer an unsigned LEB128 varint and signed ones zigzag encoded:
+    header: MAGIC, version, deck count, cut card, money scale, has seed flag, [seed],
+            player starting balance (signed), dealer starting balance (signed)
+    events: an opcode byte, then its payload
+        ROUND       change in the bet since the previous round (signed)
+        INSURANCE   insurance bet
+        HIT, STAND, DOUBLE, SPLIT
+        SETTLE      hand count, one byte per hand with the RoundResults value, change in the player's balance (signed)
+        SHUFFLE     the card indices of a shuffled deck, deck count * 52 bytes, next card drawn last
+        END
+Money is stored as whole units of 1 / money scale, cents by default. A flat bettor's rounds cost a single byte of
+bet and a few bytes of settlement.
+"""
+
+import random
+from dataclasses import dataclass, field
+from typing import Any, MutableSequence, Sequence
+from .blackjack import PossibleActions
+from .dealer import Dealer
+from .deck import Deck
+from .hand import Hand
+from .player import Player
+from .playing_card import PlayingCard, CARD_COUNT
+from .rng import ShuffleSource
+from .round_results import RoundResults
+from .simulator import Simulator, Strategy
+from . import constants
+
+MAGIC = b"PBJTRACE"
+VERSION = 1
+DEFAULT_MONEY_SCALE = 100
+BALANCE_TOLERANCE = 1e-6
+
+END = 0
+ROUND = 1
+INSURANCE = 2
+HIT = 3
+STAND = 4
+DOUBLE = 5
+SPLIT = 6
+SETTLE = 7
+SHUFFLE = 8
+
+ACTION_CODES = {
+    PossibleActions.HIT: HIT,
+    PossibleActions.STAND: STAND,
+    PossibleActions.DOUBLE: DOUBLE,
+    PossibleActions.SPLIT: SPLIT}
+CODE_ACTIONS = {code: action for action, code in ACTION_CODES.items()}
+RESULT_CODES = {result.value: result for result in RoundResults}
+
+
+class TraceMismatch(ValueError):
+    """
+    A replayed session did not match its trace.
+
+    Attributes:
+        round_index (int): The round, counted from 0, where replay and trace disagreed.
+    """
+    def __init__(self, round_index: int, message: str) -> None:
+        super().__init__(f"Round {round_index}: {message}")
+        self.round_index = round_index
+
+
+@dataclass
+class Trace:
+    """
+    A decoded trace.
+
+    Attributes:
+        deck_count (int): The number of 52 card packs in the deck.
+        cut_card (int): The deck's cut card.
+        money_scale (int): Money is stored in whole units of 1 / money_scale.
+        seed (int | None): The random.Random seed of the deck, None when the shuffles are stored instead.
+        player_balance (float): The Player's starting balance.
+        dealer_balance (float): The Dealer's starting balance.
+        opcodes (bytearray): One opcode per event, END excluded.
+        arguments (list): The payload of each event: money as a float, an action, a tuple of results and the
+            balance after the round for SETTLE, the card order bytes for SHUFFLE, None for payload-less events.
+    """
+    deck_count: int
+    cut_card: int
+    money_scale: int
+    seed: int | None
+    player_balance: float
+    dealer_balance: float
+    opcodes: bytearray = field(default_factory=bytearray)
+    arguments: list = field(default_factory=list)
+
+    @property
+    def rounds(self) -> int:
+        return self.opcodes.count(ROUND)
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    if value < 0:
+        raise ValueError("Varints cannot be negative, zigzag encode signed values.")
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _write_signed(out: bytearray, value: int) -> None:
+    _write_varint(out, value * 2 if value >= 0 else -value * 2 - 1)
+
+
+def _read_varint(data: bytes, position: int) -> tuple[int, int]:
+    result = 0
+    shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, position
+        shift += 7
+
+
+def _read_signed(data: bytes, position: int) -> tuple[int, int]:
+    value, position = _read_varint(data, position)
+    return (value >> 1) ^ -(value & 1), position
+
+
+class TraceWriter:
+    """
+    Encodes a trace as it is recorded.
+
+    Attributes:
+        money_scale (int): Money is stored in whole units of 1 / money_scale.
+        deck_size (int): The number of cards in a shuffled deck order.
+    """
+    def __init__(
+            self,
+            deck_count: int,
+            cut_card: int,
+            seed: int | None,
+            player_balance: float,
+            dealer_balance: float,
+            money_scale: int = DEFAULT_MONEY_SCALE
+    ) -> None:
+        """
+        TraceWriter constructor, writes the header.
+
+        :param deck_count: The number of 52 card packs in the deck.
+        :type deck_count: int
+        :param cut_card: The deck's cut card.
+        :type cut_card: int
+        :param seed: The random.Random seed of the deck, None to record shuffles instead.
+        :type seed: int | None
+        :param player_balance: The Player's starting balance.
+        :type player_balance: float
+        :param dealer_balance: The Dealer's starting balance.
+        :type dealer_balance: float
+        :param money_scale: Money is stored in whole units of 1 / money_scale.
+        :type money_scale: int
+        """
+        if seed is not None and seed < 0:
+            raise ValueError("Only non-negative seeds can be recorded.")
+        self.money_scale = money_scale
+        self.deck_size = deck_count * CARD_COUNT
+        self._data = bytearray(MAGIC)
+        self._last_bet = 0
+        self._last_balance = self._money(player_balance)
+        for value in (VERSION, deck_count, cut_card, money_scale, seed is not None):
+            _write_varint(self._data, int(value))
+        if seed is not None:
+            _write_varint(self._data, seed)
+        _write_signed(self._data, self._money(player_balance))
+        _write_signed(self._data, self._money(dealer_balance))
+
+    def _money(self, amount: float) -> int:
+        scaled = round(amount * self.money_scale)
+        if abs(scaled - amount * self.money_scale) > BALANCE_TOLERANCE * self.money_scale:
+            raise ValueError(f"{amount} is not a whole number of 1/{self.money_scale} units.")
+        return scaled
+
+    def bet(self, amount: float) -> None:
+        bet = self._money(amount)
+        self._data.append(ROUND)
+        _write_signed(self._data, bet - self._last_bet)
+        self._last_bet = bet
+
+    def insurance(self, amount: float) -> None:
+        self._data.append(INSURANCE)
+        _write_varint(self._data, self._money(amount))
+
+    def action(self, action: PossibleActions) -> None:
+        self._data.append(ACTION_CODES[action])
+
+    def settle(self, results: list[RoundResults], player_balance: float) -> None:
+        data = self._data
+        data.append(SETTLE)
+        _write_varint(data, len(results))
+        data.extend(result.value for result in results)
+        balance = self._money(player_balance)
+        _write_signed(data, balance - self._last_balance)
+        self._last_balance = balance
+
+    def shuffle(self, cards: Sequence[int]) -> None:
+        if len(cards) != self.deck_size:
+            raise ValueError("Only full deck shuffles can be recorded.")
+        self._data.append(SHUFFLE)
+        self._data.extend(cards)
+
+    def getvalue(self) -> bytes:
+        """
+        Finishes the trace.
+
+        :return: The encoded trace, with the END marker.
+        :rtype: bytes
+        """
+        return bytes(self._data) + bytes((END,))
+
+
+def decode_trace(data: bytes) -> Trace:
+    """
+    Decodes a trace.
+
+    :param data: The encoded trace.
+    :type data: bytes
+    :return: The trace.
+    :rtype: Trace
+    """
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError("Not a trace.")
+    position = len(MAGIC)
+    version, position = _read_varint(data, position)
+    if version != VERSION:
+        raise ValueError(f"Trace version {version} is not supported.")
+    deck_count, position = _read_varint(data, position)
+    cut_card, position = _read_varint(data, position)
+    scale, position = _read_varint(data, position)
+    has_seed, position = _read_varint(data, position)
+    seed = None
+    if has_seed:
+        seed, position = _read_varint(data, position)
+    player_balance, position = _read_signed(data, position)
+    dealer_balance, position = _read_signed(data, position)
+    trace = Trace(deck_count, cut_card, scale, seed, player_balance / scale, dealer_balance / scale)
+
+    deck_size = deck_count * CARD_COUNT
+    opcodes = trace.opcodes
+    arguments = trace.arguments
+    bet = 0
+    balance = player_balance
+    argument: Any
+    while True:
+        opcode = data[position]
+        position += 1
+        if opcode == END:
+            break
+        if opcode == ROUND:
+            delta, position = _read_signed(data, position)
+            bet += delta
+            argument = bet / scale
+        elif opcode in CODE_ACTIONS:
+            argument = None
+        elif opcode == SETTLE:
+            hand_count, position = _read_varint(data, position)
+            results = tuple(RESULT_CODES[code] for code in data[position:position + hand_count])
+            position += hand_count
+            delta, position = _read_signed(data, position)
+            balance += delta
+            argument = (results, balance / scale)
+        elif opcode == INSURANCE:
+            amount, position = _read_varint(data, position)
+            argument = amount / scale
+        elif opcode == SHUFFLE:
+            argument = data[position:position + deck_size]
+            position += deck_size
+        else:
+            raise ValueError(f"Unknown trace opcode {opcode} at byte {position - 1}.")
+        opcodes.append(opcode)
+        arguments.append(argument)
+    return trace
+
+
+class _RecordingRandom:
+    """
+    Shuffles with another generator and records every resulting deck order.
+    """
+    def __init__(self, rng: ShuffleSource, writer: TraceWriter) -> None:
+        self._rng = rng
+        self._writer = writer
+
+    def shuffle(self, cards: MutableSequence) -> None:
+        self._rng.shuffle(cards)
+        self._writer.shuffle(cards)
+
+
+class _RecordingStrategy:
+    """
+    Passes decisions through from another strategy, writing each one to the trace.
+    """
+    def __init__(self, strategy: Strategy, writer: TraceWriter) -> None:
+        self._strategy = strategy
+        self._writer = writer
+
+    def bet(self, player: Player, deck: Deck) -> float:
+        bet = self._strategy.bet(player, deck)
+        self._writer.bet(bet)
+        return bet
+
+    def insurance(self, player: Player, bet_value: float) -> float:
+        insurance = self._strategy.insurance(player, bet_value)
+        self._writer.insurance(insurance)
+        return insurance
+
+    def action(self, hand: Hand, dealer_upcard: PlayingCard, allowed_actions: set[PossibleActions], deck: Deck) -> PossibleActions:
+        action = self._strategy.action(hand, dealer_upcard, allowed_actions, deck)
+        self._writer.action(action)
+        return action
+
+
+def record(
+        strategy: Strategy,
+        rounds: int,
+        seed: int | None = None,
+        rng: ShuffleSource | None = None,
+        deck_count: int = 1,
+        cut_card: int | None = None,
+        player_balance: float = constants.PLAYER_BANK,
+        dealer_balance: float = constants.DEALER_BANK,
+        money_scale: int = DEFAULT_MONEY_SCALE
+) -> bytes:
+    """
+    Plays rounds with a fresh Player, Dealer and Deck, recording them as a trace.
+
+    :param strategy: Makes the Player's decisions.
+    :type strategy: Strategy
+    :param rounds: The number of rounds to play.
+    :type rounds: int
+    :param seed: Shuffle with random.Random(seed) and store only the seed. Otherwise every shuffle is stored.
+    :type seed: int | None
+    :param rng: The generator to shuffle with when no seed is given, a new random.Random by default.
+    :type rng: ShuffleSource | None
+    :param deck_count: The number of 52 card packs in the deck.
+    :type deck_count: int
+    :param cut_card: The deck's cut card, the Deck default if None.
+    :type cut_card: int | None
+    :param player_balance: The Player's starting balance.
+    :type player_balance: float
+    :param dealer_balance: The Dealer's starting balance.
+    :type dealer_balance: float
+    :param money_scale: Money is stored in whole units of 1 / money_scale. Every amount must be one.
+    :type money_scale: int
+    :return: The encoded trace.
+    :rtype: bytes
+    """
+    if cut_card is None:
+        cut_card = int(deck_count * CARD_COUNT * constants.DECK_REFRESH_PERCENTAGE)
+    writer = TraceWriter(deck_count, cut_card, seed, player_balance, dealer_balance, money_scale)
+    deck_rng: ShuffleSource
+    if seed is not None:
+        deck_rng = random.Random(seed)
+    else:
+        deck_rng = _RecordingRandom(rng if rng is not None else random.Random(), writer)
+    deck = Deck(rng=deck_rng, deck_count=deck_count, cut_card=cut_card)
+    simulator = Simulator(
+        _RecordingStrategy(strategy, writer),
+        player=Player(starting_balance=player_balance),
+        dealer=Dealer(starting_balance=dealer_balance),
+        deck=deck)
+    for _ in range(rounds):
+        results = simulator.play_round()
+        writer.settle(results, simulator.player.bank.balance)
+    return writer.getvalue()
+
+
+class _TraceRandom:
+    """
+    Stands in for a generator during replay, laying out the recorded deck orders in turn.
+    """
+    def __init__(self, replayer: "_Replayer") -> None:
+        self._replayer = replayer
+
+    def shuffle(self, cards: MutableSequence) -> None:
+        cards[:] = self._replayer.expect(SHUFFLE, "a shuffle")
+
+
+class _Replayer:
+    """
+    Plays back the decisions of a trace as a Strategy, walking one cursor through its events.
+    """
+    def __init__(self, trace: Trace) -> None:
+        self._opcodes = trace.opcodes
+        self._arguments = trace.arguments
+        self.position = 0
+        self.round_index = -1
+
+    def expect(self, opcode: int, what: str) -> Any:
+        position = self.position
+        if position >= len(self._opcodes) or self._opcodes[position] != opcode:
+            found = "the end" if position >= len(self._opcodes) else f"opcode {self._opcodes[position]}"
+            raise TraceMismatch(self.round_index, f"the engine asked for {what}, the trace has {found}.")
+        self.position = position + 1
+        return self._arguments[position]
+
+    def bet(self, player: Player, deck: Deck) -> float:
+        self.round_index += 1
+        return self.expect(ROUND, "a bet")
+
+    def insurance(self, player: Player, bet_value: float) -> float:
+        return self.expect(INSURANCE, "an insurance bet")
+
+    def action(self, hand: Hand, dealer_upcard: PlayingCard, allowed_actions: set[PossibleActions], deck: Deck) -> PossibleActions:
+        position = self.position
+        if position >= len(self._opcodes):
+            raise TraceMismatch(self.round_index, "the engine asked for an action, the trace has the end.")
+        action = CODE_ACTIONS.get(self._opcodes[position])
+        if action is None:
+            raise TraceMismatch(
+                self.round_index, f"the engine asked for an action, the trace has opcode {self._opcodes[position]}.")
+        if action not in allowed_actions:
+            raise TraceMismatch(self.round_index, f"{action.value} is recorded but not allowed.")
+        self.position = position + 1
+        return action
+
+
+@dataclass(frozen=True)
+class ReplayReport:
+    """
+    The outcome of a verified replay.
+
+    Attributes:
+        rounds (int): Rounds replayed.
+        decisions (int): Bets, insurance bets and actions fed to the engine.
+        player_balance (float): The Player's balance at the end.
+        dealer_balance (float): The Dealer's balance at the end.
+    """
+    rounds: int
+    decisions: int
+    player_balance: float
+    dealer_balance: float
+
+
+def replay(data: bytes | Trace) -> ReplayReport:
+    """
+    Plays a trace back through the engine, checking every round's results and the Player's balance against it.
+    Nothing is printed. The Dealer's final balance is checked against the money the Player won or lost.
+
+    :param data: The encoded trace, or one already decoded.
+    :type data: bytes | Trace
+    :return: The replay summary.
+    :rtype: ReplayReport
+    :raises TraceMismatch: When the engine and the trace disagree.
+    """
+    trace = data if isinstance(data, Trace) else decode_trace(data)
+    replayer = _Replayer(trace)
+    deck_rng: ShuffleSource
+    if trace.seed is not None:
+        deck_rng = random.Random(trace.seed)
+    else:
+        deck_rng = _TraceRandom(replayer)
+    deck = Deck(rng=deck_rng, deck_count=trace.deck_count, cut_card=trace.cut_card)
+    player = Player(starting_balance=trace.player_balance)
+    dealer = Dealer(starting_balance=trace.dealer_balance)
+    simulator = Simulator(replayer, player=player, dealer=dealer, deck=deck)
+    rounds = 0
+    end = len(trace.opcodes)
+    while replayer.position < end:
+        if trace.opcodes[replayer.position] == SHUFFLE:
+            raise TraceMismatch(rounds, "the trace has a shuffle the engine did not make.")
+        results = simulator.play_round()
+        expected_results, expected_balance = replayer.expect(SETTLE, "the settlement")
+        if tuple(results) != expected_results:
+            raise TraceMismatch(rounds, f"results {[r.name for r in results]}, recorded {[r.name for r in expected_results]}.")
+        if abs(player.bank.balance - expected_balance) > BALANCE_TOLERANCE:
+            raise TraceMismatch(rounds, f"player balance {player.bank.balance}, recorded {expected_balance}.")
+        rounds += 1
+    expected_dealer = trace.dealer_balance + trace.player_balance - player.bank.balance
+    if abs(dealer.bank.balance - expected_dealer) > BALANCE_TOLERANCE:
+        raise TraceMismatch(rounds, f"dealer balance {dealer.bank.balance}, expected {expected_dealer}.")
+    decisions = sum(1 for opcode in trace.opcodes if opcode != SETTLE and opcode != SHUFFLE)
+    return ReplayReport(rounds, decisions, player.bank.balance, dealer.bank.balance)
@@ -0,0 +1,270 @@
+"""
+A batch round engine that plays many independent tables in lockstep with NumPy arrays.
+
+Each table has its own shoe, stored as a row of card values (Ace is 1, face cards are 10). Every step of a round,
+the deal, the player's decisions, the dealer's turn and settlement, is done as array operations across all tables,
+so there are no PlayingCard, Hand or Bank objects per round. The rules follow the object engine in blackjack.py,
+including determine_winner's handling of busts and blackjacks.
+
+Decisions come from a fixed strategy table indexed by [soft][hand total][dealer upcard value - 1].
+Splitting is not supported, pairs are played by their total.
+
+Requires numpy, install with the numpy extra.
+"""
+
+import time
+from dataclasses import dataclass, field
+try:
+    import numpy as np
+except ImportError as error:
+    raise ImportError("The vectorized engine requires numpy. Install it with: pip install pyblackjack[numpy]") from error
+from .round_results import RoundResults
+from . import blackjack, constants
+
+# Strategy table codes. Doubling is only allowed on the first two cards, after that DOUBLE hits and DOUBLE_OR_STAND stands.
+STAND = 0
+HIT = 1
+DOUBLE = 2
+DOUBLE_OR_STAND = 3
+
+DEALER_STANDS_ON = 17
+_RANK_VALUES = [min(rank, 10) for rank in range(1, 14)]
+
+
+def mimic_dealer_table() -> np.ndarray:
+    """
+    Builds a strategy table that hits below 17 and stands otherwise, like MimicDealerStrategy.
+
+    :return: A strategy table of shape (2, 22, 10).
+    :rtype: np.ndarray
+    """
+    table = np.full((2, 22, 10), STAND, dtype=np.int8)
+    table[:, :DEALER_STANDS_ON, :] = HIT
+    return table
+
+
+@dataclass
+class BatchReport:
+    """
+    The summary of a batch run.
+
+    Attributes:
+        rounds (int): Rounds played over all tables.
+        net_units (float): The Player's total winnings, in units of the initial bet.
+        elapsed_seconds (float): Wall clock time spent playing.
+        results (dict[RoundResults, int]): Number of rounds ending with each result.
+    """
+    rounds: int = 0
+    net_units: float = 0.0
+    elapsed_seconds: float = 0.0
+    results: dict[RoundResults, int] = field(default_factory=lambda: {result: 0 for result in RoundResults})
+
+    @property
+    def rounds_per_second(self) -> float:
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.rounds / self.elapsed_seconds
+
+    @property
+    def mean_return(self) -> float:
+        if self.rounds == 0:
+            return 0.0
+        return self.net_units / self.rounds
+
+
+class VectorizedEngine:
+    """
+    Plays rounds on many tables at once.
+
+    Attributes:
+        tables (int): The number of independent tables.
+        strategy (np.ndarray): The strategy table, shape (2, 22, 10).
+        deck_count (int): Decks in each shoe.
+        shoes (np.ndarray): The card values of every shoe, shape (tables, cards per shoe).
+        positions (np.ndarray): The index of the next card to draw in each shoe.
+    """
+    def __init__(
+            self,
+            tables: int,
+            strategy: np.ndarray | None = None,
+            deck_count: int = 1,
+            refresh_percentage: float = constants.DECK_REFRESH_PERCENTAGE,
+            seed: int | None = None
+    ) -> None:
+        """
+        VectorizedEngine constructor
+
+        :param tables: The number of independent tables to play in lockstep.
+        :type tables: int
+        :param strategy: The strategy table, shape (2, 22, 10). Hits below 17 by default.
+        :type strategy: np.ndarray | None
+        :param deck_count: Decks in each shoe.
+        :type deck_count: int
+        :param refresh_percentage: A shoe is reshuffled between rounds once this share of it or less remains.
+        :type refresh_percentage: float
+        :param seed: Seed for the random generator.
+        :type seed: int | None
+        """
+        if tables < 1:
+            raise ValueError("Need at least one table.")
+        self.tables = tables
+        self.strategy = mimic_dealer_table() if strategy is None else np.asarray(strategy, dtype=np.int8)
+        if self.strategy.shape != (2, 22, 10):
+            raise ValueError("Strategy table must have shape (2, 22, 10).")
+        self.deck_count = deck_count
+        self._rng = np.random.default_rng(seed)
+        single_shoe = np.array(_RANK_VALUES * 4 * deck_count, dtype=np.int8)
+        self._shoe_size = single_shoe.size
+        self._cut_position = self._shoe_size - int(self._shoe_size * refresh_percentage)
+        self.shoes = self._rng.permuted(np.tile(single_shoe, (tables, 1)), axis=1)
+        self.positions = np.zeros(tables, dtype=np.int64)
+        self._rows = np.arange(tables)
+
+    def _reshuffle_spent_shoes(self) -> None:
+        """
+        Reshuffles every shoe past its refresh point, like Deck.confirm_deck_health.
+        """
+        self._reshuffle(self.positions >= self._cut_position)
+
+    def _reshuffle(self, rows: np.ndarray) -> None:
+        """
+        Reshuffles the shoes of the tables selected by rows and starts them from the top.
+
+        :param rows: The tables to reshuffle.
+        :type rows: np.ndarray
+        """
+        if rows.any():
+            self.shoes[rows] = self._rng.permuted(self.shoes[rows], axis=1)
+            self.positions[rows] = 0
+
+    def _draw(self, mask: np.ndarray | None = None) -> np.ndarray:
+        """
+        Draws a card on every table selected by mask. Tables that are not drawing get 0.
+        A shoe that runs out mid round is reshuffled first, like Deck.drawCard resets an empty deck.
+
+        :param mask: The tables drawing a card, every table when None.
+        :type mask: np.ndarray | None
+        :return: The card values drawn.
+        :rtype: np.ndarray
+        """
+        empty = self.positions >= self._shoe_size
+        if mask is not None:
+            empty &= mask
+        self._reshuffle(empty)
+        # Tables that are not drawing may sit at the end of their shoe, so clip their index into range.
+        cards = self.shoes[self._rows, np.minimum(self.positions, self._shoe_size - 1)]
+        if mask is None:
+            self.positions += 1
+            return cards
+        cards = np.where(mask, cards, 0).astype(np.int8)
+        self.positions += mask
+        return cards
+
+    @staticmethod
+    def _totals(hard: np.ndarray, has_ace: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Works out hand totals, counting one Ace as 11 where that does not bust the hand.
+
+        :return: The totals, and whether each total is soft.
+        :rtype: tuple[np.ndarray, np.ndarray]
+        """
+        soft = has_ace & (hard <= 11)
+        return np.where(soft, hard + 10, hard), soft
+
+    def play_round(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Plays one round on every table.
+
+        :return: The RoundResults value of each table, and the Player's winnings on each table in units of the bet.
+        :rtype: tuple[np.ndarray, np.ndarray]
+        """
+        self._reshuffle_spent_shoes()
+        draw = self._draw
+
+        player_first = draw()
+        dealer_up = draw()
+        player_second = draw()
+        dealer_hole = draw()
+
+        player_hard = (player_first + player_second).astype(np.int16)
+        player_ace = (player_first == 1) | (player_second == 1)
+        dealer_hard = (dealer_up + dealer_hole).astype(np.int16)
+        dealer_ace = (dealer_up == 1) | (dealer_hole == 1)
+
+        player_total, _ = self._totals(player_hard, player_ace)
+        dealer_total, _ = self._totals(dealer_hard, dealer_ace)
+        player_blackjack = player_total == 21
+        dealer_blackjack = dealer_total == 21
+
+        upcard_index = dealer_up.astype(np.intp) - 1
+        doubled = np.zeros(self.tables, dtype=bool)
+        player_cards = 2
+        active = ~player_blackjack
+        while active.any():
+            player_total, soft = self._totals(player_hard, player_ace)
+            action = self.strategy[soft.astype(np.intp), np.minimum(player_total, 21), upcard_index]
+            if player_cards > 2:
+                action = np.where(action == DOUBLE, HIT, action)
+                action = np.where(action == DOUBLE_OR_STAND, STAND, action)
+            doubling = active & ((action == DOUBLE) | (action == DOUBLE_OR_STAND))
+            hitting = active & ((action == HIT) | doubling)
+            card = draw(hitting)
+            player_hard += card
+            player_ace |= card == 1
+            doubled |= doubling
+            player_cards += 1
+            active = hitting & ~doubling & (player_hard <= 21)
+        player_total, _ = self._totals(player_hard, player_ace)
+        player_busted = player_total > 21
+
+        dealer_total, _ = self._totals(dealer_hard, dealer_ace)
+        drawing = ~dealer_blackjack & (dealer_total < DEALER_STANDS_ON)
+        while drawing.any():
+            card = draw(drawing)
+            dealer_hard += card
+            dealer_ace |= card == 1
+            dealer_total, _ = self._totals(dealer_hard, dealer_ace)
+            drawing &= dealer_total < DEALER_STANDS_ON
+        dealer_busted = dealer_total > 21
+
+        player_result = np.where(player_busted, -1, player_total)
+        dealer_result = np.where(dealer_busted, -1, dealer_total)
+        dealer_won = (dealer_blackjack & ~player_blackjack) | (dealer_result > player_result)
+        player_won = ~dealer_won & (player_result > dealer_result)
+        won_blackjack = player_won & player_blackjack
+        results = np.full(self.tables, RoundResults.PUSH.value, dtype=np.int8)
+        results[dealer_won] = RoundResults.DEALER_WON.value
+        results[player_won] = RoundResults.PLAYER_WON.value
+        results[won_blackjack] = RoundResults.PLAYER_WON_BLACKJACK.value
+
+        stake = np.where(doubled, 2.0, 1.0)
+        winnings = np.zeros(self.tables)
+        winnings[dealer_won] = -stake[dealer_won]
+        # Read the payouts now, so a Rules.apply block around the run is honoured.
+        winnings[player_won] = stake[player_won] * blackjack.STANDARD_PAYOUT
+        winnings[won_blackjack] = blackjack.BLACKJACK_PAYOUT
+        return results, winnings
+
+    def run(self, rounds_per_table: int) -> BatchReport:
+        """
+        Plays a number of rounds on every table.
+
+        :param rounds_per_table: Rounds to play on each table.
+        :type rounds_per_table: int
+        :return: The summary over all tables.
+        :rtype: BatchReport
+        """
+        report = BatchReport()
+        counts = np.zeros(len(RoundResults) + 1, dtype=np.int64)
+        net_units = 0.0
+        start = time.perf_counter()
+        for _ in range(rounds_per_table):
+            results, winnings = self.play_round()
+            counts += np.bincount(results, minlength=counts.size)
+            net_units += float(winnings.sum())
+        report.elapsed_seconds = time.perf_counter() - start
+        report.rounds = rounds_per_table * self.tables
+        report.net_units = net_units
+        for result in RoundResults:
+            report.results[result] = int(counts[result.value])
+        return report
@@ -0,0 +1,30 @@
+from pyblackjack.bank import Bank
+from pyblackjack.ledger import Ledger, Transaction
+
+
+def _as_tuples(transactions: list[Transaction]) -> list[tuple[str, float, int]]:
+    return [(transaction.name, transaction.value, transaction.invoice_num) for transaction in transactions]
+
+
+def test_get_history_matches_list_slice():
+    # Before the ledger, the history was a list and get_history returned history[-count:].
+    bank = Bank(100)
+    history = [("Initial Balance", 100.0, 0)]
+    for invoice_num in range(1, 6):
+        bank.add_transaction(f"Bet {invoice_num}", -invoice_num)
+        history.append((f"Bet {invoice_num}", float(-invoice_num), invoice_num))
+    for count in range(-8, 9):
+        assert _as_tuples(bank.get_history(count)) == history[-count:], count
+    assert len(bank.get_history(0)) == 6
+    assert len(bank.get_history(-2)) == 4
+    assert _as_tuples(bank.get_history(get_all=True)) == history
+
+
+def test_get_history_after_roll_up():
+    bank = Bank(10, Ledger(retention=4))
+    for invoice_num in range(1, 20):
+        bank.add_transaction("Win", 1)
+    history = bank.get_history(get_all=True)
+    assert _as_tuples(bank.get_history(0)) == _as_tuples(history)
+    assert _as_tuples(bank.get_history(3)) == _as_tuples(history[-3:])
+    assert _as_tuples(bank.get_history(-1)) == _as_tuples(history[1:])
@@ -0,0 +1,80 @@
+import random
+import pytest
+from pyblackjack.card_counting import HI_LO_TAGS
+from pyblackjack.deck import Deck
+from pyblackjack.playing_card import CARD_COUNT, Rank, Suit, card_index
+
+
+def _stacked_deck(ranks: list[int], deck_count: int = 2) -> Deck:
+    """
+    A complete deck with the given ranks moved to the top, drawn in order.
+    """
+    deck = Deck(rng=random.Random(4), deck_count=deck_count)
+    for position, rank in reversed(list(enumerate(ranks))):
+        index = card_index(Rank(rank), Suit(position % len(Suit) + 1))
+        deck.cards.remove(index)
+        deck.cards.append(index)
+    return deck
+
+
+# Hi-Lo tags: 2 - 6 are +1, 7 - 9 are 0, tens and Aces are -1.
+DRAWS = [2, 3, 4, 5, 6, 13, 1, 10, 7, 8, 9]
+
+
+def test_counts_after_a_known_draw():
+    deck = _stacked_deck(DRAWS)
+    expected_hi_lo = [1, 2, 3, 4, 5, 4, 3, 2, 2, 2, 2]
+    for drawn, (rank, running) in enumerate(zip(DRAWS, expected_hi_lo), start=1):
+        assert deck.drawCard().rank == Rank(rank)
+        assert deck.count.running_count == deck.count.hi_lo == running
+        assert deck.count.cards_remaining == 2 * CARD_COUNT - drawn
+    count = deck.count
+    assert count.true_count == pytest.approx(2 * CARD_COUNT / (2 * CARD_COUNT - len(DRAWS)))
+    assert count.decks_remaining == pytest.approx((2 * CARD_COUNT - len(DRAWS)) / CARD_COUNT)
+    # KO starts at 4 - 4 * decks and also counts 7 as +1.
+    assert count.ko == -4 + 6 - 3
+    assert count.omega_ii == 1 + 1 + 2 + 2 + 2 - 2 + 0 - 2 + 1 + 0 - 1
+    assert count.remaining(Rank.ACE) == 7
+    assert count.remaining(Rank.QUEEN) == 8
+
+
+def test_true_count_scales_with_decks_left():
+    deck = _stacked_deck([2] * 4 + [3] * 4 + [4] * 4 + [5] * 4 + [6] * 10, deck_count=6)
+    for _ in range(26):
+        deck.drawCard()
+    assert deck.count.running_count == 26
+    assert deck.count.true_count == pytest.approx(26 / 5.5)
+
+
+def test_full_deck_returns_balanced_counts_to_zero():
+    deck = Deck(rng=random.Random(8), deck_count=2)
+    while deck.cards:
+        deck.drawCard()
+    assert deck.count.hi_lo == 0
+    assert deck.count.omega_ii == 0
+    assert deck.count.ko == 4
+    assert deck.count.true_count == 0.0
+
+
+def test_reshuffle_resets_the_counts():
+    deck = _stacked_deck(DRAWS)
+    deck.cut_card = 2 * CARD_COUNT - len(DRAWS)
+    for _ in DRAWS:
+        deck.drawCard()
+    assert deck.count.running_count == 2
+    deck.confirm_deck_health()
+    assert deck.reshuffle_count == 1
+    assert deck.count.running_count == 0
+    assert deck.count.ko == -4
+    assert deck.count.cards_remaining == 2 * CARD_COUNT
+    assert deck.count.true_count == 0.0
+
+
+def test_empty_deck_reset_mid_round_counts_the_new_card():
+    deck = Deck(rng=random.Random(9))
+    while deck.cards:
+        deck.drawCard()
+    card = deck.drawCard()
+    assert deck.reshuffle_count == 1
+    assert deck.count.cards_remaining == CARD_COUNT - 1
+    assert deck.count.running_count == HI_LO_TAGS[card.index]
@@ -0,0 +1,35 @@
+import math
+import pytest
+from pyblackjack.dealer_probabilities import BUST, DealerProbabilities
+from pyblackjack.rules import Rules
+from pyblackjack.solver import BasicStrategySolver, full_composition, remove_card
+
+
+def _outcomes(upcard: int, hits_soft_17: bool) -> tuple[float, ...]:
+    return DealerProbabilities(hits_soft_17=hits_soft_17).lookup(upcard, remove_card(full_composition(1), upcard))
+
+
+@pytest.mark.parametrize("hits_soft_17", [False, True])
+@pytest.mark.parametrize("upcard", range(1, 11))
+def test_outcomes_add_up_to_one(upcard, hits_soft_17):
+    assert math.isclose(sum(_outcomes(upcard, hits_soft_17)), 1.0)
+
+
+def test_hitting_soft_17_moves_finals_off_17():
+    stands, hits = _outcomes(6, False), _outcomes(6, True)
+    assert hits[0] < stands[0]
+    assert hits[BUST] > stands[BUST]
+    # A ten can never be part of a soft 17, so the rule does not matter under one.
+    assert _outcomes(10, True) == pytest.approx(_outcomes(10, False))
+
+
+def test_rule_is_read_from_the_applied_rules():
+    assert DealerProbabilities().hits_soft_17 is False
+    with Rules(dealer_hits_soft_17=True).applied():
+        assert DealerProbabilities().hits_soft_17 is True
+        assert BasicStrategySolver().dealer_probabilities.hits_soft_17 is True
+
+
+def test_solver_rejects_a_mismatched_cache():
+    with pytest.raises(ValueError):
+        BasicStrategySolver(dealer_probabilities=DealerProbabilities(hits_soft_17=False), dealer_hits_soft_17=True)
@@ -0,0 +1,89 @@
+import random
+import pytest
+from pyblackjack.hand import Hand
+from pyblackjack.player import Player
+from pyblackjack.playing_card import Rank, Suit, PlayingCard
+
+
+def _card(rank: int) -> PlayingCard:
+    return PlayingCard(Rank(rank), Suit.HEARTS)
+
+
+def _from_scratch(cards: list[PlayingCard]) -> tuple[int, bool]:
+    """
+    Values a hand the way Hand did before it kept running totals: every Ace starts at 11 and drops to 1 while the
+    hand is over 21.
+
+    :return: The hand value, and whether an Ace still counts as 11.
+    """
+    aces_as_eleven = sum(card.is_ace for card in cards)
+    value = sum(card.value for card in cards) + 10 * aces_as_eleven
+    while value > 21 and aces_as_eleven > 0:
+        value -= 10
+        aces_as_eleven -= 1
+    return value, aces_as_eleven > 0
+
+
+def _assert_matches(hand: Hand) -> None:
+    value, soft = _from_scratch(hand.cards)
+    assert hand.get_hand_value() == hand.total == value, hand.cards
+    assert hand.is_soft == soft, hand.cards
+    assert hand.has_busted == (value > 21), hand.cards
+
+
+@pytest.mark.parametrize("ranks, value, soft", [
+    ([1, 1], 12, True),
+    ([1, 1, 9], 21, True),
+    ([1, 1, 1, 1], 14, True),
+    ([1, 1, 1, 1, 7], 21, True),
+    ([1, 1, 1, 1, 8], 12, False),
+    ([1, 13], 21, True),
+    ([1, 6, 10], 17, False),
+    ([1, 5, 5], 21, True),
+    ([1, 5, 6], 12, False),
+    ([10, 1], 21, True),
+    ([10, 5, 1], 16, False),
+    ([13, 12, 2], 22, False),
+])
+def test_known_hands(ranks, value, soft):
+    hand = Hand([])
+    for rank in ranks:
+        hand.add_card(_card(rank))
+        _assert_matches(hand)
+    assert (hand.total, hand.is_soft) == (value, soft)
+    starting = Hand([_card(rank) for rank in ranks])
+    assert (starting.total, starting.is_soft) == (value, soft)
+
+
+def test_soft_hand_turns_hard():
+    hand = Hand([_card(1), _card(6)])
+    assert (hand.total, hand.is_soft) == (17, True)
+    hand.add_card(_card(9))
+    assert (hand.total, hand.is_soft, hand.has_busted) == (16, False, False)
+    hand.add_card(_card(10))
+    assert (hand.total, hand.has_busted, hand.has_stood) == (26, True, True)
+
+
+def test_random_hands_match_a_full_evaluation():
+    rng = random.Random(6)
+    for _ in range(5000):
+        hand = Hand([_card(rng.randint(1, 13)) for _ in range(2)])
+        _assert_matches(hand)
+        while not hand.has_busted:
+            hand.add_card(_card(rng.randint(1, 13)))
+            _assert_matches(hand)
+
+
+def test_split_hands_keep_their_own_totals():
+    player = Player()
+    player.start_hand([_card(1), _card(1)], 10)
+    player.split([_card(13), _card(5)])
+    first, second = player.split_hands
+    assert (first.total, first.is_soft) == (21, True)
+    assert (second.total, second.is_soft) == (16, True)
+    second.add_card(_card(8))
+    first.add_card(_card(1))
+    for hand in player.split_hands:
+        _assert_matches(hand)
+    assert (first.total, second.total) == (12, 14)
+    assert not second.is_soft
@@ -0,0 +1,32 @@
+from pyblackjack.ledger import CHECKPOINT_INTERVAL, ROLLED_BALANCE_NAME, Ledger
+
+
+def test_total_uses_checkpoints():
+    ledger = Ledger()
+    for index in range(3 * CHECKPOINT_INTERVAL + 7):
+        ledger.append("Win", index % 5 - 2)
+    assert ledger.total() == sum(index % 5 - 2 for index in range(3 * CHECKPOINT_INTERVAL + 7))
+
+
+def test_tail_count_edge_cases():
+    ledger = Ledger()
+    for index in range(5):
+        ledger.append("Bet", index)
+    values = [float(index) for index in range(5)]
+    assert [transaction.value for transaction in ledger.tail(2)] == values[-2:]
+    assert [transaction.value for transaction in ledger.tail(0)] == values
+    assert [transaction.value for transaction in ledger.tail(-2)] == values[2:]
+    assert [transaction.value for transaction in ledger.tail(50)] == values
+    assert ledger.tail(-50) == []
+
+
+def test_roll_up_keeps_total_and_invoices():
+    ledger = Ledger(retention=10)
+    for index in range(25):
+        ledger.append("Bet", index)
+    assert len(ledger) < 20
+    assert ledger.total() == sum(range(25))
+    first, *rest = ledger.transactions()
+    assert first.name == ROLLED_BALANCE_NAME
+    assert [transaction.invoice_num for transaction in rest] == list(range(first.invoice_num + 1, 25))
+    assert ledger.next_invoice == 25
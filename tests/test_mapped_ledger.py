@@ -0,0 +1,124 @@
+import struct
+import pytest
+from pyblackjack.bank import Bank
+from pyblackjack.mapped_ledger import HEADER_SIZE, RECORD, MappedLedger
+
+BALANCE_OFFSET = struct.calcsize("<8sIIQ")
+
+
+def _fill(path, count: int, batch_size: int = 4) -> list[tuple[str, float, int]]:
+    with MappedLedger(str(path), batch_size=batch_size) as ledger:
+        for index in range(count):
+            ledger.append(f"Bet {index % 3}", index - 2.5)
+        return list(ledger.records())
+
+
+def test_reopen_keeps_records(tmp_path):
+    path = tmp_path / "bank.led"
+    records = _fill(path, 11)
+    with MappedLedger(str(path)) as ledger:
+        assert list(ledger.records()) == records
+        assert ledger.total() == sum(amount for _, amount, _ in records)
+        assert ledger.next_invoice == 11
+        ledger.append("Bet 9", 1)
+    with MappedLedger(str(path)) as ledger:
+        assert len(ledger) == 12
+        assert ledger.tail(1)[0].name == "Bet 9"
+
+
+def test_unflushed_entries_are_read_before_close(tmp_path):
+    with MappedLedger(str(tmp_path / "bank.led"), batch_size=100) as ledger:
+        for index in range(5):
+            ledger.append("Bet", index)
+        assert [transaction.value for transaction in ledger.transactions()] == [0.0, 1.0, 2.0, 3.0, 4.0]
+        assert ledger.total() == 10
+
+
+def test_file_grows_past_first_batch(tmp_path):
+    path = tmp_path / "bank.led"
+    records = _fill(path, 100, batch_size=8)
+    with MappedLedger(str(path)) as ledger:
+        assert list(ledger.records()) == records
+
+
+def test_truncated_file_is_rejected(tmp_path):
+    path = tmp_path / "bank.led"
+    _fill(path, 10)
+    with open(path, "r+b") as ledger_file:
+        ledger_file.truncate(HEADER_SIZE + 3 * RECORD.size)
+    with pytest.raises(ValueError, match="shorter than its record count"):
+        MappedLedger(str(path))
+
+
+def test_tampered_balance_is_rejected(tmp_path):
+    path = tmp_path / "bank.led"
+    _fill(path, 10)
+    with open(path, "r+b") as ledger_file:
+        ledger_file.seek(BALANCE_OFFSET)
+        ledger_file.write(struct.pack("<d", 1_000_000.0))
+    with pytest.raises(ValueError, match="stored balance"):
+        MappedLedger(str(path))
+
+
+def test_tampered_record_is_rejected(tmp_path):
+    path = tmp_path / "bank.led"
+    _fill(path, 10)
+    with open(path, "r+b") as ledger_file:
+        ledger_file.seek(HEADER_SIZE + 4 * RECORD.size)
+        ledger_file.write(struct.pack("<d", 500.0))
+    with pytest.raises(ValueError, match="stored balance"):
+        MappedLedger(str(path))
+
+
+def test_foreign_file_is_rejected(tmp_path):
+    path = tmp_path / "bank.led"
+    path.write_bytes(b"NOTALEDG" + bytes(HEADER_SIZE))
+    with pytest.raises(ValueError, match="not a ledger file"):
+        MappedLedger(str(path))
+
+
+def test_tail_count_edge_cases(tmp_path):
+    with MappedLedger(str(tmp_path / "bank.led"), batch_size=3) as ledger:
+        for index in range(5):
+            ledger.append("Bet", index)
+        values = [float(index) for index in range(5)]
+        assert [transaction.value for transaction in ledger.tail(2)] == values[-2:]
+        assert [transaction.value for transaction in ledger.tail(0)] == values
+        assert [transaction.value for transaction in ledger.tail(-2)] == values[2:]
+        assert [transaction.value for transaction in ledger.tail(50)] == values
+        assert ledger.tail(-50) == []
+
+
+def test_bank_reopens_its_history(tmp_path):
+    path = str(tmp_path / "bank.led")
+    bank = Bank(100, MappedLedger(path))
+    bank.add_transaction("Win", 15)
+    bank.add_transaction("Loss", -5)
+    bank.ledger.close()
+    reopened = Bank(0, MappedLedger(path))
+    assert reopened.balance == 110
+    assert [transaction.name for transaction in reopened.get_history(0)] == ["Initial Balance", "Win", "Loss"]
+    reopened.ledger.close()
+
+
+def test_bank_merge_requires_a_ledger_on_disk(tmp_path):
+    bank = Bank(100, MappedLedger(str(tmp_path / "bank.led")))
+    bank.add_transaction("Win", 10)
+    with pytest.raises(ValueError):
+        bank.build_new_transaction_record([bank.ledger])
+    merged = MappedLedger(str(tmp_path / "merged.led"))
+    bank.build_new_transaction_record([bank.ledger, [*bank.get_history(get_all=True)]], ledger=merged)
+    assert bank.balance == 220
+    merged.close()
+    with MappedLedger(str(tmp_path / "bank.led")) as original:
+        assert len(original) == 2
+    with MappedLedger(str(tmp_path / "merged.led")) as reopened:
+        assert reopened.total() == 220
+
+
+def test_short_file_is_not_overwritten(tmp_path):
+    path = tmp_path / "bank.led"
+    path.write_bytes(b"not a ledger")
+    with pytest.raises(ValueError, match="too short"):
+        MappedLedger(str(path))
+    assert path.read_bytes() == b"not a ledger"
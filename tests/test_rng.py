@@ -0,0 +1,42 @@
+import json
+import random
+import pytest
+from pyblackjack.rng import StdlibRNG, derive_seed, make_rng
+
+
+def _shuffles(rng, count: int = 3) -> list[bytes]:
+    orders = []
+    for _ in range(count):
+        cards = bytearray(range(52))
+        rng.shuffle(cards)
+        orders.append(bytes(cards))
+    return orders
+
+
+def test_stdlib_matches_random_random():
+    assert _shuffles(StdlibRNG(9)) == _shuffles(random.Random(9))
+    assert _shuffles(StdlibRNG(9, stream=2)) == _shuffles(random.Random(derive_seed(9, 2)))
+
+
+@pytest.mark.parametrize("backend", ["stdlib", "pcg64", "philox"])
+def test_checkpoint_resumes_shuffles(backend):
+    if backend != "stdlib":
+        pytest.importorskip("numpy")
+    rng = make_rng(backend, 5)
+    _shuffles(rng, 2)
+    state = json.loads(json.dumps(rng.get_state()))
+    expected = _shuffles(rng)
+    restored = make_rng(backend, 0)
+    restored.set_state(state)
+    assert _shuffles(restored) == expected
+
+
+@pytest.mark.parametrize("backend", ["pcg64", "philox"])
+def test_numpy_streams_are_permutations(backend):
+    pytest.importorskip("numpy")
+    from pyblackjack.rng import NumpyRNG
+    rng = NumpyRNG(3, backend, batch_size=2)
+    for child in [rng, *rng.spawn(2), rng.jumped()]:
+        for order in _shuffles(child, 5):
+            assert sorted(order) == list(range(52))
+    assert _shuffles(NumpyRNG(3, backend, stream=1)) != _shuffles(NumpyRNG(3, backend, stream=2))
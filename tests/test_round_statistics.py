@@ -0,0 +1,109 @@
+import random
+import statistics
+import pytest
+from pyblackjack.round_results import RoundResults
+from pyblackjack.round_statistics import RoundStatistics
+
+Hand = tuple[RoundResults, float, float]
+
+
+def _random_hands(rng: random.Random, count: int) -> list[Hand]:
+    hands: list[Hand] = []
+    while len(hands) < count:
+        # Runs of losses, so losing streaks cross the chunk boundaries.
+        if rng.random() < 0.1:
+            hands.extend((RoundResults.DEALER_WON, -5.0, 5.0) for _ in range(rng.randint(3, 12)))
+            continue
+        wagered = rng.choice([0.0, 5.0, 10.0, 20.0])
+        outcome = rng.choice(list(RoundResults))
+        match outcome:
+            case RoundResults.DEALER_WON:
+                net = -wagered
+            case RoundResults.PLAYER_WON:
+                net = wagered
+            case RoundResults.PLAYER_WON_BLACKJACK:
+                net = wagered * 1.5
+            case _:
+                net = 0.0
+        hands.append((outcome, net, wagered))
+    return hands[:count]
+
+
+def _sequential(hands: list[Hand]) -> RoundStatistics:
+    stats = RoundStatistics()
+    for hand in hands:
+        stats.add(*hand)
+    return stats
+
+
+def _chunks(rng: random.Random, hands: list[Hand], count: int) -> list[list[Hand]]:
+    cuts = sorted(rng.randint(0, len(hands)) for _ in range(count - 1))
+    return [hands[start:stop] for start, stop in zip([0, *cuts], [*cuts, len(hands)])]
+
+
+def _assert_same(merged: RoundStatistics, expected: RoundStatistics) -> None:
+    assert merged.rounds == expected.rounds
+    assert merged.counts == expected.counts
+    assert merged.total_net == pytest.approx(expected.total_net)
+    assert merged.total_wagered == pytest.approx(expected.total_wagered)
+    assert merged.mean_return == pytest.approx(expected.mean_return, abs=1e-12)
+    assert merged.variance == pytest.approx(expected.variance, rel=1e-9)
+    assert merged.max_drawdown == pytest.approx(expected.max_drawdown)
+    assert merged.longest_losing_streak == expected.longest_losing_streak
+    assert merged.current_losing_streak == expected.current_losing_streak
+
+
+def test_sequential_stream_matches_a_direct_calculation():
+    hands = _random_hands(random.Random(13), 3000)
+    stats = _sequential(hands)
+    returns = [net / wagered for _, net, wagered in hands if wagered > 0]
+    assert stats.mean_return == pytest.approx(statistics.fmean(returns))
+    assert stats.variance == pytest.approx(statistics.variance(returns))
+    cumulative = peak = drawdown = 0.0
+    streak = longest = 0
+    for _, net, _ in hands:
+        cumulative += net
+        peak = max(peak, cumulative)
+        drawdown = max(drawdown, peak - cumulative)
+        streak = streak + 1 if net < 0 else 0
+        longest = max(longest, streak)
+    assert stats.max_drawdown == pytest.approx(drawdown)
+    assert stats.longest_losing_streak == longest
+    assert stats.current_losing_streak == streak
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("workers", [2, 3, 8])
+def test_merged_workers_match_one_stream(seed, workers):
+    rng = random.Random(seed)
+    hands = _random_hands(rng, rng.randint(50, 400))
+    expected = _sequential(hands)
+    parts = [_sequential(chunk) for chunk in _chunks(rng, hands, workers)]
+
+    merged = RoundStatistics()
+    for part in parts:
+        merged.merge(part)
+    _assert_same(merged, expected)
+
+    # Merging neighbours pairwise, like a tree reduction, gives the same figures.
+    while len(parts) > 1:
+        paired = []
+        for index in range(0, len(parts), 2):
+            left = parts[index]
+            if index + 1 < len(parts):
+                left.merge(parts[index + 1])
+            paired.append(left)
+        parts = paired
+    _assert_same(parts[0], expected)
+
+
+def test_all_losing_chunks_join_their_streaks():
+    loss = (RoundResults.DEALER_WON, -5.0, 5.0)
+    win = (RoundResults.PLAYER_WON, 5.0, 5.0)
+    chunks = [[win, loss, loss], [loss, loss], [], [loss, win, loss]]
+    merged = RoundStatistics()
+    for chunk in chunks:
+        merged.merge(_sequential(chunk))
+    _assert_same(merged, _sequential([hand for chunk in chunks for hand in chunk]))
+    assert merged.longest_losing_streak == 5
+    assert merged.max_drawdown == 25.0
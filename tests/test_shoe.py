@@ -0,0 +1,65 @@
+import random
+from collections import Counter
+import pytest
+from pyblackjack.playing_card import CARD_COUNT
+from pyblackjack.shoe import DEFAULT_DECKS, MAX_DECKS, MIN_DECKS, Shoe
+
+
+def _draw_until_cut(shoe: Shoe) -> int:
+    drawn = 0
+    while not shoe.needs_reshuffle():
+        shoe.drawCard()
+        drawn += 1
+    return drawn
+
+
+@pytest.mark.parametrize("deck_count, penetration", [(1, 0.5), (6, 0.75), (8, 0.9)])
+def test_cut_card_follows_penetration(deck_count, penetration):
+    shoe = Shoe(deck_count, penetration, rng=random.Random(1))
+    total_cards = CARD_COUNT * deck_count
+    assert shoe.cut_card == total_cards - int(total_cards * penetration)
+    assert _draw_until_cut(shoe) == int(total_cards * penetration)
+
+
+def test_cut_card_triggers_a_counted_reshuffle():
+    shoe = Shoe(cut_card=100, rng=random.Random(5))
+    assert shoe.reshuffle_count == 0
+    for reshuffles in range(1, 4):
+        assert _draw_until_cut(shoe) == CARD_COUNT * DEFAULT_DECKS - 100
+        assert shoe.get_remaining_cards() == 100
+        shoe.confirm_deck_health()
+        assert shoe.reshuffle_count == reshuffles
+        assert shoe.get_remaining_cards() == CARD_COUNT * DEFAULT_DECKS
+        assert Counter(shoe.cards) == Counter({index: DEFAULT_DECKS for index in range(CARD_COUNT)})
+
+
+def test_no_reshuffle_before_the_cut_card():
+    shoe = Shoe(2, rng=random.Random(2))
+    for _ in range(CARD_COUNT * 2 - shoe.cut_card - 1):
+        shoe.drawCard()
+        shoe.confirm_deck_health()
+    assert shoe.reshuffle_count == 0
+    shoe.drawCard()
+    shoe.confirm_deck_health()
+    assert shoe.reshuffle_count == 1
+
+
+def test_reshuffle_resets_the_running_count():
+    shoe = Shoe(1, cut_card=10, rng=random.Random(3))
+    _draw_until_cut(shoe)
+    assert shoe.count.cards_remaining < CARD_COUNT
+    shoe.confirm_deck_health()
+    assert shoe.count.cards_remaining == CARD_COUNT
+    assert shoe.count.running_count == 0
+
+
+@pytest.mark.parametrize("deck_count", [MIN_DECKS - 1, MAX_DECKS + 1])
+def test_deck_count_is_bounded(deck_count):
+    with pytest.raises(ValueError):
+        Shoe(deck_count)
+
+
+@pytest.mark.parametrize("penetration", [0.0, 1.0, 1.5])
+def test_penetration_is_bounded(penetration):
+    with pytest.raises(ValueError):
+        Shoe(penetration=penetration)
@@ -0,0 +1,154 @@
+import random
+import pytest
+from pyblackjack.blackjack import PossibleActions
+from pyblackjack.deck import Deck
+from pyblackjack.playing_card import Rank, Suit, card_index
+from pyblackjack.player import Player
+from pyblackjack.simulator import (
+    STOP_BROKE, STOP_MAX_ROUNDS, STOP_TARGET, STOP_TIME_LIMIT, MimicDealerStrategy, Simulator)
+from pyblackjack.table import Table
+from pyblackjack import constants
+
+BET = 10.0
+HIT = PossibleActions.HIT
+STAND = PossibleActions.STAND
+DOUBLE = PossibleActions.DOUBLE
+SPLIT = PossibleActions.SPLIT
+
+
+class ScriptedStrategy:
+    """
+    Bets BET, buys a fixed insurance and plays a fixed list of actions.
+    """
+    def __init__(self, actions, insurance: float = 0.0) -> None:
+        self.actions = list(actions)
+        self._insurance = insurance
+
+    def bet(self, player, deck) -> float:
+        return BET
+
+    def insurance(self, player, bet_value) -> float:
+        return self._insurance
+
+    def action(self, hand, dealer_upcard, allowed_actions, deck):
+        choice = self.actions.pop(0)
+        assert choice in allowed_actions
+        return choice
+
+
+def _stacked_deck(ranks: list[int]) -> Deck:
+    """
+    A full deck with the given ranks on top, drawn in order.
+    Dealt as player, dealer upcard, player, dealer hole card, then the player's and the dealer's draws.
+    """
+    deck = Deck(rng=random.Random(0))
+    deck.cards.extend(card_index(Rank(rank), Suit.SPADES) for rank in reversed(ranks))
+    return deck
+
+
+def _play_one_round(engine: str, strategy: ScriptedStrategy, ranks: list[int]):
+    deck = _stacked_deck(ranks)
+    if engine == "simulator":
+        simulator = Simulator(strategy, deck=deck)
+        simulator.play_round()
+        player, dealer = simulator.player, simulator.dealer
+    else:
+        table = Table([strategy], deck=deck)
+        table.play_round()
+        player, dealer = table.seats[0].player, table.dealer
+    assert strategy.actions == []
+    return player, dealer
+
+
+# (actions, insurance, ranks drawn, the player's net)
+ROUNDS = {
+    "stand and win": ([STAND], 0.0, [10, 10, 9, 7], BET),
+    "push": ([STAND], 0.0, [10, 10, 8, 8], 0.0),
+    "both bust push": ([HIT], 0.0, [10, 10, 6, 6, 10, 10], 0.0),
+    "blackjack": ([], 0.0, [1, 10, 13, 7], BET * 1.5),
+    "double and win": ([DOUBLE], 0.0, [5, 10, 6, 7, 10], 2 * BET),
+    "double and lose": ([DOUBLE], 0.0, [5, 10, 6, 7, 2], -2 * BET),
+    # There is no peek, so a dealer blackjack takes the doubled stake too.
+    "double into dealer blackjack": ([DOUBLE], 0.0, [5, 1, 6, 13, 10], -2 * BET),
+    # The first hand gets 8 + 10 and wins, the second 8 + 9 and pushes against 17.
+    "split": ([SPLIT, STAND, STAND], 0.0, [8, 10, 8, 7, 10, 9], BET),
+    "split and lose both": ([SPLIT, STAND, STAND], 0.0, [8, 10, 8, 9, 2, 3], -2 * BET),
+    # Insurance pays 2 to 1, which covers the lost hand.
+    "insured dealer blackjack": ([STAND], BET / 2, [10, 1, 9, 13], 0.0),
+    "insurance lost": ([STAND], BET / 2, [10, 1, 9, 7], BET - BET / 2),
+}
+
+
+@pytest.mark.parametrize("engine", ["simulator", "table"])
+@pytest.mark.parametrize("name", ROUNDS)
+def test_round_moves_the_right_money(engine, name):
+    actions, insurance, ranks, player_net = ROUNDS[name]
+    player, dealer = _play_one_round(engine, ScriptedStrategy(actions, insurance), ranks)
+    assert player.bank.balance == constants.PLAYER_BANK + player_net
+    assert dealer.bank.balance == constants.DEALER_BANK - player_net
+
+
+def test_double_down_debits_the_second_stake():
+    player, _ = _play_one_round("simulator", ScriptedStrategy([DOUBLE]), [5, 10, 6, 7, 10])
+    history = [(transaction.name, transaction.value) for transaction in player.bank.get_history(get_all=True)]
+    assert history[1:4] == [("Starting Bet", -BET), ("Double Down", -BET), ("Won Round", 4 * BET)]
+    assert player.hand.bet.balance == 2 * BET
+
+
+def test_split_debits_a_stake_per_hand():
+    player, _ = _play_one_round("simulator", ScriptedStrategy([SPLIT, STAND, STAND]), [8, 10, 8, 7, 10, 9])
+    history = [(transaction.name, transaction.value) for transaction in player.bank.get_history(get_all=True)]
+    assert history[1:3] == [("Starting Bet", -BET), ("Split", -BET)]
+    assert [hand.bet.balance for hand in player.split_hands] == [BET, BET]
+
+
+def test_insurance_is_debited_before_settlement():
+    player, _ = _play_one_round("simulator", ScriptedStrategy([STAND], BET / 2), [10, 1, 9, 13])
+    history = [(transaction.name, transaction.value) for transaction in player.bank.get_history(get_all=True)]
+    assert history[1:4] == [("Starting Bet", -BET), ("Insurance Buy", -BET / 2), ("Insurance Payout", 1.5 * BET)]
+
+
+def _seeded_simulator(player: Player | None = None) -> Simulator:
+    return Simulator(MimicDealerStrategy(), player=player, deck=Deck(rng=random.Random(25)))
+
+
+def test_precision_run_stops_at_the_target():
+    simulator = _seeded_simulator()
+    report = simulator.run_to_precision(target_standard_error=1.0, chunk_rounds=200, min_rounds=400)
+    assert report.stop_reason == STOP_TARGET
+    assert report.target_met
+    # The target is met after the first chunk, but not checked before min_rounds.
+    assert (report.rounds, report.chunks) == (400, 2)
+    assert report.standard_error <= 1.0
+    low, high = report.confidence_interval
+    assert low < report.house_edge < high
+    assert simulator.dealer.history.stats.rounds == report.hands
+
+
+def test_precision_run_stops_at_max_rounds():
+    report = _seeded_simulator().run_to_precision(target_standard_error=0.0, chunk_rounds=100, max_rounds=250)
+    assert report.stop_reason == STOP_MAX_ROUNDS
+    assert not report.target_met
+    assert (report.rounds, report.chunks) == (250, 3)
+
+
+def test_precision_run_stops_at_the_time_limit():
+    report = _seeded_simulator().run_to_precision(target_relative_precision=0.0, chunk_rounds=100, max_seconds=0.0)
+    assert report.stop_reason == STOP_TIME_LIMIT
+    assert (report.rounds, report.chunks) == (100, 1)
+
+
+def test_precision_run_stops_when_broke():
+    simulator = _seeded_simulator(Player(starting_balance=constants.MINIMUM_BET))
+    report = simulator.run_to_precision(target_standard_error=0.0, chunk_rounds=10_000, stop_when_broke=True)
+    assert report.stop_reason == STOP_BROKE
+    assert report.rounds < 10_000
+    assert simulator.player.bank.balance <= 0
+    assert report.player_net == -constants.MINIMUM_BET
+
+
+def test_precision_run_needs_a_target():
+    with pytest.raises(ValueError):
+        _seeded_simulator().run_to_precision()
+    with pytest.raises(ValueError):
+        _seeded_simulator().run_to_precision(target_standard_error=0.1, chunk_rounds=0)
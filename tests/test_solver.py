@@ -0,0 +1,53 @@
+import pytest
+from pyblackjack.blackjack import PossibleActions
+from pyblackjack.solver import BasicStrategySolver, chart_to_json
+
+
+@pytest.fixture(scope="module")
+def solver() -> BasicStrategySolver:
+    return BasicStrategySolver(1)
+
+
+def _cell(solver: BasicStrategySolver, first: int, second: int, upcard: int) -> str:
+    return solver._best_cell(solver.starting_hand_evs(first, second, upcard))
+
+
+@pytest.mark.parametrize("first, second, upcard, cell", [
+    (10, 6, 10, "hit"),
+    (9, 7, 10, "hit"),
+    (5, 6, 6, "double/hit"),
+    (10, 10, 6, "stand"),
+    (1, 1, 6, "split"),
+    (9, 9, 7, "split"),
+    (4, 4, 5, "split"),
+    (5, 5, 5, "double/hit"),
+    (1, 7, 2, "stand"),
+    (1, 7, 9, "hit"),
+    (1, 6, 3, "double/hit"),
+])
+def test_well_known_cells(solver, first, second, upcard, cell):
+    assert _cell(solver, first, second, upcard) == cell
+
+
+@pytest.mark.parametrize("first, second, upcard, cell", [
+    # With no peek the doubled or split stake is lost to a dealer blackjack, so 11 vs Ace and 8s vs 10 just hit.
+    (5, 6, 1, "hit"),
+    (8, 8, 10, "hit"),
+    # A bust only loses when the dealer stands, so stiff hands hit against the dealer's weak upcards too.
+    (10, 2, 4, "hit"),
+    (10, 3, 2, "hit"),
+])
+def test_cells_that_follow_the_house_rules(solver, first, second, upcard, cell):
+    assert _cell(solver, first, second, upcard) == cell
+
+
+def test_hard_16_vs_10_evs(solver):
+    evs = solver.starting_hand_evs(10, 6, 10)
+    assert set(evs) == {PossibleActions.STAND, PossibleActions.HIT, PossibleActions.DOUBLE}
+    assert evs[PossibleActions.HIT] > evs[PossibleActions.STAND] > evs[PossibleActions.DOUBLE]
+
+
+def test_chart_json_uses_string_keys():
+    chart = {"hard": {16: {10: "hit"}}, "soft": {}, "pair": {8: {10: "hit"}}}
+    assert chart_to_json(chart).replace(" ", "").replace("\n", "") == \
+        '{"hard":{"16":{"10":"hit"}},"soft":{},"pair":{"8":{"10":"hit"}}}'
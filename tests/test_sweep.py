@@ -0,0 +1,69 @@
+from pyblackjack import sweep
+from pyblackjack.sweep import ResultCache, grid_points, run_sweep
+
+ROUNDS = 300
+
+
+def _counting_run_point(monkeypatch) -> list:
+    played = []
+    run_point = sweep.run_point
+
+    def counting(point):
+        played.append(point)
+        return run_point(point)
+    monkeypatch.setattr(sweep, "run_point", counting)
+    return played
+
+
+def test_second_run_serves_cached_points(tmp_path, monkeypatch):
+    played = _counting_run_point(monkeypatch)
+    cache = ResultCache(tmp_path)
+    first_points = grid_points({"blackjack_payout": [1.5, 1.2]}, ROUNDS, seeds=[1, 2])
+    first = run_sweep(first_points, cache, workers=1)
+    assert len(played) == 4
+    assert not any(result.cached for result in first)
+
+    played.clear()
+    points = grid_points({"blackjack_payout": [1.5, 1.2, 1.0]}, ROUNDS, seeds=[1, 2])
+    seen = []
+    second = run_sweep(points, cache, workers=1, progress=seen.append)
+    assert [point.rules.blackjack_payout for point in played] == [1.0, 1.0]
+    assert [result.cached for result in second] == [True] * 4 + [False] * 2
+    assert [result.cached for result in seen] == [True] * 4 + [False] * 2
+    for old, new in zip(first, second):
+        assert new.point == old.point
+        assert new.to_dict() == old.to_dict()
+
+    played.clear()
+    third = run_sweep(points, cache, workers=1)
+    assert played == []
+    assert all(result.cached for result in third)
+
+
+def test_unreadable_cache_file_is_played_again(tmp_path, monkeypatch):
+    played = _counting_run_point(monkeypatch)
+    cache = ResultCache(tmp_path)
+    points = grid_points({"blackjack_payout": [1.5, 1.2]}, ROUNDS)
+    first = run_sweep(points, cache, workers=1)
+    cache.path(points[0].key()).write_text("{not json")
+    played.clear()
+    second = run_sweep(points, cache, workers=1)
+    assert played == [points[0]]
+    assert [result.cached for result in second] == [False, True]
+    assert second[0].player_net == first[0].player_net
+
+
+def test_duplicate_points_are_played_once(tmp_path, monkeypatch):
+    played = _counting_run_point(monkeypatch)
+    points = grid_points({"blackjack_payout": [1.5]}, ROUNDS) * 3
+    results = run_sweep(points, ResultCache(tmp_path), workers=1)
+    assert len(played) == 1
+    assert len(results) == 3
+
+
+def test_worker_pool_matches_a_serial_run(tmp_path):
+    points = grid_points({"blackjack_payout": [1.5, 1.2]}, ROUNDS, seeds=[3, 4])
+    serial = run_sweep(points, ResultCache(tmp_path / "serial"), workers=1)
+    pooled = run_sweep(points, ResultCache(tmp_path / "pooled"), workers=2)
+    assert [result.player_net for result in pooled] == [result.player_net for result in serial]
+    assert [result.results for result in pooled] == [result.results for result in serial]
@@ -0,0 +1,37 @@
+import random
+import pytest
+from pyblackjack.deck import Deck
+from pyblackjack.shoe import Shoe
+from pyblackjack.simulator import MimicDealerStrategy, Simulator
+from pyblackjack.table import MAX_SEATS, Table
+
+
+@pytest.mark.parametrize("seed", [3, 11, 2024])
+def test_one_seat_table_reproduces_the_simulator(seed):
+    simulator = Simulator(MimicDealerStrategy(), deck=Deck(rng=random.Random(seed)))
+    table = Table([MimicDealerStrategy()], deck=Deck(rng=random.Random(seed)))
+    for _ in range(2000):
+        assert table.play_round() == [simulator.play_round()]
+    assert table.seats[0].player.bank.balance == simulator.player.bank.balance
+    assert table.dealer.bank.balance == simulator.dealer.bank.balance
+    assert table.deck.cards == simulator.deck.cards
+    assert table.deck.reshuffle_count == simulator.deck.reshuffle_count
+
+
+def test_default_shoe_covers_a_full_table(monkeypatch):
+    table = Table([MimicDealerStrategy() for _ in range(MAX_SEATS)])
+    deck = table.deck
+    assert isinstance(deck, Shoe)
+    assert deck.deck_count == MAX_SEATS
+    empty_draws = 0
+    draw_card = deck.drawCard
+
+    def counting_draw():
+        nonlocal empty_draws
+        empty_draws += not deck.cards
+        return draw_card()
+    monkeypatch.setattr(deck, "drawCard", counting_draw)
+    report = table.run(1000)
+    assert report.reshuffles > 0
+    # Every reshuffle happens at the cut card between rounds, never by running out mid-round.
+    assert empty_draws == 0
@@ -0,0 +1,67 @@
+import random
+import pytest
+from pyblackjack.simulator import MimicDealerStrategy
+from pyblackjack.trace import (
+    ACTION_CODES, SETTLE, SHUFFLE, TraceMismatch, _read_signed, _read_varint, _write_signed, _write_varint,
+    decode_trace, record, replay)
+
+
+@pytest.mark.parametrize("value", [0, 1, 127, 128, 300, 2 ** 32, 2 ** 63 + 5])
+def test_varint_round_trip(value):
+    out = bytearray()
+    _write_varint(out, value)
+    assert _read_varint(bytes(out), 0) == (value, len(out))
+
+
+@pytest.mark.parametrize("value", [0, 1, -1, 63, -64, 64, -65, 10 ** 12, -(10 ** 12)])
+def test_signed_round_trip(value):
+    out = bytearray()
+    _write_signed(out, value)
+    assert _read_signed(bytes(out), 0) == (value, len(out))
+
+
+def test_negative_varint_is_rejected():
+    with pytest.raises(ValueError):
+        _write_varint(bytearray(), -1)
+
+
+def test_seeded_trace_replays():
+    data = record(MimicDealerStrategy(), 300, seed=11)
+    trace = decode_trace(data)
+    assert trace.seed == 11
+    assert trace.rounds == 300
+    assert SHUFFLE not in trace.opcodes
+    report = replay(data)
+    assert report.rounds == 300
+
+
+def test_recorded_shuffles_replay():
+    data = record(MimicDealerStrategy(), 300, rng=random.Random(5), deck_count=2)
+    trace = decode_trace(data)
+    assert trace.seed is None
+    assert trace.opcodes.count(SHUFFLE) >= 1
+    assert replay(trace).rounds == 300
+
+
+def test_tampered_settlement_is_caught():
+    trace = decode_trace(record(MimicDealerStrategy(), 50, seed=2))
+    index = trace.opcodes.index(SETTLE)
+    results, balance = trace.arguments[index]
+    trace.arguments[index] = (results, balance + 1)
+    with pytest.raises(TraceMismatch) as caught:
+        replay(trace)
+    assert caught.value.round_index == 0
+
+
+def test_missing_action_is_caught():
+    trace = decode_trace(record(MimicDealerStrategy(), 50, seed=2))
+    action_codes = set(ACTION_CODES.values())
+    index = next(index for index, opcode in enumerate(trace.opcodes) if opcode in action_codes)
+    trace.opcodes[index] = SETTLE
+    with pytest.raises(TraceMismatch, match="asked for an action"):
+        replay(trace)
+
+
+def test_not_a_trace():
+    with pytest.raises(ValueError):
+        decode_trace(b"NOTATRACE")
@@ -0,0 +1,33 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from pyblackjack.playing_card import CARD_COUNT
+from pyblackjack.round_results import RoundResults
+from pyblackjack.rules import Rules
+from pyblackjack.vectorized import VectorizedEngine
+
+
+def test_empty_shoe_is_reshuffled_not_wrapped():
+    engine = VectorizedEngine(64, seed=5)
+    shoe_size = CARD_COUNT * 4
+    before = engine.shoes.copy()
+    engine.positions[:32] = shoe_size
+    drawing = np.arange(64) % 2 == 0
+    engine._draw(drawing)
+    emptied = (np.arange(64) < 32) & drawing
+    assert (engine.positions[emptied] == 1).all()
+    assert (engine.positions[~emptied & (np.arange(64) < 32)] == shoe_size).all()
+    assert (engine.shoes[emptied] != before[emptied]).any(axis=1).all()
+    assert (engine.shoes[~emptied] == before[~emptied]).all()
+    # A reshuffle only reorders a shoe, it never changes the cards in it.
+    assert (np.sort(engine.shoes, axis=1) == np.sort(before, axis=1)).all()
+
+
+def test_blackjack_payout_is_read_at_settle_time():
+    engine = VectorizedEngine(2000, seed=9)
+    with Rules(blackjack_payout=1.2).applied():
+        results, winnings = engine.play_round()
+    blackjacks = results == RoundResults.PLAYER_WON_BLACKJACK.value
+    assert blackjacks.any()
+    assert (winnings[blackjacks] == 1.2).all()